@@ -3,7 +3,7 @@ from __future__ import annotations
 
 import logging
 import datetime
-import math
+import time
 import os
 import json
 import base64
@@ -12,28 +12,69 @@ from datetime import timedelta
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant, ServiceCall
-from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import (
+    async_track_point_in_time, async_track_point_in_utc_time, async_track_state_change_event,
+)
 from homeassistant.util import dt as dt_util
-from homeassistant.components.http import StaticPathConfig
 from homeassistant.components import panel_custom, websocket_api
-from homeassistant.exceptions import HomeAssistantError
 
 from .const import (
     DOMAIN, CONF_LIGHT_ENTITY, CONF_FAN_ENTITY, CONF_TEMP_SENSOR, CONF_HUMIDITY_SENSOR,
     CONF_TARGET_TEMP, CONF_MAX_HUMIDITY, DEFAULT_TARGET_TEMP, DEFAULT_MAX_HUMIDITY,
-    PHASE_LIGHT_HOURS, PHASE_VEGETATIVE, CONF_PHASE_SEEDLING_HOURS, CONF_PHASE_VEGETATIVE_HOURS,
-    CONF_PHASE_FLOWERING_HOURS, CONF_PHASE_DRYING_HOURS, CONF_PHASE_CURING_HOURS,
-    CONF_CUSTOM1_NAME, CONF_CUSTOM1_HOURS, CONF_CUSTOM2_NAME, CONF_CUSTOM2_HOURS,
-    CONF_CUSTOM3_NAME, CONF_CUSTOM3_HOURS, PHASE_SEEDLING, PHASE_FLOWERING, PHASE_DRYING,
-    PHASE_CURING, CONF_PUMP_DURATION, CONF_MOISTURE_SENSOR, CONF_TARGET_MOISTURE,
+    PHASE_VEGETATIVE, CONF_PUMP_DURATION, CONF_MOISTURE_SENSOR, CONF_TARGET_MOISTURE,
     CONF_LIGHT_START_HOUR, CONF_PHASE_START_DATE, DEFAULT_PUMP_DURATION,
     DEFAULT_TARGET_MOISTURE, DEFAULT_LIGHT_START_HOUR, CONF_PUMP_ENTITY, CONF_CAMERA_ENTITY,
+    CONF_PHASES, SIGNAL_PHASE_UPDATED, DATA_BOOTSTRAP, DATA_IMAGES, DEFAULT_LOG_PAGE_SIZE,
+    DATA_WATERING, CONF_PUMP_POWER, CONF_MAX_CONCURRENT_PUMPS, CONF_PUMP_POWER_BUDGET,
+    SOAK_TIME, PUMP_START_GRACE, DATA_DISPLAY, DATA_HEALTH, CONF_ALERT_DURATION,
+    CONF_ALERT_TEMP_RISE, DEFAULT_ALERT_DURATION, DEFAULT_ALERT_TEMP_RISE, DATA_PROFILER,
+    SERVICE_START_PROFILING, SERVICE_STOP_PROFILING, SIGNAL_WATERING_PREDICTED,
+    PREDICTION_LEAD, WATERING_JUMP, SUBSYSTEMS,
+    SUBSYSTEM_CLIMATE, SUBSYSTEM_WATER, DATA_HISTORY, DATA_WATCHDOG, CONF_SENSOR_TIMEOUT,
+    DEFAULT_SENSOR_TIMEOUT, SIGNAL_SENSORS_UPDATED, STUCK_TIME_CLIMATE, STUCK_TIME_MOISTURE,
+    DATA_PROFILES, CONF_PROFILE, LIVE_OPTIONS, DATA_READINGS, CONF_SHADOW_PROFILE,
+    DATA_SNAPSHOTS, CONF_SNAPSHOT_TTL, CONF_SNAPSHOT_CACHE_SIZE, CONF_ZONES, AGGREGATE_MEAN,
+)
+from .alerts import AlertEngine, default_rules
+from .health import HealthTracker
+from .display import DisplayPublisher
+from .adapter import HassClock, HassStates
+from .core import ControlSettings, DecisionTrace, GrowBoxController, ShadowController
+from .drying import DryingModel
+from .controllers import async_create_controllers
+from .executor import SingleFlight
+from .fleet import PROFILE_NAME, PROFILE_SCHEMA, ProfileStore, effective_config
+from .history import DOWNSAMPLERS, METHOD_LTTB, HistoryCache
+from .assets import (
+    PANEL_FILENAME, AssetStore, GrowBoxFrontendView, GrowBoxImageView, ImageIndex,
 )
+from .bootstrap import BootstrapCache
+from .phases import PHASES_SCHEMA, PhaseRegistry
+from .readings import ParsedState, ReadingCache
+from .profiling import DEFAULT_DURATION, MAX_DURATION, Profiler
+from .runtime import RuntimeStore, async_remove_runtime
+from .snapshots import DEFAULT_CACHE_SIZE, DEFAULT_TTL, GrowBoxSnapshotView, SnapshotCache
+from .timeline import build_timeline, entry_at
+from .watchdog import SensorWatchdog
+from .watering import WateringScheduler
+from .zones import ZONES_SCHEMA, SensorZone
 
 _LOGGER = logging.getLogger(__name__)
 
-PLATFORMS: list[Platform] = [Platform.SENSOR, Platform.SWITCH, Platform.SELECT]
+PLATFORMS: list[Platform] = [Platform.SENSOR, Platform.BINARY_SENSOR, Platform.SWITCH, Platform.SELECT]
+
+CONFIG_SCHEMA = vol.Schema({
+    # A bare "local_grow_box:" key comes in as None
+    vol.Optional(DOMAIN): vol.Any(None, vol.Schema({
+        vol.Optional(CONF_MAX_CONCURRENT_PUMPS, default=0): vol.All(vol.Coerce(int), vol.Range(min=0)),
+        vol.Optional(CONF_PUMP_POWER_BUDGET, default=0): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional(CONF_SNAPSHOT_TTL, default=DEFAULT_TTL): vol.All(vol.Coerce(float), vol.Range(min=1)),
+        vol.Optional(CONF_SNAPSHOT_CACHE_SIZE, default=DEFAULT_CACHE_SIZE): vol.All(vol.Coerce(float), vol.Range(min=1)),
+    })),
+}, extra=vol.ALLOW_EXTRA)
 
 class GrowBoxManager:
     """Class to manage the Grow Box automation."""
@@ -42,30 +83,61 @@ class GrowBoxManager:
         """Initialize the manager."""
         self.hass = hass
         self.entry = entry
-        self.config = {**entry.data, **entry.options}
-        self._remove_update_listener = None
+        self.config = effective_config(hass, entry)
+        self.controllers = []
         self.master_switch_on = True
+        self.phases = PhaseRegistry.from_config(self.config)
+        # Defaults from the config entry, replaced by the runtime store once restored
         self.current_phase = self.config.get("current_phase", PHASE_VEGETATIVE)
-        self.phase_start_date = None
-        start_date_str = self.config.get(CONF_PHASE_START_DATE)
-        if start_date_str:
-            try:
-                self.phase_start_date = datetime.datetime.fromisoformat(start_date_str)
-            except ValueError:
-                pass
-        
-        if self.phase_start_date is None:
-             self.phase_start_date = dt_util.now()
-
-        self.vpd = 0.0
-        self.pump_start_time = None
-        self.last_pump_stop_time = dt_util.now()
+        self.phase_start_date = _parse_start_date(self.config.get(CONF_PHASE_START_DATE)) or dt_util.now()
+        self.runtime = RuntimeStore(hass, entry.entry_id, self.as_runtime_state)
+        # One evaluation at a time, triggers during a run collapse into one follow-up
+        self._executor = SingleFlight(hass, self._async_update_logic, f"Local Grow Box {entry.title}")
+
+        self.timeline = []
+        self._days_in_phase = 0
+        self._remove_timeline_listener = None
+        self._remove_midnight_listener = None
+
+        self.watering = hass.data[DATA_WATERING]
+        self.drying = DryingModel()
+        self.predicted_watering = None
+        self._next_moisture_check = None
+        self._moisture_dirty = True # Evaluate once after start
+        self._remove_moisture_listener = None
+        self._remove_moisture_check = None
+        self.health = hass.data[DATA_HEALTH]
+        self.profiler = hass.data[DATA_PROFILER]
+        self.watchdog = hass.data[DATA_WATCHDOG]
+        self.readings = hass.data[DATA_READINGS]
+        # Roles with several sensors are read through a zone that aggregates them
+        self.zones = self._build_zones()
+        self.sensor_timeout = self._get_config_value(CONF_SENSOR_TIMEOUT, DEFAULT_SENSOR_TIMEOUT, float) * 60
+        self._remove_watchdog = None
+        self._failed_sensors: frozenset[str] = frozenset()
+        self._watering_reason = None
         
         self.logs = []
         self._last_log_state = {}
         self._log_file_path = hass.config.path(f".storage", f"local_grow_box_logs_{self.entry.entry_id}.json")
         self._load_logs()
-        self._last_display_update = None
+        self.display = hass.data[DATA_DISPLAY]
+
+        alert_minutes = self._get_config_value(CONF_ALERT_DURATION, DEFAULT_ALERT_DURATION, float)
+        self.alerts = AlertEngine(
+            hass, entry.entry_id, entry.title, default_rules(alert_minutes * 60), self.add_log
+        )
+        self._alerts_enabled = alert_minutes > 0
+
+        # The decision logic lives in the HA independent core, the manager adapts it
+        self._pump_power = self._get_config_value(CONF_PUMP_POWER, 0, float)
+        self.trace = DecisionTrace()
+        self.controller = GrowBoxController(
+            self._control_settings(), HassStates(self.readings), HassClock(), self, self, self.add_log, self.trace
+        )
+        # Evaluates the shadow profile on the same inputs without acting
+        self.shadow: ShadowController | None = None
+        self._apply_settings()
 
     def _load_logs(self):
         """Load logs from file."""
@@ -114,41 +186,242 @@ class GrowBoxManager:
             
         self.hass.async_create_task(self.hass.async_add_executor_job(self._save_logs))
 
+    async def async_restore(self):
+        """Restore the runtime state. Must run before the first tick."""
+        data = await self.runtime.async_load()
+        if data is None:
+            # First start (or upgrade): keep the values from the config entry
+            self.runtime.async_schedule_save()
+            return
+
+        self.master_switch_on = data.get("master_switch", True)
+        if data.get("current_phase") in self.phases:
+            self.current_phase = data["current_phase"]
+        self.phase_start_date = _parse_start_date(data.get("phase_start_date")) or self.phase_start_date
+        self.pump_start_time = dt_util.parse_datetime(data.get("pump_start_time") or "")
+        self.last_pump_stop_time = dt_util.parse_datetime(data.get("last_pump_stop_time") or "") or self.last_pump_stop_time
+
+        controller = data.get("controller", {})
+        if controller.get("watering_reason"):
+            self._watering_reason = tuple(controller["watering_reason"])
+        self.drying = DryingModel.from_dict(controller.get("drying"))
+        self._apply_settings()
+
+    def as_runtime_state(self) -> dict:
+        """Return the state kept in the runtime store."""
+        return {
+            "master_switch": self.master_switch_on,
+            "current_phase": self.current_phase,
+            "phase_start_date": self.phase_start_date.isoformat(),
+            "pump_start_time": self.pump_start_time.isoformat() if self.pump_start_time else None,
+            "last_pump_stop_time": self.last_pump_stop_time.isoformat() if self.last_pump_stop_time else None,
+            "controller": {
+                "watering_reason": list(self._watering_reason) if self._watering_reason else None,
+                "drying": self.drying.as_dict(),
+            },
+        }
+
+    def runtime_options(self) -> dict:
+        """Return the runtime values in the shape of the entry options, for the panel."""
+        return {
+            "current_phase": self.current_phase,
+            CONF_PHASE_START_DATE: dt_util.as_local(self.phase_start_date).date().isoformat(),
+        }
+
     async def async_setup(self):
         """Setup background tasks."""
-        # Check more frequently (1s) to handle pump duration accurately
-        self._remove_update_listener = async_track_time_interval(
-            self.hass, self._async_update_logic, timedelta(seconds=1)
-        )
-        self.hass.async_create_task(self._async_update_logic(dt_util.now()))
+        for zone in self.zones.values():
+            zone.async_setup()
+        # Only the subsystems this box uses are loaded, each one subscribes to its own triggers
+        self.controllers = await async_create_controllers(self.hass, self)
+        for controller in self.controllers:
+            controller.async_setup()
+        self._async_rebuild_timeline()
+        self._async_update_days_in_phase()
+        if moisture_entity := self.config.get(CONF_MOISTURE_SENSOR):
+            # Moisture is only evaluated on new readings or a predicted crossing
+            if CONF_MOISTURE_SENSOR not in self.zones:
+                # A zone reports its own changes
+                self._remove_moisture_listener = async_track_state_change_event(
+                    self.hass, [moisture_entity], self._async_moisture_changed
+                )
+            self._async_update_prediction()
+        if self.sensor_timeout > 0:
+            # One heap for all boxes, a sensor is only looked at when its deadline passes
+            limits = {
+                CONF_TEMP_SENSOR: (self.sensor_timeout, STUCK_TIME_CLIMATE),
+                CONF_HUMIDITY_SENSOR: (self.sensor_timeout, STUCK_TIME_CLIMATE),
+                CONF_MOISTURE_SENSOR: (self.sensor_timeout, STUCK_TIME_MOISTURE),
+            }
+            self._remove_watchdog = self.watchdog.async_watch(self.entry.entry_id, {
+                member: limit for role, limit in limits.items() for member in self.sensor_members(role)
+            }, self._async_sensors_changed)
+            self._async_sensors_changed()
+        # The domain-wide publisher sends all boxes to the displays in one frame
+        self.display.async_register(self)
+        self.async_request_update()
+
+    @callback
+    def _async_sensors_changed(self):
+        """Apply the sensor problems found by the watchdog."""
+        problems = self.watchdog.problems(self.entry.entry_id)
+        failed = frozenset(problems)
+        previous = self._failed_sensors
+        if failed == previous:
+            return
+        for entity_id in sorted(failed - previous):
+            self.add_log(f"Sensor gestört: {entity_id} ({problems[entity_id]})")
+        for entity_id in sorted(previous - failed):
+            self.add_log(f"Sensor wieder OK: {entity_id}")
+        self._failed_sensors = failed
+
+        # A zone goes on without its failed members and only fails once none is left
+        zoned = set()
+        degraded = set()
+        for zone in self.zones.values():
+            zone.async_exclude(failed)
+            zoned.update(zone.members)
+            if not zone.usable:
+                degraded.add(zone.entity_id)
+        self.controller.degraded = frozenset(degraded | (failed - zoned))
+        async_dispatcher_send(self.hass, SIGNAL_SENSORS_UPDATED.format(self.entry.entry_id))
+        self.async_request_update(SUBSYSTEM_CLIMATE, SUBSYSTEM_WATER)
 
     def async_unload(self):
         """Unload and clean up."""
-        if self._remove_update_listener:
-            self._remove_update_listener()
+        for controller in self.controllers:
+            controller.async_unload()
+        for zone in self.zones.values():
+            zone.async_unload()
+        self._executor.async_stop()
+        self.display.async_unregister(self.entry.entry_id)
+        if self._remove_timeline_listener:
+            self._remove_timeline_listener()
+            self._remove_timeline_listener = None
+        if self._remove_midnight_listener:
+            self._remove_midnight_listener()
+            self._remove_midnight_listener = None
+        if self._remove_moisture_listener:
+            self._remove_moisture_listener()
+            self._remove_moisture_listener = None
+        self._async_cancel_moisture_check()
+        if self._remove_watchdog:
+            self._remove_watchdog()
+            self._remove_watchdog = None
+        self.watering.async_cancel(self.entry.entry_id)
+        self.watering.async_release(self.entry.entry_id)
+
+    def as_snapshot(self) -> dict:
+        """Return the current runtime state for the panel."""
+        return {
+            "master_switch": self.master_switch_on,
+            "current_phase": self.current_phase,
+            "phase_start_date": self.phase_start_date.isoformat(),
+            "days_in_phase": self.days_in_phase,
+            "vpd": round(self.vpd, 2),
+            "timeline": [entry.as_dict() for entry in self.timeline],
+            "watering": self.watering.status(self.entry.entry_id),
+            "predicted_watering": self.predicted_watering.isoformat() if self.predicted_watering else None,
+            "health": self.health.status(self._actuator_targets()),
+            "alerts": self.alerts.active(),
+            "sensor_problems": self.watchdog.problems(self.entry.entry_id),
+            "zones": {role: zone.as_dict() for role, zone in self.zones.items()},
+        }
+
+    @callback
+    def _async_moisture_changed(self, event=None):
+        """Feed a new moisture reading to the drying model."""
+        self._moisture_dirty = True
+        value = self.readings.number(self.sensor(CONF_MOISTURE_SENSOR))
+        if value is None:
+            return
+
+        now = dt_util.utcnow()
+        if self.pump_start_time or (
+            self.last_pump_stop_time and (now - self.last_pump_stop_time).total_seconds() < SOAK_TIME
+        ):
+            return # Readings while watering and soaking are not drying
+
+        if self.drying.last is not None and value > self.drying.last + WATERING_JUMP:
+            # Watered (maybe by hand), the old fit no longer applies
+            self.drying.reset()
+        self.drying.add(now.timestamp(), value)
+        self._async_update_prediction()
+        self.runtime.async_schedule_save()
+        self.async_request_update(SUBSYSTEM_WATER)
+
+    @callback
+    def _async_update_prediction(self):
+        """Predict when the moisture crosses the target and plan the next check."""
+        target = self._get_phase_target("target_moisture", CONF_TARGET_MOISTURE, DEFAULT_TARGET_MOISTURE)
+        crossing = self.drying.predict(target)
+        predicted = dt_util.utc_from_timestamp(crossing) if crossing is not None else None
+        next_check = predicted - timedelta(seconds=PREDICTION_LEAD) if predicted else None
+        if next_check != self._next_moisture_check:
+            self._async_cancel_moisture_check()
+            self._next_moisture_check = next_check
+            if next_check:
+                self._remove_moisture_check = async_track_point_in_utc_time(
+                    self.hass, self._async_moisture_check_due, next_check
+                )
+        if predicted != self.predicted_watering:
+            self.predicted_watering = predicted
+            async_dispatcher_send(self.hass, SIGNAL_WATERING_PREDICTED.format(self.entry.entry_id))
 
     @property
     def days_in_phase(self) -> int:
         """Return number of days in current phase."""
-        if not self.phase_start_date:
-            return 0
-        now = dt_util.now()
-        start = self.phase_start_date
-        if start and start.tzinfo is None:
-            start = dt_util.as_local(start)
-        delta = now - start
-        return max(0, delta.days)
-
-    def _get_safe_state(self, entity_id: str):
-        if not entity_id:
-            return None
-        state = self.hass.states.get(entity_id)
-        if not state or state.state in ["unavailable", "unknown"]:
-            return None
-        return state
-
-    def _get_config_value(self, key, default, type_func=str):
-        val = self.config.get(key)
+        return self._days_in_phase
+
+    @callback
+    def _async_rebuild_timeline(self):
+        """Precompute the timeline and schedule the next phase transition."""
+        if self._remove_timeline_listener:
+            self._remove_timeline_listener()
+            self._remove_timeline_listener = None
+
+        self.timeline = build_timeline(
+            self.phases.order, self.phases.durations(), self.current_phase, self.phase_start_date
+        )
+
+        next_transition = self.timeline[0].end if self.timeline else None
+        if next_transition is not None and len(self.timeline) > 1:
+            self._remove_timeline_listener = async_track_point_in_time(
+                self.hass, self._async_handle_phase_transition, next_transition
+            )
+
+    @callback
+    def _async_handle_phase_transition(self, now: datetime.datetime):
+        """Advance to the phase the timeline has planned for now."""
+        self._remove_timeline_listener = None
+
+        # Jump straight to the right phase if transitions were missed while offline
+        target = entry_at(self.timeline, now) or self.timeline[-1]
+        if target.phase == self.current_phase:
+            return
+
+        _LOGGER.info("Timeline: advancing phase %s -> %s", self.current_phase, target.phase)
+        self.add_log(f"Phase gewechselt ({self.current_phase} -> {target.phase}, Zeitplan)")
+        self.set_phase(target.phase, target.start)
+
+    @callback
+    def _async_update_days_in_phase(self, now: datetime.datetime | None = None):
+        """Recompute days in phase and reschedule for the next local midnight."""
+        if self._remove_midnight_listener:
+            self._remove_midnight_listener()
+        today = dt_util.now().date()
+        start_day = dt_util.as_local(self.phase_start_date).date()
+        self._days_in_phase = max(0, (today - start_day).days)
+        async_dispatcher_send(self.hass, SIGNAL_PHASE_UPDATED.format(self.entry.entry_id))
+
+        self._remove_midnight_listener = async_track_point_in_time(
+            self.hass,
+            self._async_update_days_in_phase,
+            dt_util.start_of_local_day(today + timedelta(days=1)),
+        )
+
+    def _get_config_value(self, key, default, type_func=str, config: dict | None = None):
+        val = (self.config if config is None else config).get(key)
         if val is None or val == "":
             return default
         try:
@@ -156,393 +429,505 @@ class GrowBoxManager:
         except (ValueError, TypeError):
             return default
 
-    async def _async_update_logic(self, now: datetime.datetime):
-        if not self.master_switch_on:
-            return
-            
-        # Isolate Light Logic
-        try:
-            await self._async_update_light_logic(now)
-        except Exception as e:
-            _LOGGER.error("Error in Light Logic: %s", e)
-
-        # Isolate Climate Logic
-        try:
-            await self._async_update_climate_logic(now)
-        except Exception as e:
-            _LOGGER.error("Error in Climate Logic: %s", e)
-
-        # Isolate Water Logic
-        try:
-            await self._async_update_water_logic(now)
-        except Exception as e:
-            _LOGGER.error("Error in Water Logic: %s", e)
-
-        # Update Display Logic - Throttle to every 5 seconds
+    def _get_phase_target(
+        self, attr: str, key: str, default: float, config: dict | None = None, phases: PhaseRegistry | None = None
+    ) -> float:
+        """Return a target from the current phase, falling back to the box config."""
+        phase = (self.phases if phases is None else phases).get(self.current_phase)
+        value = getattr(phase, attr) if phase else None
+        if value is not None:
+            return value
+        return self._get_config_value(key, default, float, config)
+
+    def _get_float_state(self, entity_id: str) -> float | None:
+        return self.readings.number(entity_id)
+
+    @callback
+    def async_update_alerts(self):
+        """Feed the current sensor values to the alert rules."""
+        watering = self.master_switch_on and bool(self.config.get(CONF_PUMP_ENTITY))
+        temp_rise = self._get_config_value(CONF_ALERT_TEMP_RISE, DEFAULT_ALERT_TEMP_RISE, float)
+        values = {
+            "temp": self._get_float_state(self.sensor(CONF_TEMP_SENSOR)),
+            "humidity": self._get_float_state(self.sensor(CONF_HUMIDITY_SENSOR)),
+            "moisture": self._get_float_state(self.sensor(CONF_MOISTURE_SENSOR)),
+        }
+        limits = {"temp_rising": temp_rise or None}
+        if self._alerts_enabled:
+            limits["temp_high"] = self._get_phase_target("target_temp", CONF_TARGET_TEMP, DEFAULT_TARGET_TEMP)
+            limits["humidity_high"] = self._get_phase_target("max_humidity", CONF_MAX_HUMIDITY, DEFAULT_MAX_HUMIDITY)
+        if watering:
+            # Only meaningful while the automation is actually watering
+            limits["moisture_low"] = self._get_phase_target("target_moisture", CONF_TARGET_MOISTURE, DEFAULT_TARGET_MOISTURE)
+        self.alerts.async_update(time.monotonic(), values, limits)
+
+    @callback
+    def async_apply_options(self) -> bool:
+        """Take over changed options without a reload. Returns False if a reload is needed."""
+        config = effective_config(self.hass, self.entry)
+        changed = {key for key in config.keys() | self.config.keys() if config.get(key) != self.config.get(key)}
+        if not changed <= LIVE_OPTIONS:
+            return False
+        if changed:
+            self.config = config
+            # The panel's bootstrap payload still holds the old config
+            _async_get_bootstrap_cache(self.hass).async_invalidate(self.entry.entry_id)
+            if CONF_TARGET_MOISTURE in changed:
+                # The predicted watering and the next check follow the new target
+                self._async_update_prediction()
+            self.async_request_update()
+        # Also picks up a changed shadow profile, which is not part of the box config
+        self._apply_settings()
+        return True
+
+    @callback
+    def async_request_update(self, *subsystems: str):
+        """Request an evaluation of the given subsystems, all if none given."""
+        self._executor.async_request(subsystems or [controller.subsystem for controller in self.controllers])
+
+    async def _async_update_logic(self, subsystems=SUBSYSTEMS):
+        # Profiled only while a start_profiling capture covers this box
+        await self.profiler.async_run(self.entry.entry_id, self._async_run_logic(subsystems))
+
+    async def _async_run_logic(self, subsystems=SUBSYSTEMS):
+        paused = not self.master_switch_on
+        if paused:
+            self.trace.record("control", "none", "master_off")
+
+        for controller in self.controllers:
+            if controller.subsystem not in subsystems or (paused and not controller.run_when_paused):
+                continue
+            # The shadow runs first, so it sees the inputs before the active controller acts on them
+            shadowed = await self._async_evaluate_shadow(controller.subsystem)
+            # Isolate each subsystem, one failing must not stop the others
+            try:
+                await controller.async_update()
+            except Exception as e:
+                _LOGGER.error("Error in %s logic: %s", controller.subsystem, e)
+                continue
+            if shadowed:
+                self.shadow.compare(controller.subsystem)
+
+    async def _async_evaluate_shadow(self, subsystem: str) -> bool:
+        """Evaluate a subsystem in shadow mode. Returns True if it was evaluated."""
+        if self.shadow is None:
+            return False
         try:
-            now_utc = dt_util.utcnow()
-            if self._last_display_update is None or (now_utc - self._last_display_update).total_seconds() >= 5:
-                await self._async_update_display_logic()
-                self._last_display_update = now_utc
+            return await self.shadow.async_evaluate(subsystem, self._moisture_pending)
         except Exception as e:
-            _LOGGER.error("Error in Display Logic: %s", e)
-
-    async def _async_update_display_logic(self):
-        """Send current state to ESPHome Display"""
-        # Find all display services available
-        esphome_services = self.hass.services.async_services().get("esphome", {})
-        
-        # We look for the base service name of ANY connected display (ignoring the _update_room_X suffix)
-        basenames = set()
-        for s in esphome_services:
-            if "growbox_display" in s and "_update_room_" in s:
-                basename = s.rsplit("_update_room_", 1)[0]
-                basenames.add(basename)
-                
-        if not basenames:
-             return
-             
-        # Determine the "Room ID" (1 to 5) for THIS specific Grow Box instance
-        # We do this by sorting all configured Local Grow Box entries by their creation/ID
-        # so they always get the same slot on the display
-        all_entries = self.hass.config_entries.async_entries(DOMAIN)
-        # Sort by entry_id to keep the assignment semi-stable
-        all_entries.sort(key=lambda x: x.entry_id)
-        
-        room_index = 1
-        for i, entry in enumerate(all_entries):
-            if entry.entry_id == self.entry.entry_id:
-                room_index = i + 1
-                break
-                
-        # If a user has more than 5 boxes, cap it at 5 since our display only supports 5 pages
-        if room_index > 5:
-            room_index = 5
-            
-        target_service_suffix = f"_update_room_{room_index}"
-             
-        # Gather all current data
-        # Use the name the user gave this Grow Box integration instance
-        name = self.entry.title if self.entry and self.entry.title else f"Grow Box {room_index}"
-        if len(name) > 13:
-            name = name[:10] + "..."
-
-        # Temp
-        temp_entity = self.config.get(CONF_TEMP_SENSOR)
-        temp_state = self._get_safe_state(temp_entity)
-        temp_val = "--.-"
-        if temp_state:
-            try:
-                temp_val = f"{float(temp_state.state):.1f}"
-            except ValueError:
-                temp_val = str(temp_state.state)
-
-        # Hum
-        hum_entity = self.config.get(CONF_HUMIDITY_SENSOR)
-        hum_state = self._get_safe_state(hum_entity)
-        hum_val = "--"
-        if hum_state:
-            try:
-                hum_val = f"{float(hum_state.state):.1f}"
-                if hum_val.endswith(".0"):
-                    hum_val = hum_val[:-2]
-            except ValueError:
-                hum_val = str(hum_state.state)
-
-        # Soil
-        soil_entity = self.config.get(CONF_MOISTURE_SENSOR)
-        soil_state = self._get_safe_state(soil_entity)
-        soil_val = "--"
-        if soil_state:
-            try:
-                soil_val = f"{float(soil_state.state):.0f}"
-            except ValueError:
-                soil_val = str(soil_state.state)
+            # A broken shadow profile must never affect the real control
+            _LOGGER.error("Error in shadow %s logic: %s", subsystem, e)
+            return False
+
+    def get_display_data(self) -> dict:
+        """Return the formatted values shown on the ESPHome display."""
+        # Parsed and formatted once per state change, shared with the control logic
+        temp = self.readings.get(self.sensor(CONF_TEMP_SENSOR))
+        hum = self.readings.get(self.sensor(CONF_HUMIDITY_SENSOR))
+        soil = self.readings.get(self.sensor(CONF_MOISTURE_SENSOR))
+        light = self.readings.get(self.config.get(CONF_LIGHT_ENTITY))
+        fan = self.readings.get(self.config.get(CONF_FAN_ENTITY))
 
         # VPD is calculated globally in manager
         vpd_val = f"{self.vpd:.2f}" if self.vpd > 0 else "-.--"
+        light_str = "An" if light and light.is_on else "Aus"
 
-        # Light
-        light_entity = self.config.get(CONF_LIGHT_ENTITY)
-        light_state = self._get_safe_state(light_entity)
-        light_str = "Aus"
-        if light_state and light_state.state == "on":
-            light_str = "An"
-            
-        # Fan
-        fan_entity = self.config.get(CONF_FAN_ENTITY)
-        fan_state_obj = self._get_safe_state(fan_entity)
-        fan_str = "Aus"
-        if fan_state_obj and fan_state_obj.state == "on":
-            fan_str = "An"
-
-        display_data = {
-            "name": name,
-            "temp": temp_val,
-            "hum": hum_val,
-            "soil": soil_val,
+        return {
+            "temp": temp.formatted("temp", _format_temp) if temp else "--.-",
+            "hum": hum.formatted("hum", _format_humidity) if hum else "--",
+            "soil": soil.formatted("soil", _format_soil) if soil else "--",
             "vpd": vpd_val,
-            "light_state": f"{light_str} ({self.current_phase})",
-            "fan_state": fan_str
+            "light_state": f"{light_str} ({self.phases.display_name(self.current_phase)})",
+            "fan_state": "An" if fan and fan.is_on else "Aus",
         }
 
-        # Fire and forget updating all connected screens
-        for basename in basenames:
-            service_name = f"{basename}{target_service_suffix}"
-            try:
-                await self.hass.services.async_call("esphome", service_name, display_data)
-            except HomeAssistantError as err:
-                _LOGGER.debug("Failed to update display %s: %s", service_name, err)
-            except Exception as err:
-                _LOGGER.error("Unexpected error updating display %s: %s", service_name, err)
-
-    async def _async_update_light_logic(self, now: datetime.datetime):
-        light_entity = self.config.get(CONF_LIGHT_ENTITY)
-        if not light_entity:
-            return
-            
-        # Check if light is also configured as fan (common conflict)
-        fan_entity = self.config.get(CONF_FAN_ENTITY)
-        if fan_entity and fan_entity == light_entity:
-            _LOGGER.warning("CONFIGURATION ERROR: Light entity is same as Fan entity! This will cause toggling.")
-
-        light_hours = 0
-        phase = self.current_phase
-
-        if phase == PHASE_SEEDLING:
-            light_hours = self._get_config_value(CONF_PHASE_SEEDLING_HOURS, 18, float)
-        elif phase == PHASE_VEGETATIVE:
-            light_hours = self._get_config_value(CONF_PHASE_VEGETATIVE_HOURS, 18, float)
-        elif phase == PHASE_FLOWERING:
-            light_hours = self._get_config_value(CONF_PHASE_FLOWERING_HOURS, 12, float)
-        elif phase == PHASE_DRYING:
-            light_hours = self._get_config_value(CONF_PHASE_DRYING_HOURS, 0, float)
-        elif phase == PHASE_CURING:
-            light_hours = self._get_config_value(CONF_PHASE_CURING_HOURS, 0, float)
-        elif phase == self.config.get(CONF_CUSTOM1_NAME):
-            light_hours = self._get_config_value(CONF_CUSTOM1_HOURS, 0, float)
-        elif phase == self.config.get(CONF_CUSTOM2_NAME):
-            light_hours = self._get_config_value(CONF_CUSTOM2_HOURS, 0, float)
-        elif phase == self.config.get(CONF_CUSTOM3_NAME):
-            light_hours = self._get_config_value(CONF_CUSTOM3_HOURS, 0, float)
-        else:
-             light_hours = PHASE_LIGHT_HOURS.get(phase, 12)
-
-        start_hour = self._get_config_value(CONF_LIGHT_START_HOUR, DEFAULT_LIGHT_START_HOUR, int)
-        
-        # Validate start_hour to prevent crash
-        if not (0 <= start_hour <= 23):
-             _LOGGER.warning("Invalid start_hour %s. Using default.", start_hour)
-             start_hour = 18
+    def _control_settings(self, config: dict | None = None) -> ControlSettings:
+        """Return the entities and targets of the current phase for the controller core.
 
-        now_local = dt_util.now()
-        start_time = now_local.replace(hour=int(start_hour), minute=0, second=0, microsecond=0)
-        
-        # If we are before start_hour relative to 'today starts at 00:00', 
-        # then the cycle must have started yesterday.
-        if now_local.hour < int(start_hour):
-             start_time = start_time - timedelta(days=1)
-
-        elapsed = (now_local - start_time).total_seconds()
-        duration = float(light_hours) * 3600
-        is_light_time = 0 <= elapsed < duration
-
-        _LOGGER.debug(
-            "Light Logic: Phase=%s, Hours=%s, Start=%s, Now=%s, Elapsed=%.1f, Duration=%.1f, IsLightTime=%s", 
-            phase, light_hours, start_hour, now_local.strftime("%H:%M"), elapsed, duration, is_light_time
+        The shadow controller passes its own config, which may bring its own phases.
+        """
+        if config is None:
+            config, phases = self.config, self.phases
+        else:
+            phases = PhaseRegistry.from_config(config)
+        return ControlSettings(
+            light_entity=config.get(CONF_LIGHT_ENTITY),
+            fan_entity=config.get(CONF_FAN_ENTITY),
+            pump_entity=config.get(CONF_PUMP_ENTITY),
+            temp_sensor=self.sensor(CONF_TEMP_SENSOR, config),
+            humidity_sensor=self.sensor(CONF_HUMIDITY_SENSOR, config),
+            moisture_sensor=self.sensor(CONF_MOISTURE_SENSOR, config),
+            light_start_hour=self._get_config_value(CONF_LIGHT_START_HOUR, DEFAULT_LIGHT_START_HOUR, int, config),
+            light_hours=phases.light_hours(self.current_phase),
+            target_temp=self._get_phase_target("target_temp", CONF_TARGET_TEMP, DEFAULT_TARGET_TEMP, config, phases),
+            max_humidity=self._get_phase_target("max_humidity", CONF_MAX_HUMIDITY, DEFAULT_MAX_HUMIDITY, config, phases),
+            target_moisture=self._get_phase_target(
+                "target_moisture", CONF_TARGET_MOISTURE, DEFAULT_TARGET_MOISTURE, config, phases
+            ),
+            pump_duration=self._get_config_value(CONF_PUMP_DURATION, DEFAULT_PUMP_DURATION, float, config),
+            soak_time=SOAK_TIME,
+            pump_start_grace=PUMP_START_GRACE,
         )
 
-        current_state = self._get_safe_state(light_entity)
-        if not current_state:
-            return
-            
-        if current_state.state in ["unavailable", "unknown"]:
-            _LOGGER.debug("Light entity %s is unavailable. Skipping.", light_entity)
-            return
-
-        is_on = current_state.state == "on"
-        
-        if is_light_time and not is_on:
-            # Check Manual Override (Debounce 15 mins)
-            last_changed = current_state.last_changed
-            if last_changed:
-                diff = (dt_util.utcnow() - last_changed).total_seconds()
-                if diff < 10:
-                    _LOGGER.info("Light manual override detected (changed %.0fs ago). Skipping auto-control.", diff)
-                    return
-
-            _LOGGER.info("Light should be ON. Turning ON.")
-            self.add_log("Licht eingeschaltet (Automatik)")
-            await self.hass.services.async_call("homeassistant", "turn_on", {"entity_id": light_entity})
-        elif not is_light_time and is_on:
-            # Check Manual Override (Debounce 15 mins)
-            last_changed = current_state.last_changed
-            if last_changed:
-                diff = (dt_util.utcnow() - last_changed).total_seconds()
-                if diff < 900:
-                    _LOGGER.info("Light manual override detected (changed %.0fs ago). Skipping auto-control.", diff)
-                    return
-
-            _LOGGER.info("Light should be OFF. Turning OFF.")
-            self.add_log("Licht ausgeschaltet (Automatik)")
-            await self.hass.services.async_call("homeassistant", "turn_off", {"entity_id": light_entity})
-
-    async def _async_update_water_logic(self, now: datetime.datetime):
-        pump_entity = self.config.get(CONF_PUMP_ENTITY)
-        if not pump_entity:
-            return
-
-        pump_state = self._get_safe_state(pump_entity)
-        if not pump_state:
+    def _build_zones(self) -> dict[str, SensorZone]:
+        """Return a zone for every sensor role with additional sensors."""
+        zones = {}
+        for role, zone in (self.config.get(CONF_ZONES) or {}).items():
+            # The role's own sensor stays the first member
+            members = list(dict.fromkeys(
+                entity_id for entity_id in (self.config.get(role), *zone.get("sensors", ())) if entity_id
+            ))
+            if len(members) < 2:
+                continue
+            zones[role] = SensorZone(
+                self.hass, self.readings, f"{DOMAIN}.{self.entry.entry_id}_{role}", members,
+                zone.get("policy", AGGREGATE_MEAN), zone.get("weights"),
+                self._async_moisture_changed if role == CONF_MOISTURE_SENSOR else None,
+            )
+        return zones
+
+    def sensor(self, role: str, config: dict | None = None) -> str | None:
+        """Return the entity the logic reads for a sensor role, the zone if it has several sensors."""
+        if (zone := self.zones.get(role)) is not None:
+            return zone.entity_id
+        return (self.config if config is None else config).get(role)
+
+    def sensor_members(self, role: str) -> list[str]:
+        """Return the real sensors behind a sensor role."""
+        if (zone := self.zones.get(role)) is not None:
+            return list(zone.members)
+        return [entity_id] if (entity_id := self.config.get(role)) else []
+
+    @callback
+    def _apply_settings(self) -> None:
+        """Hand the current targets to the controller and to the shadow controller."""
+        self.controller.settings = self._control_settings()
+        if not (profile := self.config.get(CONF_SHADOW_PROFILE)):
+            self.shadow = None
             return
-            
-        if pump_state.state in ["unavailable", "unknown"]:
-            return
-
-        is_on = pump_state.state == "on"
-        duration = self._get_config_value(CONF_PUMP_DURATION, DEFAULT_PUMP_DURATION, float)
-        
-        if is_on:
-            # Start tracking if not already
-            if not self.pump_start_time:
-                 self.pump_start_time = now
-            
-            elapsed = (now - self.pump_start_time).total_seconds()
-            
-            if elapsed >= duration:
-                 _LOGGER.info("Pump ran for %.1fs. Turning OFF.", elapsed)
-                 self.add_log(f"Pumpe ausgeschaltet (Lief {elapsed:.1f}s)")
-                 await self.hass.services.async_call("homeassistant", "turn_off", {"entity_id": pump_entity})
-                 self.last_pump_stop_time = now
-                 self.pump_start_time = None
+        # The shadow profile goes on top of everything else, it only needs the values under test
+        config = {**self.config, **self.hass.data[DATA_PROFILES].get(profile)}
+        settings = self._control_settings(config)
+        if self.shadow is None or self.shadow.name != profile:
+            # Counts start over for another profile
+            self.shadow = ShadowController(profile, self.controller, settings)
         else:
-            # Pump is OFF
-            self.pump_start_time = None
-            
-            # Soak Time Check (15 min)
-            if self.last_pump_stop_time:
-                 time_off = (now - self.last_pump_stop_time).total_seconds()
-                 if time_off < 900: # 900s = 15 min
-                      return
-
-            # Moisture Check
-            moisture_entity = self.config.get(CONF_MOISTURE_SENSOR)
-            if not moisture_entity:
-                return
-                
-            state = self._get_safe_state(moisture_entity)
-            if not state or state.state in ["unavailable", "unknown"]:
-                return
-            
-            try:
-                val = float(state.state)
-                target = self._get_config_value(CONF_TARGET_MOISTURE, DEFAULT_TARGET_MOISTURE, float)
-                
-                if val < target:
-                     _LOGGER.info("Moisture low (%.1f < %.1f). Starting Pump.", val, target)
-                     self.add_log(f"Pumpe eingeschaltet (Bodenfeuchte {val}% < {target}%)")
-                     await self.hass.services.async_call("homeassistant", "turn_on", {"entity_id": pump_entity})
-                     self.pump_start_time = now
-            except ValueError:
-                pass
-
-    async def _async_update_climate_logic(self, now: datetime.datetime):
-        temp_entity = self.config.get(CONF_TEMP_SENSOR)
-        humid_entity = self.config.get(CONF_HUMIDITY_SENSOR)
-        fan_entity = self.config.get(CONF_FAN_ENTITY)
-        
-        if not temp_entity or not humid_entity:
-            return
-
-        target_temp = self._get_config_value(CONF_TARGET_TEMP, DEFAULT_TARGET_TEMP, float)
-        max_humidity = self._get_config_value(CONF_MAX_HUMIDITY, DEFAULT_MAX_HUMIDITY, float)
-
-        temp_state = self._get_safe_state(temp_entity)
-        humid_state = self._get_safe_state(humid_entity)
-
-        if not temp_state or not humid_state:
-             return
+            self.shadow.controller.settings = settings
 
-        try:
-            current_temp = float(temp_state.state)
-            current_humid = float(humid_state.state)
-        except ValueError:
-            return
-
-        svp = 0.61078 * math.exp((17.27 * current_temp) / (current_temp + 237.3))
-        self.vpd = svp * (1 - current_humid / 100)
+    @property
+    def vpd(self) -> float:
+        """Return the VPD computed by the climate logic."""
+        return self.controller.vpd
 
-        if not fan_entity:
-            return
-            
-        fan_state = self._get_safe_state(fan_entity)
-        if not fan_state:
-            return
+    @property
+    def pump_start_time(self):
+        return self.controller.pump_start_time
+
+    @pump_start_time.setter
+    def pump_start_time(self, value):
+        self.controller.pump_start_time = value
+
+    @callback
+    def _async_moisture_check_due(self, _now):
+        """Check the moisture just before the predicted crossing."""
+        self._remove_moisture_check = None
+        self.async_request_update(SUBSYSTEM_WATER)
+
+    @callback
+    def _async_cancel_moisture_check(self):
+        self._next_moisture_check = None
+        if self._remove_moisture_check:
+            self._remove_moisture_check()
+            self._remove_moisture_check = None
 
-        is_fan_on = fan_state.state == "on"
-        should_fan_on = False
+    @property
+    def last_pump_stop_time(self):
+        return self.controller.last_pump_stop_time
+
+    @last_pump_stop_time.setter
+    def last_pump_stop_time(self, value):
+        self.controller.last_pump_stop_time = value
+
+    def moisture_due(self, now: datetime.datetime) -> bool:
+        """Return True if the moisture needs a check, consuming the request."""
+        if not self._moisture_pending(now):
+            return False
+        self._moisture_dirty = False
+        if self._next_moisture_check is not None and now >= self._next_moisture_check:
+            # One check per predicted crossing, a new reading plans the next one
+            self._async_cancel_moisture_check()
+        return True
+
+    def _moisture_pending(self, now: datetime.datetime) -> bool:
+        """Return True if the moisture needs a check, without consuming the request."""
+        # Nothing to do until a new reading arrives or the predicted crossing is near
+        return self._moisture_dirty or (self._next_moisture_check is not None and now >= self._next_moisture_check)
+
+    # Actuators and listener of the controller core
+
+    def available(self, entity_id: str) -> bool:
+        """Return False while the actuator's circuit breaker is open."""
+        return self.health.available(entity_id)
+
+    async def async_switch(self, entity_id: str, turn_on: bool, force: bool = False) -> bool:
+        """Switch an actuator for the controller core."""
+        return await self._async_switch(entity_id, turn_on, force)
+
+    def request_watering(self, deficit: float, value: float, target: float) -> None:
+        """Queue a watering run, the fleet scheduler decides when this box may start its pump."""
+        self._watering_reason = (value, target)
+        self.watering.async_request(self.entry.entry_id, deficit, self._pump_power, self._async_start_pump)
+
+    def cancel_watering(self) -> None:
+        """Drop the queued watering run."""
+        self.watering.async_cancel(self.entry.entry_id)
+
+    def on_pump_running(self) -> None:
+        """Started outside the queue (e.g. manually) or before a restart, still counts towards the budget."""
+        self.watering.async_mark_running(self.entry.entry_id, self._pump_power)
+
+    def on_pump_idle(self) -> None:
+        """Free the watering slot."""
+        self.watering.async_release(self.entry.entry_id)
+
+    def on_pump_stopped(self) -> None:
+        """A new drying period starts once the water soaked in."""
+        self.drying.reset()
+        self._async_update_prediction()
+        self._moisture_dirty = True
+        self.watering.async_release(self.entry.entry_id)
+
+    def on_state_changed(self) -> None:
+        """Persist the pump timing."""
+        self.runtime.async_schedule_save()
+
+    async def _async_start_pump(self) -> bool:
+        """Start the pump once the watering scheduler grants a slot."""
+        pump_entity = self.config.get(CONF_PUMP_ENTITY)
+        if not self.master_switch_on or not pump_entity or not self._watering_reason:
+            return False
 
-        if current_temp > target_temp or current_humid > max_humidity:
-            should_fan_on = True
-        elif current_temp < (target_temp - 1.0) and current_humid < (max_humidity - 5.0):
-             should_fan_on = False
-        else:
-             should_fan_on = is_fan_on
+        val, target = self._watering_reason
+        _LOGGER.info("Moisture low (%.1f < %.1f). Starting Pump.", val, target)
+        self.pump_start_time = dt_util.now()
+        if not await self._async_switch(pump_entity, True):
+            self.pump_start_time = None
+            return False
+        self.runtime.async_schedule_save()
+        self.add_log(f"Pumpe eingeschaltet (Bodenfeuchte {val}% < {target}%)")
+        return True
+
+    async def _async_switch(self, entity_id: str, turn_on: bool, force: bool = False) -> bool:
+        """Switch an actuator through its circuit breaker. Returns True on success."""
+        service = "turn_on" if turn_on else "turn_off"
+        return await self.health.async_call(
+            "homeassistant", service, {"entity_id": entity_id}, entity_id, force=force
+        )
 
-        if should_fan_on and not is_fan_on:
-             self.add_log(f"Abluft eingeschaltet (T={current_temp}°, H={current_humid}%)")
-             await self.hass.services.async_call("homeassistant", "turn_on", {"entity_id": fan_entity})
-        elif not should_fan_on and is_fan_on:
-             self.add_log(f"Abluft ausgeschaltet (T={current_temp}°, H={current_humid}%)")
-             await self.hass.services.async_call("homeassistant", "turn_off", {"entity_id": fan_entity})
+    def _actuator_targets(self) -> list[str]:
+        return [
+            entity for entity in (
+                self.config.get(CONF_LIGHT_ENTITY),
+                self.config.get(CONF_FAN_ENTITY),
+                self.config.get(CONF_PUMP_ENTITY),
+            ) if entity
+        ]
 
     def set_master_switch(self, state: bool):
         self.master_switch_on = state
-        self.hass.async_create_task(self._async_update_logic(dt_util.now()))
-
-    def set_phase(self, phase: str):
+        self._moisture_dirty = True
+        self.runtime.async_schedule_save()
+        if not state:
+            self.watering.async_cancel(self.entry.entry_id)
+        self.async_request_update()
+
+    def set_phase(self, phase: str, start_date: datetime.datetime | None = None):
+        """Change the phase without a reload. A new phase starts now unless given."""
+        if start_date is None and phase != self.current_phase:
+            start_date = dt_util.now()
         self.current_phase = phase
-        self.hass.async_create_task(self._async_update_logic(dt_util.now()))
+        if start_date is not None:
+            self.phase_start_date = start_date
+        self.runtime.async_schedule_save()
+        self._apply_settings()
+        # The phase may bring a different moisture target
+        self._moisture_dirty = True
+        self._async_update_prediction()
+        self._async_rebuild_timeline()
+        self._async_update_days_in_phase()
+        self.async_request_update()
+
+def _parse_start_date(value) -> datetime.datetime | None:
+    """Parse a stored or entered phase start date."""
+    if not value:
+        return None
+    try:
+        start_date = datetime.datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+    if start_date.tzinfo is None:
+        # Dates entered in the panel are local dates without offset
+        start_date = start_date.replace(tzinfo=dt_util.DEFAULT_TIME_ZONE)
+    return start_date
+
+def _format_temp(parsed: ParsedState) -> str:
+    number = parsed.number
+    return f"{number:.1f}" if number is not None else str(parsed.source.state)
+
+def _format_humidity(parsed: ParsedState) -> str:
+    number = parsed.number
+    if number is None:
+        return str(parsed.source.state)
+    text = f"{number:.1f}"
+    return text[:-2] if text.endswith(".0") else text
+
+def _format_soil(parsed: ParsedState) -> str:
+    number = parsed.number
+    return f"{number:.0f}" if number is not None else str(parsed.source.state)
+
+@callback
+def _async_get_reading_cache(hass: HomeAssistant) -> ReadingCache:
+    """Return the domain-wide reading cache, creating it on first use."""
+    if (cache := hass.data.get(DATA_READINGS)) is None:
+        cache = hass.data[DATA_READINGS] = ReadingCache(hass)
+    return cache
+
+@callback
+def _async_get_health_tracker(hass: HomeAssistant) -> HealthTracker:
+    """Return the domain-wide health tracker, creating it on first use."""
+    if (tracker := hass.data.get(DATA_HEALTH)) is None:
+        tracker = hass.data[DATA_HEALTH] = HealthTracker(hass)
+    return tracker
+
+@callback
+def _async_get_profiler(hass: HomeAssistant) -> Profiler:
+    """Return the domain-wide profiler, creating it on first use."""
+    if (profiler := hass.data.get(DATA_PROFILER)) is None:
+        profiler = hass.data[DATA_PROFILER] = Profiler(hass)
+    return profiler
+
+@callback
+def _async_get_history_cache(hass: HomeAssistant) -> HistoryCache:
+    """Return the domain-wide history cache, creating it on first use."""
+    if (cache := hass.data.get(DATA_HISTORY)) is None:
+        cache = hass.data[DATA_HISTORY] = HistoryCache(hass)
+    return cache
+
+@callback
+def _async_get_watchdog(hass: HomeAssistant) -> SensorWatchdog:
+    """Return the domain-wide sensor watchdog, creating it on first use."""
+    if (watchdog := hass.data.get(DATA_WATCHDOG)) is None:
+        watchdog = hass.data[DATA_WATCHDOG] = SensorWatchdog(hass)
+    return watchdog
+
+@callback
+def _async_get_watering_scheduler(hass: HomeAssistant, conf: dict | None = None) -> WateringScheduler:
+    """Return the domain-wide watering scheduler, creating it on first use."""
+    if (scheduler := hass.data.get(DATA_WATERING)) is None:
+        conf = conf or {}
+        scheduler = hass.data[DATA_WATERING] = WateringScheduler(
+            hass,
+            max_concurrent=conf.get(CONF_MAX_CONCURRENT_PUMPS, 0),
+            power_budget=conf.get(CONF_PUMP_POWER_BUDGET, 0),
+        )
+    return scheduler
+
+@callback
+def _async_get_bootstrap_cache(hass: HomeAssistant) -> BootstrapCache:
+    """Return the domain-wide bootstrap cache, creating it on first use."""
+    if (cache := hass.data.get(DATA_BOOTSTRAP)) is None:
+        cache = hass.data[DATA_BOOTSTRAP] = BootstrapCache(hass)
+        cache.async_setup()
+    return cache
 
 async def async_setup(hass: HomeAssistant, config: dict) -> bool:
-    await hass.http.async_register_static_paths([
-        StaticPathConfig("/local_grow_box", hass.config.path("custom_components/local_grow_box/frontend"), True)
-    ])
+    _async_get_watering_scheduler(hass, config.get(DOMAIN))
+
+    profiles = hass.data[DATA_PROFILES] = ProfileStore(hass)
+    await profiles.async_load()
+
+    publisher = hass.data[DATA_DISPLAY] = DisplayPublisher(hass, _async_get_health_tracker(hass))
+    await publisher.async_load()
+
     img_path = hass.config.path("www", "local_grow_box_images")
     if not os.path.exists(img_path):
         os.makedirs(img_path)
+
+    # Assets are versioned by content hash, so clients only re-download after real changes
+    store = AssetStore(hass)
+    hass.data[DATA_IMAGES] = ImageIndex(hass, img_path)
+    hass.http.register_view(GrowBoxFrontendView(store))
+    hass.http.register_view(GrowBoxImageView(hass.data[DATA_IMAGES]))
+
+    # Every viewer is served from one fetch per camera and TTL
+    conf = config.get(DOMAIN) or {}
+    snapshots = hass.data[DATA_SNAPSHOTS] = SnapshotCache(
+        hass,
+        ttl=conf.get(CONF_SNAPSHOT_TTL, DEFAULT_TTL),
+        budget=int(conf.get(CONF_SNAPSHOT_CACHE_SIZE, DEFAULT_CACHE_SIZE) * 1024 * 1024),
+    )
+    hass.http.register_view(GrowBoxSnapshotView(snapshots))
+
     await panel_custom.async_register_panel(
         hass, webcomponent_name="local-grow-box-panel", frontend_url_path="grow-room",
-        module_url=f"/local_grow_box/local-grow-box-panel.js?v={int(dt_util.now().timestamp())}",
+        module_url=await store.async_url(PANEL_FILENAME, "/local_grow_box"),
         sidebar_title="Grow Room", sidebar_icon="mdi:sprout", require_admin=False,
     )
 
     # Register Websocket API
     _LOGGER.debug("Registering Local Grow Box Websocket Commands")
     try:
-        websocket_api.async_register_command(hass, ws_upload_image)
-        websocket_api.async_register_command(hass, ws_update_config)
-        websocket_api.async_register_command(hass, ws_get_config)
-        websocket_api.async_register_command(hass, ws_get_logs)
+        for command in WEBSOCKET_COMMANDS:
+            websocket_api.async_register_command(hass, command)
     except Exception as e:
         _LOGGER.warning("Failed to register websocket commands in async_setup (might be duplicate): %s", e)
-    
+
+    _async_register_services(hass)
     return True
 
+@callback
+def _async_register_services(hass: HomeAssistant) -> None:
+    """Register the domain services."""
+    profiler = _async_get_profiler(hass)
+
+    async def async_start_profiling(call: ServiceCall) -> None:
+        entry_ids = call.data.get("entry_id")
+        if not profiler.async_start(call.data["duration"], set(entry_ids) if entry_ids else None):
+            _LOGGER.warning("Profiling is already running or not possible")
+
+    async def async_stop_profiling(call: ServiceCall) -> None:
+        await profiler.async_stop()
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_START_PROFILING, async_start_profiling,
+        schema=vol.Schema({
+            vol.Optional("duration", default=DEFAULT_DURATION): vol.All(
+                vol.Coerce(float), vol.Range(min=1, max=MAX_DURATION)
+            ),
+            vol.Optional("entry_id"): vol.All(cv.ensure_list, [str]),
+        }),
+    )
+    hass.services.async_register(DOMAIN, SERVICE_STOP_PROFILING, async_stop_profiling)
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     hass.data.setdefault(DOMAIN, {})
     
     # FAILSAFE: Ensure commands are registered even if async_setup didn't run or failed
     try:
-        websocket_api.async_register_command(hass, ws_upload_image)
-        websocket_api.async_register_command(hass, ws_update_config)
-        websocket_api.async_register_command(hass, ws_get_config)
-        websocket_api.async_register_command(hass, ws_get_logs)
+        for command in WEBSOCKET_COMMANDS:
+            websocket_api.async_register_command(hass, command)
     except Exception:
         pass # Expected if already registered
 
+    _async_get_watering_scheduler(hass)
+    _async_get_health_tracker(hass)
+    _async_get_profiler(hass)
+    _async_get_watchdog(hass)
+    _async_get_reading_cache(hass)
     manager = GrowBoxManager(hass, entry)
     hass.data[DOMAIN][entry.entry_id] = manager
+    _async_get_bootstrap_cache(hass).async_invalidate(entry.entry_id)
+    await manager.async_restore()
     await manager.async_setup()
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     entry.async_on_unload(entry.add_update_listener(async_reload_entry))
@@ -551,9 +936,20 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     manager = hass.data[DOMAIN].pop(entry.entry_id)
     manager.async_unload()
+    # The next setup must not read a state older than the pending save
+    await manager.runtime.async_flush()
+    _async_get_bootstrap_cache(hass).async_invalidate(entry.entry_id)
     return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    if (publisher := hass.data.get(DATA_DISPLAY)) is not None:
+        publisher.async_remove_room(entry.entry_id)
+    await async_remove_runtime(hass, entry.entry_id)
+
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    manager = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    if manager is not None and manager.async_apply_options():
+        return # Only targets changed, the running box took them over
     await hass.config_entries.async_reload(entry.entry_id)
 
 @websocket_api.websocket_command({
@@ -565,30 +961,168 @@ async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
 async def ws_update_config(hass, connection, msg):
     """Handle config update."""
     entry_id = msg["entry_id"]
-    new_config = msg["config"]
     entry = hass.config_entries.async_get_entry(entry_id)
 
     if not entry:
         connection.send_error(msg["id"], "not_found", "Entry not found")
         return
 
-    # Check for phase change to update start date
-    if "current_phase" in new_config:
+    try:
+        new_config = _prepare_config(hass, entry, msg["config"], set(hass.data[DATA_PROFILES].as_dict()))
+    except vol.Invalid as err:
+        connection.send_error(msg["id"], "invalid_format", str(err))
+        return
+
+    _, opts = _async_apply_config(hass, entry, new_config)
+    manager = hass.data.get(DOMAIN, {}).get(entry_id)
+    connection.send_result(msg["id"], {"options": {**opts, **(manager.runtime_options() if manager else {})}})
+
+def _prepare_config(hass: HomeAssistant, entry: ConfigEntry, new_config: dict, profiles: set[str]) -> dict:
+    """Validate a config change of one box without applying it. Raises vol.Invalid."""
+    new_config = dict(new_config)
+    if new_config.get(CONF_PHASES) is not None:
+        try:
+            new_config[CONF_PHASES] = PHASES_SCHEMA(new_config[CONF_PHASES])
+        except vol.Invalid as err:
+            raise vol.Invalid(f"Invalid phases: {err}") from err
+    if new_config.get(CONF_ZONES) is not None:
+        try:
+            new_config[CONF_ZONES] = ZONES_SCHEMA(new_config[CONF_ZONES])
+        except vol.Invalid as err:
+            raise vol.Invalid(f"Invalid zones: {err}") from err
+
+    for key in (CONF_PROFILE, CONF_SHADOW_PROFILE):
+        if (profile := new_config.get(key)) and profile not in profiles:
+            raise vol.Invalid(f"Unknown profile: {profile}")
+
+    manager = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    if manager and (phase := new_config.get("current_phase")) and phase not in manager.phases:
+        raise vol.Invalid(f"Unknown phase: {phase}")
+    return new_config
+
+@callback
+def _async_apply_config(hass: HomeAssistant, entry: ConfigEntry, new_config: dict) -> tuple[str, dict]:
+    """Apply a validated config change of one box.
+
+    Returns the result ("unchanged", "live", "reload" or "stored" for a box
+    that is not loaded) and the new options.
+    """
+    result = "unchanged"
+    new_config = dict(new_config)
+    manager = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    if manager:
+        # Phase and start date are runtime state, changing them needs no reload
+        phase = new_config.pop("current_phase", None) or manager.current_phase
+        start_date = _parse_start_date(new_config.pop(CONF_PHASE_START_DATE, None))
+        if start_date is not None and dt_util.as_local(start_date).date() == dt_util.as_local(manager.phase_start_date).date():
+            start_date = None # Unchanged date from the settings form, keep the exact start
+        if phase != manager.current_phase or start_date is not None:
+            manager.set_phase(phase, start_date)
+            result = "live"
+    elif "current_phase" in new_config:
+        # Box not loaded, keep the old behaviour of storing it in the options
         full_config = {**entry.data, **entry.options}
-        current_phase = full_config.get("current_phase") if full_config else None
-        
-        if current_phase != new_config.get("current_phase"):
+        if full_config.get("current_phase") != new_config.get("current_phase"):
             # If phase changed and no start date provided, reset it
             if CONF_PHASE_START_DATE not in new_config:
                 new_config[CONF_PHASE_START_DATE] = dt_util.now().isoformat()
 
-    # Clean empty values
     # Clean None values, but ALLOW empty strings (to clear fields)
     clean = {k: v for k, v in new_config.items() if v is not None}
     opts = {**entry.options, **clean}
-    
-    hass.config_entries.async_update_entry(entry, options=opts)
-    connection.send_result(msg["id"], {"options": opts})
+
+    # Only a real config change is written, and only a structural one reloads the box
+    if opts != dict(entry.options):
+        hass.config_entries.async_update_entry(entry, options=opts)
+        _async_get_bootstrap_cache(hass).async_invalidate(entry.entry_id)
+        if manager is None:
+            result = "stored"
+        else:
+            result = "live" if manager.async_apply_options() else "reload"
+    return result, opts
+
+@websocket_api.websocket_command({
+    vol.Required("type"): "local_grow_box/bulk_update",
+    vol.Optional("profiles", default={}): {str: vol.Any(None, dict)},
+    vol.Optional("updates", default=[]): [{
+        vol.Required("entry_id"): str,
+        vol.Required("config"): dict,
+    }],
+})
+@websocket_api.async_response
+async def ws_bulk_update(hass, connection, msg):
+    """Handle changes to profiles and many boxes in one call.
+
+    Everything is validated first, nothing is applied if anything is
+    invalid. The config entries and profiles are each written once (both
+    stores delay their save), and boxes take over target changes live.
+    """
+    profiles = hass.data[DATA_PROFILES]
+    errors = {}
+
+    profile_changes = {}
+    for name, values in msg["profiles"].items():
+        try:
+            profile_changes[PROFILE_NAME(name)] = None if values is None else PROFILE_SCHEMA(values)
+        except vol.Invalid as err:
+            errors[f"profile:{name}"] = str(err)
+    known = {name for name in profiles.as_dict() if name not in profile_changes}
+    known.update(name for name, values in profile_changes.items() if values is not None)
+
+    prepared = {}
+    for update in msg["updates"]:
+        entry_id = update["entry_id"]
+        entry = hass.config_entries.async_get_entry(entry_id)
+        if entry is None or entry.domain != DOMAIN:
+            errors[entry_id] = "Entry not found"
+            continue
+        try:
+            prepared[entry_id] = (entry, _prepare_config(hass, entry, update["config"], known))
+        except vol.Invalid as err:
+            errors[entry_id] = str(err)
+
+    # A deleted profile must not be left referenced
+    for entry in hass.config_entries.async_entries(DOMAIN):
+        options = prepared[entry.entry_id][1] if entry.entry_id in prepared else entry.options
+        for key in (CONF_PROFILE, CONF_SHADOW_PROFILE):
+            profile = options.get(key, entry.options.get(key))
+            if profile and profile not in known:
+                errors.setdefault(entry.entry_id, f"Unknown profile: {profile}")
+
+    if errors:
+        connection.send_error(
+            msg["id"], "invalid_format", "; ".join(f"{key}: {error}" for key, error in errors.items())
+        )
+        return
+
+    results = {}
+    if profile_changes:
+        profiles.async_update(profile_changes)
+        _async_get_bootstrap_cache(hass).async_invalidate()
+    for entry_id, (entry, new_config) in prepared.items():
+        results[entry_id], _ = _async_apply_config(hass, entry, new_config)
+
+    # Boxes that only see a changed profile
+    for entry_id, manager in hass.data.get(DOMAIN, {}).items():
+        if entry_id in results or not profile_changes.keys() & {
+            manager.config.get(CONF_PROFILE), manager.config.get(CONF_SHADOW_PROFILE),
+        }:
+            continue
+        if manager.async_apply_options():
+            results[entry_id] = "live"
+        else:
+            results[entry_id] = "reload"
+            hass.async_create_task(hass.config_entries.async_reload(entry_id))
+
+    connection.send_result(msg["id"], {"results": results, "profiles": profiles.as_dict()})
+
+@websocket_api.websocket_command({
+    vol.Required("type"): "local_grow_box/get_profiles",
+})
+@callback
+def ws_get_profiles(hass, connection, msg):
+    """Handle get the named configuration profiles."""
+    connection.send_result(msg["id"], {"profiles": hass.data[DATA_PROFILES].as_dict()})
 
 @websocket_api.websocket_command({
     vol.Required("type"): "local_grow_box/upload_image",
@@ -608,17 +1142,16 @@ async def ws_upload_image(hass, connection, msg):
 
     try:
         decoded = base64.b64decode(image_data)
-        img_path = hass.config.path("www", "local_grow_box_images", f"{device_id}.jpg")
-        
-        def _write_file():
-            with open(img_path, "wb") as f:
-                f.write(decoded)
+        index = hass.data.get(DATA_IMAGES) or ImageIndex(hass, hass.config.path("www", "local_grow_box_images"))
+        if (filename := index.upload_filename(device_id)) is None:
+            connection.send_error(msg["id"], "invalid_format", "Invalid device_id")
+            return
 
-        await hass.async_add_executor_job(_write_file)
+        # Rotating and scaling the photo runs in the executor, off the event loop
+        version = await hass.async_add_executor_job(index.store_upload, device_id, decoded)
 
-        # Update config entry with version timestamp to bust cache
+        # Store the content hash so the panel URL only changes with the image
         try:
-            timestamp = int(dt_util.now().timestamp())
             entry = None
             if entry_id:
                 entry = hass.config_entries.async_get_entry(entry_id)
@@ -628,24 +1161,24 @@ async def ws_upload_image(hass, connection, msg):
                 entry = hass.config_entries.async_get_entry(device_id)
 
             if entry:
-                new_opts = {**entry.options, "image_version": timestamp}
+                new_opts = {**entry.options, "image_version": version}
                 hass.config_entries.async_update_entry(entry, options=new_opts)
                 
                 # Update running manager immediately to avoid race condition
                 if DOMAIN in hass.data and entry.entry_id in hass.data[DOMAIN]:
                     manager = hass.data[DOMAIN][entry.entry_id]
                     if hasattr(manager, 'config'):
-                        manager.config["image_version"] = timestamp
+                        manager.config["image_version"] = version
+                # The panel refetches right away and must see the new version
+                _async_get_bootstrap_cache(hass).async_invalidate(entry.entry_id)
             else:
                 _LOGGER.warning("Upload: No entry found for device_id %s / entry_id %s", device_id, entry_id)
         except Exception as err:
             _LOGGER.error("Error updating config entry during upload: %s", err)
-            # Default to current time if config update fails, so frontend at least tries to refresh
-            timestamp = int(dt_util.now().timestamp())
             
         connection.send_result(msg["id"], {
-            "path": f"/local/local_grow_box_images/{device_id}.jpg",
-            "version": timestamp
+            "path": f"/local_grow_box/images/{filename}",
+            "version": version
         })
     except Exception as e:
         _LOGGER.error("Upload failed: %s", e)
@@ -665,12 +1198,19 @@ async def ws_get_config(hass, connection, msg):
         connection.send_error(msg["id"], "not_found", "Entry not found")
         return
 
-    data = {**entry.data, **entry.options}
-    connection.send_result(msg["id"], {"config": data})
+    data = effective_config(hass, entry)
+    if manager := hass.data.get(DOMAIN, {}).get(entry_id):
+        data.update(manager.runtime_options())
+    connection.send_result(msg["id"], {
+        "config": data,
+        "phases": PhaseRegistry.from_config(data).as_list(),
+    })
 
 @websocket_api.websocket_command({
     vol.Required("type"): "local_grow_box/get_logs",
     vol.Required("entry_id"): str,
+    vol.Optional("offset", default=0): vol.All(int, vol.Range(min=0)),
+    vol.Optional("limit"): vol.All(int, vol.Range(min=1)),
 })
 @websocket_api.async_response
 async def ws_get_logs(hass, connection, msg):
@@ -678,6 +1218,121 @@ async def ws_get_logs(hass, connection, msg):
     entry_id = msg["entry_id"]
     manager = hass.data[DOMAIN].get(entry_id)
     if manager:
-        connection.send_result(msg["id"], {"logs": manager.logs})
+        offset = msg["offset"]
+        end = offset + msg["limit"] if "limit" in msg else None
+        connection.send_result(msg["id"], {"logs": manager.logs[offset:end], "total": len(manager.logs)})
     else:
-        connection.send_result(msg["id"], {"logs": []})
+        connection.send_result(msg["id"], {"logs": [], "total": 0})
+
+@websocket_api.websocket_command({
+    vol.Required("type"): "local_grow_box/get_timeline",
+    vol.Required("entry_id"): str,
+})
+@websocket_api.async_response
+async def ws_get_timeline(hass, connection, msg):
+    """Handle get timeline."""
+    manager = hass.data.get(DOMAIN, {}).get(msg["entry_id"])
+    if not manager:
+        connection.send_error(msg["id"], "not_found", "Entry not found")
+        return
+
+    connection.send_result(msg["id"], {
+        "current_phase": manager.current_phase,
+        "phase_start_date": manager.phase_start_date.isoformat(),
+        "days_in_phase": manager.days_in_phase,
+        "timeline": [entry.as_dict() for entry in manager.timeline],
+    })
+
+@websocket_api.websocket_command({
+    vol.Required("type"): "local_grow_box/bootstrap",
+    vol.Optional("log_limit", default=DEFAULT_LOG_PAGE_SIZE): vol.All(int, vol.Range(min=0)),
+})
+@callback
+def ws_bootstrap(hass, connection, msg):
+    """Handle the panel's initial load in a single call."""
+    payload = _async_get_bootstrap_cache(hass).async_get_payload(msg["log_limit"])
+    connection.send_result(msg["id"], payload)
+
+@websocket_api.websocket_command({
+    vol.Required("type"): "local_grow_box/watering_queue",
+})
+@callback
+def ws_watering_queue(hass, connection, msg):
+    """Handle get watering queue."""
+    connection.send_result(msg["id"], _async_get_watering_scheduler(hass).as_dict())
+
+@websocket_api.websocket_command({
+    vol.Required("type"): "local_grow_box/health",
+})
+@callback
+def ws_health(hass, connection, msg):
+    """Handle get health of actuators and displays."""
+    connection.send_result(msg["id"], {"targets": _async_get_health_tracker(hass).status()})
+
+@websocket_api.websocket_command({
+    vol.Required("type"): "local_grow_box/history",
+    vol.Required("entity_ids"): [str],
+    vol.Optional("hours", default=24): vol.All(vol.Coerce(float), vol.Range(min=1, max=168)),
+    vol.Optional("points", default=300): vol.All(int, vol.Range(min=10, max=2000)),
+    vol.Optional("method", default=METHOD_LTTB): vol.In(list(DOWNSAMPLERS)),
+})
+@websocket_api.async_response
+async def ws_history(hass, connection, msg):
+    """Handle get downsampled history for the panel graphs."""
+    cache = _async_get_history_cache(hass)
+    series = {}
+    for entity_id in msg["entity_ids"]:
+        series[entity_id] = await cache.async_get(entity_id, msg["hours"], msg["points"], msg["method"])
+    connection.send_result(msg["id"], {"series": series})
+
+@websocket_api.websocket_command({
+    vol.Required("type"): "local_grow_box/get_trace",
+    vol.Required("entry_id"): str,
+    vol.Optional("subsystem"): str,
+    vol.Optional("limit"): vol.All(int, vol.Range(min=1)),
+})
+@callback
+def ws_get_trace(hass, connection, msg):
+    """Handle get the recent controller decisions of a box."""
+    manager = hass.data.get(DOMAIN, {}).get(msg["entry_id"])
+    if not manager:
+        connection.send_error(msg["id"], "not_found", "Entry not found")
+        return
+
+    records = manager.trace.records(msg.get("subsystem"), msg.get("limit"))
+    connection.send_result(msg["id"], {"decisions": [record.as_dict() for record in records]})
+
+@websocket_api.websocket_command({
+    vol.Required("type"): "local_grow_box/get_shadow",
+    vol.Optional("entry_id"): str,
+})
+@callback
+def ws_get_shadow(hass, connection, msg):
+    """Handle get the shadow mode comparison of one box, or of all boxes running one."""
+    managers = hass.data.get(DOMAIN, {})
+    if (entry_id := msg.get("entry_id")) is not None:
+        if entry_id not in managers:
+            connection.send_error(msg["id"], "not_found", "Entry not found")
+            return
+        managers = {entry_id: managers[entry_id]}
+    connection.send_result(msg["id"], {"shadows": {
+        entry_id: manager.shadow.as_dict()
+        for entry_id, manager in managers.items()
+        if manager.shadow is not None
+    }})
+
+WEBSOCKET_COMMANDS = (
+    ws_upload_image,
+    ws_update_config,
+    ws_get_config,
+    ws_get_logs,
+    ws_get_timeline,
+    ws_bootstrap,
+    ws_watering_queue,
+    ws_health,
+    ws_history,
+    ws_get_trace,
+    ws_bulk_update,
+    ws_get_profiles,
+    ws_get_shadow,
+)
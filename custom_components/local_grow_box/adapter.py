@@ -0,0 +1,33 @@
+"""Home Assistant adapters for the Local Grow Box controller core."""
+from __future__ import annotations
+
+import logging
+from datetime import datetime
+
+from homeassistant.util import dt as dt_util
+
+from .core import Reading
+from .readings import ReadingCache
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class HassStates:
+    """Read entity states from the Home Assistant state machine."""
+
+    def __init__(self, readings: ReadingCache):
+        """Initialize the adapter."""
+        self.readings = readings
+
+    def get(self, entity_id: str | None) -> Reading | None:
+        """Return the reading, None if missing or unavailable."""
+        entry = self.readings.get(entity_id)
+        return entry.reading if entry else None
+
+
+class HassClock:
+    """Local time in the Home Assistant time zone."""
+
+    def now(self) -> datetime:
+        """Return the current local time."""
+        return dt_util.now()
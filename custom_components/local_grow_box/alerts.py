@@ -0,0 +1,219 @@
+"""Threshold alerts for Local Grow Box."""
+from __future__ import annotations
+
+import logging
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from homeassistant.components import persistent_notification
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN, MOISTURE_RECOVERY_TIME, TEMP_RISE_WINDOW
+
+_LOGGER = logging.getLogger(__name__)
+
+EVENT_ALERT = f"{DOMAIN}_alert"
+
+KIND_ABOVE = "above"
+KIND_BELOW = "below"
+KIND_RISING = "rising"
+
+CLEAR_DELAY = 300  # Seconds a rule must stay quiet before its alert clears
+NOTIFY_COOLDOWN = 3600  # Seconds between two notifications of the same rule
+
+
+class SustainedWindow:
+    """True once a condition held for `duration` seconds. O(1) per sample."""
+
+    def __init__(self, duration: float):
+        """Initialize the window."""
+        self.duration = duration
+        self.since: float | None = None
+
+    def update(self, now: float, condition: bool) -> bool:
+        """Feed one sample and return whether the window fires."""
+        if not condition:
+            self.since = None
+            return False
+        if self.since is None:
+            self.since = now
+        return now - self.since >= self.duration
+
+    def reset(self) -> None:
+        """Forget the current run, e.g. when the sensor went away."""
+        self.since = None
+
+
+class RateWindow:
+    """Rise per hour over the last `duration` seconds. Amortized O(1) per sample.
+
+    Only value changes are stored, and the newest sample older than the window
+    is kept as anchor so the rate always spans the full window.
+    """
+
+    def __init__(self, duration: float):
+        """Initialize the window."""
+        self.duration = duration
+        self._samples: deque[tuple[float, float]] = deque()
+
+    def update(self, now: float, value: float) -> float | None:
+        """Feed one sample and return the rate, None until the window is full."""
+        if not self._samples or self._samples[-1][1] != value:
+            self._samples.append((now, value))
+        while len(self._samples) > 1 and self._samples[1][0] <= now - self.duration:
+            self._samples.popleft()
+
+        start, base = self._samples[0]
+        if now - start < self.duration:
+            return None
+        return (value - base) / (now - start) * 3600
+
+    def reset(self) -> None:
+        """Drop all samples."""
+        self._samples.clear()
+
+
+@dataclass
+class AlertRule:
+    """A threshold on one value of the sensor stream.
+
+    above/below fire once the value stayed beyond the limit for `duration`
+    seconds, rising fires while the value climbs faster than the limit per
+    hour, measured over `duration` seconds.
+    """
+
+    key: str
+    source: str
+    kind: str
+    duration: float
+    name: str  # Shown in logs and notifications
+    unit: str = ""
+
+    def make_window(self):
+        """Return a fresh window for this rule."""
+        if self.kind == KIND_RISING:
+            return RateWindow(self.duration)
+        return SustainedWindow(self.duration)
+
+
+def default_rules(duration: float) -> list[AlertRule]:
+    """Return the rules every box is checked against. duration in seconds."""
+    return [
+        AlertRule("temp_high", "temp", KIND_ABOVE, duration, "Temperatur", "°"),
+        AlertRule("humidity_high", "humidity", KIND_ABOVE, duration, "Luftfeuchte", "%"),
+        # The pump runs every SOAK_TIME while dry, a lasting deficit means watering does not help
+        AlertRule("moisture_low", "moisture", KIND_BELOW, MOISTURE_RECOVERY_TIME, "Bodenfeuchte", "%"),
+        AlertRule("temp_rising", "temp", KIND_RISING, TEMP_RISE_WINDOW, "Temperaturanstieg", "°/h"),
+    ]
+
+
+@dataclass
+class AlertState:
+    """Runtime state of one rule."""
+
+    rule: AlertRule
+    window: SustainedWindow | RateWindow
+    active: bool = False
+    quiet_since: float | None = None
+    last_notified: float | None = None
+    notified: bool = False
+    value: float | None = None
+    limit: float | None = None
+
+    def as_dict(self) -> dict:
+        """Return a JSON serializable representation."""
+        return {
+            "key": self.rule.key,
+            "name": self.rule.name,
+            "value": self.value,
+            "limit": self.limit,
+            "unit": self.rule.unit,
+        }
+
+
+class AlertEngine:
+    """Evaluate the alert rules of one box on every tick.
+
+    Each rule keeps its own constant-size window state, so no history has to
+    be queried. An alert raises once, fires a bus event and a persistent
+    notification (at most once per NOTIFY_COOLDOWN), and clears after the
+    rule stayed quiet for CLEAR_DELAY seconds.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, title: str, rules: list[AlertRule], log: Callable[[str], None]):
+        """Initialize the engine."""
+        self.hass = hass
+        self.entry_id = entry_id
+        self.title = title
+        self._log = log
+        self._states = {rule.key: AlertState(rule, rule.make_window()) for rule in rules}
+
+    def _notification_id(self, key: str) -> str:
+        return f"{DOMAIN}_{self.entry_id}_{key}"
+
+    @callback
+    def async_update(self, now: float, values: dict, limits: dict) -> None:
+        """Feed the current values. now is time.monotonic(), a None value or limit pauses a rule."""
+        for key, state in self._states.items():
+            rule = state.rule
+            value = values.get(rule.source)
+            limit = limits.get(key)
+            if value is None or limit is None or (rule.kind == KIND_RISING and not limit):
+                # Sensor missing or rule disabled, start over once it is back
+                state.window.reset()
+                firing = False
+            elif rule.kind == KIND_RISING:
+                rate = state.window.update(now, value)
+                firing = rate is not None and rate > limit
+                value = round(rate, 1) if rate is not None else value
+            elif rule.kind == KIND_ABOVE:
+                firing = state.window.update(now, value > limit)
+            else:
+                firing = state.window.update(now, value < limit)
+
+            if firing:
+                state.value, state.limit = value, limit
+            self._async_set(state, firing, now)
+
+    @callback
+    def _async_set(self, state: AlertState, firing: bool, now: float) -> None:
+        rule = state.rule
+        if firing:
+            state.quiet_since = None
+            if state.active:
+                return
+            state.active = True
+            self._log(f"{rule.name}-Alarm ausgelöst ({state.value}{rule.unit}, Grenze {state.limit}{rule.unit})")
+            self.hass.bus.async_fire(EVENT_ALERT, {"entry_id": self.entry_id, "alert": rule.key, "active": True, **state.as_dict()})
+
+            # Flapping alerts are logged, but notify only once per cooldown
+            if state.last_notified is None or now - state.last_notified >= NOTIFY_COOLDOWN:
+                state.last_notified = now
+                state.notified = True
+                persistent_notification.async_create(
+                    self.hass,
+                    f"{rule.name}: {state.value}{rule.unit} (Grenze {state.limit}{rule.unit})",
+                    title=f"Grow Box {self.title}",
+                    notification_id=self._notification_id(rule.key),
+                )
+            return
+
+        if not state.active:
+            return
+        if state.quiet_since is None:
+            state.quiet_since = now
+        if now - state.quiet_since < CLEAR_DELAY:
+            return
+
+        state.active = False
+        state.quiet_since = None
+        self._log(f"{rule.name}-Alarm behoben")
+        self.hass.bus.async_fire(EVENT_ALERT, {"entry_id": self.entry_id, "alert": rule.key, "active": False})
+        if state.notified:
+            state.notified = False
+            persistent_notification.async_dismiss(self.hass, self._notification_id(rule.key))
+
+    def active(self) -> list[dict]:
+        """Return the active alerts."""
+        return [state.as_dict() for state in self._states.values() if state.active]
@@ -0,0 +1,369 @@
+"""Content-hashed asset delivery for Local Grow Box."""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import logging
+import mimetypes
+import os
+import re
+from dataclasses import dataclass, field
+
+from aiohttp import hdrs, web
+
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import HomeAssistant
+
+from .images import VARIANTS, build_variants, can_transcode, variant_format
+
+try:
+    import brotli
+except ImportError:  # Optional, gzip is always available
+    brotli = None
+
+_LOGGER = logging.getLogger(__name__)
+
+FRONTEND_DIR = os.path.join(os.path.dirname(__file__), "frontend")
+PANEL_FILENAME = "local-grow-box-panel.js"
+
+# Versioned URLs never change content, everything else must revalidate
+IMMUTABLE_CACHE_HEADER = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_HEADER = "no-cache"
+
+_SAFE_FILENAME = re.compile(r"^[A-Za-z0-9_.-]+$")
+# <device_id>.<variant>.<content hash>.<ext>, the name changes with the content.
+# Device ids may contain dots, the last three fields identify a variant.
+_VARIANT_FILENAME = re.compile(
+    r"^(?P<device>[A-Za-z0-9_.-]+)\.(?P<variant>[a-z]+)\.(?P<version>[0-9a-f]{16})\.(?P<ext>jpg|webp)$"
+)
+
+
+def content_hash(data: bytes) -> str:
+    """Return the short content hash used as asset version."""
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+@dataclass
+class Asset:
+    """An asset held in memory together with its precompressed variants."""
+
+    body: bytes
+    content_type: str
+    version: str
+    mtime: float
+    encoded: dict[str, bytes] = field(default_factory=dict)
+
+
+def load_asset(path: str) -> Asset:
+    """Read and precompress an asset. Runs in the executor."""
+    with open(path, "rb") as f:
+        data = f.read()
+
+    encoded = {"gzip": gzip.compress(data, compresslevel=9)}
+    if brotli is not None:
+        encoded["br"] = brotli.compress(data)
+
+    return Asset(
+        body=data,
+        content_type=mimetypes.guess_type(path)[0] or "application/octet-stream",
+        version=content_hash(data),
+        mtime=os.path.getmtime(path),
+        # Only keep variants that actually save bytes
+        encoded={enc: body for enc, body in encoded.items() if len(body) < len(data)},
+    )
+
+
+def is_not_modified(request: web.Request, version: str) -> bool:
+    """Return True if the client already holds this version."""
+    return f'"{version}"' in request.headers.get(hdrs.IF_NONE_MATCH, "")
+
+
+def _cache_headers(request: web.Request, version: str, immutable: bool | None = None) -> dict:
+    if immutable is None:
+        immutable = request.query.get("v") == version
+    return {
+        hdrs.ETAG: f'"{version}"',
+        hdrs.VARY: hdrs.ACCEPT_ENCODING,
+        hdrs.CACHE_CONTROL: IMMUTABLE_CACHE_HEADER if immutable else REVALIDATE_CACHE_HEADER,
+    }
+
+
+def not_modified_response(request: web.Request, version: str, immutable: bool | None = None) -> web.Response:
+    """Return a 304 response."""
+    return web.Response(status=304, headers=_cache_headers(request, version, immutable))
+
+
+def parse_accept_encoding(header: str) -> dict[str, float]:
+    """Return the q-value of each coding in an Accept-Encoding header, q=0 meaning refused."""
+    codings = {}
+    for item in header.split(","):
+        coding, _, params = item.partition(";")
+        if not (coding := coding.strip().lower()):
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        codings[coding] = quality
+    return codings
+
+
+def select_encoding(header: str, available: dict[str, bytes]) -> str | None:
+    """Return the available coding the client prefers, or None for the plain body.
+
+    The highest q-value wins, the server order (br before gzip) only breaks ties.
+    """
+    accept = parse_accept_encoding(header)
+    best, best_quality = None, 0.0
+    for encoding in ("br", "gzip"):
+        if encoding not in available:
+            continue
+        quality = accept.get(encoding, accept.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def build_response(
+    request: web.Request,
+    body: bytes,
+    content_type: str,
+    version: str,
+    encoded: dict[str, bytes] | None = None,
+    immutable: bool | None = None,
+) -> web.Response:
+    """Return a response with ETag, cache headers and content negotiation.
+
+    immutable defaults to whether the ?v= query matches the version.
+    """
+    if is_not_modified(request, version):
+        return not_modified_response(request, version, immutable)
+
+    headers = _cache_headers(request, version, immutable)
+    if encoding := select_encoding(request.headers.get(hdrs.ACCEPT_ENCODING, ""), encoded or {}):
+        headers[hdrs.CONTENT_ENCODING] = encoding
+        body = encoded[encoding]
+
+    return web.Response(body=body, content_type=content_type, headers=headers)
+
+
+class AssetStore:
+    """Keeps the panel assets hashed and precompressed in memory."""
+
+    def __init__(self, hass: HomeAssistant, directory: str = FRONTEND_DIR):
+        """Initialize the store."""
+        self.hass = hass
+        self.directory = directory
+        self._assets: dict[str, Asset] = {}
+
+    def _load(self, filename: str) -> Asset | None:
+        path = os.path.join(self.directory, filename)
+        if not os.path.isfile(path):
+            return None
+        asset = self._assets.get(filename)
+        # Pick up edits on disk (e.g. HACS update without restart)
+        if asset is None or asset.mtime != os.path.getmtime(path):
+            asset = self._assets[filename] = load_asset(path)
+        return asset
+
+    async def async_get(self, filename: str) -> Asset | None:
+        """Return an asset, loading it in the executor if needed."""
+        if not _SAFE_FILENAME.match(filename):
+            return None
+        return await self.hass.async_add_executor_job(self._load, filename)
+
+    async def async_url(self, filename: str, base_url: str) -> str:
+        """Return the versioned URL of an asset."""
+        asset = await self.async_get(filename)
+        if asset is None:
+            return f"{base_url}/{filename}"
+        return f"{base_url}/{filename}?v={asset.version}"
+
+
+class GrowBoxFrontendView(HomeAssistantView):
+    """Serve the panel assets."""
+
+    url = "/local_grow_box/{filename}"
+    name = "local_grow_box:frontend"
+    requires_auth = False
+
+    def __init__(self, store: AssetStore):
+        """Initialize the view."""
+        self.store = store
+
+    async def get(self, request: web.Request, filename: str) -> web.Response:
+        """Return an asset."""
+        asset = await self.store.async_get(filename)
+        if asset is None:
+            raise web.HTTPNotFound()
+        return build_response(request, asset.body, asset.content_type, asset.version, asset.encoded)
+
+
+class ImageIndex:
+    """Content hashes and size variants of the uploaded images.
+
+    Hashes of plain files are keyed by file stat. Variants carry their hash
+    in the filename, so they are known without reading them.
+    """
+
+    def __init__(self, hass: HomeAssistant, directory: str):
+        """Initialize the index."""
+        self.hass = hass
+        self.directory = directory
+        self._versions: dict[str, tuple[float, int, str]] = {}
+        self._variants: dict[str, dict[str, str]] = {}
+
+    def upload_filename(self, device_id: str) -> str | None:
+        """Return the filename of a device's upload, or None if the id is not usable."""
+        filename = f"{device_id}.jpg"
+        # An id ending in .<variant>.<hash> would pass for a variant of another device
+        if not _SAFE_FILENAME.match(filename) or _VARIANT_FILENAME.match(filename):
+            return None
+        return filename
+
+    def path(self, filename: str) -> str | None:
+        """Return the path of an image, or None for unsafe names."""
+        if not _SAFE_FILENAME.match(filename):
+            return None
+        return os.path.join(self.directory, filename)
+
+    def version(self, filename: str) -> str | None:
+        """Return the content hash of an image. Runs in the executor."""
+        path = self.path(filename)
+        if path is None or not os.path.isfile(path):
+            return None
+        if match := _VARIANT_FILENAME.match(filename):
+            return match["version"]
+        stat = os.stat(path)
+        cached = self._versions.get(filename)
+        if cached and cached[0] == stat.st_mtime and cached[1] == stat.st_size:
+            return cached[2]
+        with open(path, "rb") as f:
+            version = content_hash(f.read())
+        self._versions[filename] = (stat.st_mtime, stat.st_size, version)
+        return version
+
+    def read(self, filename: str) -> bytes:
+        """Return the image bytes. Runs in the executor."""
+        with open(self.path(filename), "rb") as f:
+            return f.read()
+
+    def remember(self, filename: str, data: bytes) -> str:
+        """Record a freshly written image and return its version. Runs in the executor."""
+        stat = os.stat(self.path(filename))
+        version = content_hash(data)
+        self._versions[filename] = (stat.st_mtime, stat.st_size, version)
+        return version
+
+    def variants(self, device_id: str) -> dict[str, str]:
+        """Return {variant: filename} of a device. Runs in the executor."""
+        if (variants := self._variants.get(device_id)) is None:
+            variants = self._variants[device_id] = {}
+            if os.path.isdir(self.directory):
+                for filename in os.listdir(self.directory):
+                    match = _VARIANT_FILENAME.match(filename)
+                    if match and match["device"] == device_id and match["variant"] in VARIANTS:
+                        variants[match["variant"]] = filename
+        return variants
+
+    def select(self, device_id: str, width: int) -> str | None:
+        """Return the smallest variant at least width pixels wide. Runs in the executor."""
+        variants = self.variants(device_id)
+        # VARIANTS is ordered largest first
+        for name in reversed(VARIANTS):
+            if name in variants and VARIANTS[name] >= width:
+                return variants[name]
+        return next((variants[name] for name in VARIANTS if name in variants), None)
+
+    def store_upload(self, device_id: str, data: bytes) -> str:
+        """Write an upload as <device_id>.jpg plus its variants and return the version.
+
+        Runs in the executor. Without Pillow the upload is stored as sent.
+        """
+        filename = f"{device_id}.jpg"
+        path = self.path(filename)
+        variants = {}
+        if can_transcode():
+            data, encoded = build_variants(data)
+            _, ext = variant_format()
+            for name, body in encoded.items():
+                variant_filename = f"{device_id}.{name}.{content_hash(body)}.{ext}"
+                with open(os.path.join(self.directory, variant_filename), "wb") as f:
+                    f.write(body)
+                variants[name] = variant_filename
+
+        with open(path, "wb") as f:
+            f.write(data)
+
+        # Drop the variants of the previous upload
+        stale = set(self.variants(device_id).values()) - set(variants.values())
+        for variant_filename in stale:
+            try:
+                os.remove(os.path.join(self.directory, variant_filename))
+            except OSError as err:
+                _LOGGER.debug("Could not remove %s: %s", variant_filename, err)
+        self._variants[device_id] = variants
+        return self.remember(filename, data)
+
+    def resolve(self, filename: str, width: int | None, requested: str | None) -> tuple[str, str, bool | None] | None:
+        """Return (filename to serve, version, immutable) for a request. Runs in the executor.
+
+        With a width, <device_id>.jpg is answered with the best variant. That
+        response is immutable as long as the ?v= query names the current
+        upload, because a new upload also renames the variants.
+        """
+        if width and filename.endswith(".jpg") and _SAFE_FILENAME.match(filename):
+            if variant := self.select(filename[:-4], width):
+                version = self.version(filename)
+                return variant, self.version(variant), version is not None and requested == version
+        version = self.version(filename)
+        if version is None:
+            return None
+        return filename, version, True if _VARIANT_FILENAME.match(filename) else None
+
+
+def _requested_width(request: web.Request) -> int | None:
+    try:
+        width = int(request.query.get("w", 0))
+    except ValueError:
+        return None
+    return width if width > 0 else None
+
+
+class GrowBoxImageView(HomeAssistantView):
+    """Serve uploaded images with content-hash versioning.
+
+    ?w=<pixels> picks the smallest variant that is at least that wide.
+    """
+
+    url = "/local_grow_box/images/{filename}"
+    name = "local_grow_box:images"
+    requires_auth = False
+
+    def __init__(self, index: ImageIndex):
+        """Initialize the view."""
+        self.index = index
+
+    async def get(self, request: web.Request, filename: str) -> web.Response:
+        """Return an image."""
+        hass = self.index.hass
+        resolved = await hass.async_add_executor_job(
+            self.index.resolve, filename, _requested_width(request), request.query.get("v")
+        )
+        if resolved is None:
+            raise web.HTTPNotFound()
+        filename, version, immutable = resolved
+
+        # Answer revalidations without touching the file contents
+        if is_not_modified(request, version):
+            return not_modified_response(request, version, immutable)
+
+        body = await hass.async_add_executor_job(self.index.read, filename)
+        content_type = mimetypes.guess_type(filename)[0] or (
+            "image/webp" if filename.endswith(".webp") else "application/octet-stream"
+        )
+        return build_response(request, body, content_type, version, immutable=immutable)
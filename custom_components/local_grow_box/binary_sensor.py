@@ -0,0 +1,74 @@
+"""Binary sensor platform for Local Grow Box."""
+from __future__ import annotations
+
+import logging
+
+from homeassistant.components.binary_sensor import (
+    BinarySensorDeviceClass,
+    BinarySensorEntity,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.device_registry import DeviceInfo
+from .const import DOMAIN, SIGNAL_SENSORS_UPDATED
+
+_LOGGER = logging.getLogger(__name__)
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the binary sensor platform."""
+    manager = hass.data[DOMAIN][entry.entry_id]
+    if manager.sensor_timeout > 0:
+        async_add_entities([GrowBoxSensorProblemBinarySensor(hass, manager, entry.entry_id)])
+
+class GrowBoxSensorProblemBinarySensor(BinarySensorEntity):
+    """On while a sensor of the box is unavailable, stale or stuck."""
+
+    _attr_has_entity_name = True
+    _attr_name = "Sensor Problem"
+    _attr_device_class = BinarySensorDeviceClass.PROBLEM
+    _attr_icon = "mdi:timer-sand-empty"
+    _attr_should_poll = False
+
+    def __init__(self, hass, manager, entry_id):
+        """Initialize the binary sensor."""
+        self.hass = hass
+        self.manager = manager
+        self._entry_id = entry_id
+        self._attr_unique_id = f"{entry_id}_sensor_problem"
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return the device info."""
+        return DeviceInfo(
+            identifiers={(DOMAIN, self._entry_id)},
+            name=self.manager.entry.title,
+            manufacturer="Local Grow Box",
+            model="Grow Box Controller",
+        )
+
+    @property
+    def is_on(self) -> bool:
+        """Return True if any watched sensor has a problem."""
+        return bool(self.manager.watchdog.problems(self._entry_id))
+
+    @property
+    def extra_state_attributes(self):
+        """Return the problem of each affected sensor."""
+        return {"sensors": self.manager.watchdog.problems(self._entry_id)}
+
+    async def async_added_to_hass(self) -> None:
+        """Register callbacks."""
+        # The watchdog reports changes, there is nothing to poll
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_SENSORS_UPDATED.format(self._entry_id),
+                self.async_write_ha_state,
+            )
+        )
@@ -0,0 +1,110 @@
+"""Panel bootstrap payload for Local Grow Box."""
+from __future__ import annotations
+
+import logging
+
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+
+from .const import DOMAIN, DEFAULT_LOG_PAGE_SIZE, DATA_SNAPSHOTS
+from .fleet import effective_config
+from .phases import PhaseRegistry
+
+_LOGGER = logging.getLogger(__name__)
+
+# Panel key -> unique_id suffix of our own entities
+ENTITY_SUFFIXES = {
+    "phase": "_phase",
+    "master": "_master_switch",
+    "vpd": "_vpd",
+    "pump": "_water_pump",
+    "days": "_days_in_phase",
+    "next_watering": "_next_watering",
+    "sensor_problem": "_sensor_problem",
+}
+
+
+class BootstrapCache:
+    """Cache the static part of each box's panel payload."""
+
+    def __init__(self, hass: HomeAssistant):
+        """Initialize the cache."""
+        self.hass = hass
+        self._boxes: dict[str, dict] = {}
+        self._entity_ids: set[str] = set()
+        self._device_ids: set[str] = set()
+
+    @callback
+    def async_setup(self):
+        """Invalidate when our entities or devices are renamed or removed."""
+        self.hass.bus.async_listen(er.EVENT_ENTITY_REGISTRY_UPDATED, self._async_registry_updated)
+        self.hass.bus.async_listen(dr.EVENT_DEVICE_REGISTRY_UPDATED, self._async_registry_updated)
+
+    @callback
+    def _async_registry_updated(self, event: Event):
+        entity_id = event.data.get("entity_id")
+        if entity_id in self._entity_ids or event.data.get("device_id") in self._device_ids:
+            self.async_invalidate()
+        elif entity_id and event.data.get("action") == "create":
+            # A box resolved before its entities were registered needs a rebuild
+            entity = er.async_get(self.hass).async_get(entity_id)
+            if entity and entity.platform == DOMAIN:
+                self.async_invalidate(entity.config_entry_id)
+
+    @callback
+    def async_invalidate(self, entry_id: str | None = None):
+        """Drop the cached payload of one box, or of all boxes."""
+        if entry_id is None:
+            self._boxes.clear()
+        else:
+            self._boxes.pop(entry_id, None)
+
+    def _build_box(self, entry) -> dict:
+        config = effective_config(self.hass, entry)
+        ent_reg = er.async_get(self.hass)
+        dev_reg = dr.async_get(self.hass)
+
+        by_unique_id = {
+            ent.unique_id: ent.entity_id
+            for ent in er.async_entries_for_config_entry(ent_reg, entry.entry_id)
+        }
+        entities = {
+            key: by_unique_id.get(f"{entry.entry_id}{suffix}")
+            for key, suffix in ENTITY_SUFFIXES.items()
+        }
+        self._entity_ids.update(e for e in entities.values() if e)
+
+        device = next(iter(dr.async_entries_for_config_entry(dev_reg, entry.entry_id)), None)
+        if device:
+            self._device_ids.add(device.id)
+
+        return {
+            "id": device.id if device else None,
+            "entry_id": entry.entry_id,
+            "name": (device.name_by_user or device.name) if device else entry.title,
+            "config": config,
+            "phases": PhaseRegistry.from_config(config).as_list(),
+            "entities": entities,
+        }
+
+    @callback
+    def async_get_payload(self, log_limit: int = DEFAULT_LOG_PAGE_SIZE) -> dict:
+        """Return the full bootstrap payload for all boxes."""
+        managers = self.hass.data.get(DOMAIN, {})
+        boxes = []
+        for entry in self.hass.config_entries.async_entries(DOMAIN):
+            box = self._boxes.get(entry.entry_id)
+            if box is None:
+                box = self._boxes[entry.entry_id] = self._build_box(entry)
+
+            manager = managers.get(entry.entry_id)
+            boxes.append({
+                **box,
+                # Phase and start date live in the runtime store, not in the options
+                "config": {**box["config"], **manager.runtime_options()} if manager else box["config"],
+                "state": manager.as_snapshot() if manager else None,
+                "logs": manager.logs[:log_limit] if manager else [],
+                "logs_total": len(manager.logs) if manager else 0,
+            })
+        snapshots = self.hass.data.get(DATA_SNAPSHOTS)
+        return {"boxes": boxes, "snapshot_ttl": snapshots.ttl if snapshots else None}
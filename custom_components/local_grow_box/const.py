@@ -50,6 +50,31 @@ CONF_MOISTURE_SENSOR = "moisture_sensor"
 CONF_TARGET_MOISTURE = "target_moisture" # In %
 CONF_LIGHT_START_HOUR = "light_start_hour"
 CONF_PHASE_START_DATE = "phase_start_date"
+CONF_PUMP_POWER = "pump_power" # In W, used for the fleet power budget
+CONF_ALERT_DURATION = "alert_duration" # In minutes, 0 = no temperature/humidity alerts
+CONF_ALERT_TEMP_RISE = "alert_temp_rise" # In °C per hour, 0 = disabled
+CONF_SENSOR_TIMEOUT = "sensor_timeout" # In minutes without a report, 0 = no sensor watchdog
+CONF_PROFILE = "profile" # Name of a shared configuration profile
+CONF_SHADOW_PROFILE = "shadow_profile" # Profile evaluated alongside in shadow mode, never acting
+CONF_ZONES = "zones" # Role -> additional sensors and their aggregation
+
+# Aggregation of the sensors of a zone
+AGGREGATE_MEAN = "mean"
+AGGREGATE_MIN = "min"
+AGGREGATE_MAX = "max"
+AGGREGATE_WEIGHTED = "weighted"
+AGGREGATE_POLICIES = (AGGREGATE_MEAN, AGGREGATE_MIN, AGGREGATE_MAX, AGGREGATE_WEIGHTED)
+
+# Timeline (Target duration per phase in days, empty/0 = open-ended)
+CONF_PHASE_SEEDLING_DAYS = "phase_seedling_days"
+CONF_PHASE_VEGETATIVE_DAYS = "phase_vegetative_days"
+CONF_PHASE_FLOWERING_DAYS = "phase_flowering_days"
+CONF_PHASE_DRYING_DAYS = "phase_drying_days"
+CONF_PHASE_CURING_DAYS = "phase_curing_days"
+
+# Phase Registry (List of phase dicts and optional explicit ordering of phase ids)
+CONF_PHASES = "phases"
+CONF_PHASE_ORDER = "phase_order"
 
 # Defaults
 DEFAULT_TARGET_TEMP = 24.0
@@ -57,6 +82,9 @@ DEFAULT_MAX_HUMIDITY = 60.0
 DEFAULT_PUMP_DURATION = 30
 DEFAULT_TARGET_MOISTURE = 40.0
 DEFAULT_LIGHT_START_HOUR = 18
+DEFAULT_ALERT_DURATION = 30
+DEFAULT_ALERT_TEMP_RISE = 0
+DEFAULT_SENSOR_TIMEOUT = 60
 
 # Phase Defaults (Hours of Light)
 PHASE_LIGHT_HOURS = {
@@ -66,3 +94,70 @@ PHASE_LIGHT_HOURS = {
     PHASE_DRYING: 0,
     PHASE_CURING: 0,
 }
+
+# Phase Duration Keys (Timeline)
+PHASE_DURATION_KEYS = {
+    PHASE_SEEDLING: CONF_PHASE_SEEDLING_DAYS,
+    PHASE_VEGETATIVE: CONF_PHASE_VEGETATIVE_DAYS,
+    PHASE_FLOWERING: CONF_PHASE_FLOWERING_DAYS,
+    PHASE_DRYING: CONF_PHASE_DRYING_DAYS,
+    PHASE_CURING: CONF_PHASE_CURING_DAYS,
+}
+
+# Dispatcher Signals (formatted with the entry_id)
+SIGNAL_PHASE_UPDATED = "local_grow_box_phase_updated_{}"
+SIGNAL_WATERING_PREDICTED = "local_grow_box_watering_predicted_{}"
+SIGNAL_SENSORS_UPDATED = "local_grow_box_sensors_updated_{}"
+
+# hass.data keys for domain-wide helpers (hass.data[DOMAIN] holds the managers)
+DATA_BOOTSTRAP = "local_grow_box_bootstrap"
+DATA_IMAGES = "local_grow_box_images"
+DATA_WATERING = "local_grow_box_watering"
+DATA_DISPLAY = "local_grow_box_display"
+DATA_HEALTH = "local_grow_box_health"
+DATA_PROFILER = "local_grow_box_profiler"
+DATA_HISTORY = "local_grow_box_history"
+DATA_SNAPSHOTS = "local_grow_box_snapshots"
+DATA_WATCHDOG = "local_grow_box_watchdog"
+DATA_PROFILES = "local_grow_box_profiles"
+DATA_READINGS = "local_grow_box_readings"
+
+# Domain-wide YAML options (configuration.yaml)
+CONF_MAX_CONCURRENT_PUMPS = "max_concurrent_pumps" # 0 = unlimited
+CONF_PUMP_POWER_BUDGET = "pump_power_budget" # In W, 0 = unlimited
+CONF_SNAPSHOT_TTL = "snapshot_ttl" # Seconds between camera fetches, shared by all viewers
+CONF_SNAPSHOT_CACHE_SIZE = "snapshot_cache_size" # In MB
+
+# Watering
+SOAK_TIME = 900 # Seconds to wait after watering before the sensor is trusted again
+PUMP_START_GRACE = 5 # Seconds a started pump may take to report "on"
+PREDICTION_LEAD = 60 # Seconds before the predicted crossing the moisture is checked
+WATERING_JUMP = 3.0 # Rise in % that counts as watered (also manual), starts a new drying period
+
+# Control loop subsystems (each can request its own re-evaluation)
+SUBSYSTEM_ALERTS = "alerts"
+SUBSYSTEM_LIGHT = "light"
+SUBSYSTEM_CLIMATE = "climate"
+SUBSYSTEM_WATER = "water"
+SUBSYSTEMS = (SUBSYSTEM_ALERTS, SUBSYSTEM_LIGHT, SUBSYSTEM_CLIMATE, SUBSYSTEM_WATER)
+
+# Services
+SERVICE_START_PROFILING = "start_profiling"
+SERVICE_STOP_PROFILING = "stop_profiling"
+
+# Logs
+DEFAULT_LOG_PAGE_SIZE = 50
+
+# Alerts
+MOISTURE_RECOVERY_TIME = 7200 # Seconds moisture may stay below target despite watering
+TEMP_RISE_WINDOW = 900 # Seconds the temperature rise is measured over
+
+# Sensor watchdog
+STUCK_TIME_CLIMATE = 21600 # Seconds temperature/humidity may report the exact same value
+STUCK_TIME_MOISTURE = 86400 # Seconds the soil moisture may report the exact same value
+
+# Options the running box applies without a reload
+LIVE_OPTIONS = frozenset({
+    CONF_TARGET_TEMP, CONF_MAX_HUMIDITY, CONF_TARGET_MOISTURE, CONF_PUMP_DURATION,
+    CONF_LIGHT_START_HOUR, CONF_ALERT_TEMP_RISE, CONF_PROFILE, CONF_SHADOW_PROFILE, "image_version",
+})
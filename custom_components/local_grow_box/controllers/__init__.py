@@ -0,0 +1,149 @@
+"""Controller plugins for Local Grow Box.
+
+Every subsystem of a box (light, climate, water, alerts, ...) is a plugin
+registered here with the config keys it needs. A box only imports and
+creates the plugins its configuration uses, and each plugin subscribes to
+its own triggers instead of being polled every second.
+
+Other integrations can add subsystems without touching this package:
+
+    from custom_components.local_grow_box.controllers import ControllerSpec, register_controller
+
+    register_controller(ControllerSpec("co2", "my_integration.co2_controller", requires=("co2_sensor",)))
+
+The module is imported on first use and must provide ``CONTROLLER``, a
+subclass of :class:`BoxController`.
+"""
+from __future__ import annotations
+
+import abc
+import importlib
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import timedelta
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import (
+    async_track_state_change_event, async_track_time_change, async_track_time_interval,
+)
+
+from ..const import (
+    SUBSYSTEM_ALERTS, SUBSYSTEM_LIGHT, SUBSYSTEM_CLIMATE, SUBSYSTEM_WATER, CONF_LIGHT_ENTITY,
+    CONF_TEMP_SENSOR, CONF_HUMIDITY_SENSOR, CONF_MOISTURE_SENSOR, CONF_PUMP_ENTITY,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ControllerSpec:
+    """How to find a controller plugin and when a box needs it."""
+
+    subsystem: str
+    module: str  # Relative names (".light") resolve against this package
+    requires: tuple[str, ...] = ()  # Config keys that must all be set
+    requires_any: tuple[str, ...] = ()  # Config keys of which one must be set
+    order: int = 100  # Evaluation order within one run
+
+    def wanted(self, config: dict) -> bool:
+        """Return True if a box with this config uses the controller."""
+        if not all(config.get(key) for key in self.requires):
+            return False
+        return not self.requires_any or any(config.get(key) for key in self.requires_any)
+
+
+_REGISTRY: dict[str, ControllerSpec] = {}
+
+
+def register_controller(spec: ControllerSpec) -> None:
+    """Register (or replace) the controller of a subsystem. Boxes pick it up on their next setup."""
+    _REGISTRY[spec.subsystem] = spec
+
+
+class BoxController(abc.ABC):
+    """Base class of a controller plugin.
+
+    async_setup subscribes to the triggers, which only request an
+    evaluation of this subsystem. The manager runs async_update inside its
+    single-flight loop, so updates of one box never overlap.
+    """
+
+    subsystem: str = ""
+    run_when_paused = False  # Also evaluated while the master switch is off
+
+    def __init__(self, manager):
+        """Initialize the controller."""
+        self.manager = manager
+        self.hass: HomeAssistant = manager.hass
+        self._unsubs: list[Callable[[], None]] = []
+
+    @callback
+    def async_setup(self) -> None:
+        """Subscribe to the triggers."""
+
+    @abc.abstractmethod
+    async def async_update(self) -> None:
+        """Evaluate the subsystem."""
+
+    @callback
+    def async_unload(self) -> None:
+        """Drop all subscriptions."""
+        while self._unsubs:
+            self._unsubs.pop()()
+
+    @callback
+    def async_request(self, *_args) -> None:
+        """Ask the manager for an evaluation of this subsystem."""
+        self.manager.async_request_update(self.subsystem)
+
+    @callback
+    def async_track_states(self, entity_ids) -> None:
+        """Evaluate on every state change of the entities."""
+        if entity_ids := [entity_id for entity_id in entity_ids if entity_id]:
+            self._unsubs.append(async_track_state_change_event(self.hass, entity_ids, self.async_request))
+
+    @callback
+    def async_track_interval(self, interval: timedelta) -> Callable[[], None]:
+        """Evaluate periodically. Returns a function that stops only this interval."""
+        unsub = async_track_time_interval(self.hass, self.async_request, interval)
+        self._unsubs.append(unsub)
+
+        @callback
+        def _remove() -> None:
+            if unsub in self._unsubs:
+                self._unsubs.remove(unsub)
+                unsub()
+
+        return _remove
+
+    @callback
+    def async_track_minutes(self) -> None:
+        """Evaluate at the start of every minute."""
+        self._unsubs.append(async_track_time_change(self.hass, self.async_request, second=0))
+
+
+async def async_create_controllers(hass: HomeAssistant, manager) -> list[BoxController]:
+    """Import and create the controllers a box uses, in evaluation order."""
+    controllers = []
+    for spec in sorted(_REGISTRY.values(), key=lambda spec: spec.order):
+        if not spec.wanted(manager.config):
+            continue
+        try:
+            # Importing reads from disk, keep it off the event loop
+            module = await hass.async_add_executor_job(importlib.import_module, spec.module, __name__)
+            controllers.append(module.CONTROLLER(manager))
+        except Exception as err:
+            _LOGGER.error("Failed to load controller %s from %s: %s", spec.subsystem, spec.module, err)
+    return controllers
+
+
+register_controller(ControllerSpec(
+    SUBSYSTEM_ALERTS, ".alerts",
+    requires_any=(CONF_TEMP_SENSOR, CONF_HUMIDITY_SENSOR, CONF_MOISTURE_SENSOR), order=0,
+))
+register_controller(ControllerSpec(SUBSYSTEM_LIGHT, ".light", requires=(CONF_LIGHT_ENTITY,), order=10))
+register_controller(ControllerSpec(
+    SUBSYSTEM_CLIMATE, ".climate", requires=(CONF_TEMP_SENSOR, CONF_HUMIDITY_SENSOR), order=20,
+))
+register_controller(ControllerSpec(SUBSYSTEM_WATER, ".water", requires=(CONF_PUMP_ENTITY,), order=30))
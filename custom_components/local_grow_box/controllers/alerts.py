@@ -0,0 +1,35 @@
+"""Alert controller plugin for Local Grow Box."""
+from __future__ import annotations
+
+from datetime import timedelta
+
+from homeassistant.core import callback
+
+from ..const import CONF_HUMIDITY_SENSOR, CONF_MOISTURE_SENSOR, CONF_TEMP_SENSOR, SUBSYSTEM_ALERTS
+from . import BoxController
+
+RECHECK_INTERVAL = timedelta(seconds=30)  # Alert durations are minutes, readings may stay constant
+
+
+class AlertController(BoxController):
+    """Feed the sensor readings to the alert rules."""
+
+    subsystem = SUBSYSTEM_ALERTS
+    run_when_paused = True  # Alerts keep watching a paused box
+
+    @callback
+    def async_setup(self) -> None:
+        """Subscribe to the triggers."""
+        manager = self.manager
+        self.async_track_states([
+            *manager.sensor_members(CONF_TEMP_SENSOR), *manager.sensor_members(CONF_HUMIDITY_SENSOR),
+            *manager.sensor_members(CONF_MOISTURE_SENSOR),
+        ])
+        self.async_track_interval(RECHECK_INTERVAL)
+
+    async def async_update(self) -> None:
+        """Evaluate the alerts."""
+        self.manager.async_update_alerts()
+
+
+CONTROLLER = AlertController
@@ -0,0 +1,34 @@
+"""Climate controller plugin for Local Grow Box."""
+from __future__ import annotations
+
+from datetime import timedelta
+
+from homeassistant.core import callback
+
+from ..const import CONF_FAN_ENTITY, CONF_HUMIDITY_SENSOR, CONF_TEMP_SENSOR, SUBSYSTEM_CLIMATE
+from . import BoxController
+
+RECHECK_INTERVAL = timedelta(seconds=30)  # Retries after failed switches and sensor fallbacks
+
+
+class ClimateController(BoxController):
+    """Compute the VPD and run the exhaust fan."""
+
+    subsystem = SUBSYSTEM_CLIMATE
+
+    @callback
+    def async_setup(self) -> None:
+        """Subscribe to the triggers."""
+        manager = self.manager
+        self.async_track_states([
+            *manager.sensor_members(CONF_TEMP_SENSOR), *manager.sensor_members(CONF_HUMIDITY_SENSOR),
+            manager.config.get(CONF_FAN_ENTITY),
+        ])
+        self.async_track_interval(RECHECK_INTERVAL)
+
+    async def async_update(self) -> None:
+        """Evaluate the climate."""
+        await self.manager.controller.async_update_climate()
+
+
+CONTROLLER = ClimateController
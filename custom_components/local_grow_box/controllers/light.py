@@ -0,0 +1,27 @@
+"""Light controller plugin for Local Grow Box."""
+from __future__ import annotations
+
+from homeassistant.core import callback
+
+from ..const import CONF_LIGHT_ENTITY, SUBSYSTEM_LIGHT
+from . import BoxController
+
+
+class LightController(BoxController):
+    """Follow the light cycle of the current phase."""
+
+    subsystem = SUBSYSTEM_LIGHT
+
+    @callback
+    def async_setup(self) -> None:
+        """Subscribe to the triggers."""
+        # Cycle boundaries are whole minutes, manual switching is seen right away
+        self.async_track_minutes()
+        self.async_track_states([self.manager.config.get(CONF_LIGHT_ENTITY)])
+
+    async def async_update(self) -> None:
+        """Evaluate the light."""
+        await self.manager.controller.async_update_light()
+
+
+CONTROLLER = LightController
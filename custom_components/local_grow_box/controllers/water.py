@@ -0,0 +1,53 @@
+"""Water controller plugin for Local Grow Box."""
+from __future__ import annotations
+
+from datetime import timedelta
+
+from homeassistant.core import callback
+
+from ..const import CONF_PUMP_ENTITY, SUBSYSTEM_WATER
+from . import BoxController
+
+IDLE_INTERVAL = timedelta(seconds=30)  # Soak time, predicted crossings have their own timer
+RUNNING_INTERVAL = timedelta(seconds=1)  # Pump duration accuracy
+
+
+class WaterController(BoxController):
+    """Stop the pump after its duration and request watering when dry.
+
+    New moisture readings are requested by the manager, which also keeps
+    the drying model. The one second interval only runs while the pump does.
+    """
+
+    subsystem = SUBSYSTEM_WATER
+
+    def __init__(self, manager):
+        """Initialize the controller."""
+        super().__init__(manager)
+        self._remove_running_interval = None
+
+    @callback
+    def async_setup(self) -> None:
+        """Subscribe to the triggers."""
+        self.async_track_states([self.manager.config.get(CONF_PUMP_ENTITY)])
+        self.async_track_interval(IDLE_INTERVAL)
+
+    async def async_update(self) -> None:
+        """Evaluate the pump."""
+        await self.manager.controller.async_update_water(self.manager.moisture_due)
+
+        running = self.manager.pump_start_time is not None
+        if running and self._remove_running_interval is None:
+            self._remove_running_interval = self.async_track_interval(RUNNING_INTERVAL)
+        elif not running and self._remove_running_interval is not None:
+            self._remove_running_interval()
+            self._remove_running_interval = None
+
+    @callback
+    def async_unload(self) -> None:
+        """Drop all subscriptions."""
+        super().async_unload()
+        self._remove_running_interval = None
+
+
+CONTROLLER = WaterController
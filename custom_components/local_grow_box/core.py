@@ -0,0 +1,682 @@
+"""Home Assistant independent control logic for Local Grow Box.
+
+The integration is a thin adapter that provides the states, the clock and
+the actuators. This module only uses the standard library and has no
+relative imports, so benchmarks or a standalone controller can load it on
+its own. Load it by file path, the sibling select.py shadows the stdlib
+module of that name on sys.path.
+"""
+from __future__ import annotations
+
+import logging
+import math
+import time
+from collections import Counter, deque
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from functools import cached_property
+from datetime import datetime, timedelta
+from typing import Protocol
+
+_LOGGER = logging.getLogger(__name__)
+
+UNAVAILABLE_STATES = ("unavailable", "unknown")
+
+# A manual change within this many seconds suspends the automatic light control
+LIGHT_ON_OVERRIDE = 10
+LIGHT_OFF_OVERRIDE = 900
+
+# The fan stops once both values are this far below their limits
+FAN_TEMP_HYSTERESIS = 1.0
+FAN_HUMIDITY_HYSTERESIS = 5.0
+
+DEFAULT_LIGHT_START_HOUR = 18
+
+DEFAULT_TRACE_SIZE = 256  # Decisions kept per box
+SHADOW_DIFF_SIZE = 64  # Differing evaluations kept per shadow controller
+
+
+@dataclass(frozen=True)
+class Reading:
+    """The state of an entity as the controller sees it."""
+
+    state: str
+    last_changed: datetime | None = None
+
+    @property
+    def is_on(self) -> bool:
+        """Return True for on."""
+        return self.state == "on"
+
+    def as_float(self) -> float | None:
+        """Return the state as number, None if it is not one."""
+        return self._number
+
+    @cached_property
+    def _number(self) -> float | None:
+        # Parsed once, readings are shared between subsystems and boxes
+        try:
+            return float(self.state)
+        except (TypeError, ValueError):
+            return None
+
+
+@dataclass(slots=True)
+class Decision:
+    """One evaluation of a subsystem: what was seen, what was done and why."""
+
+    seq: int = 0
+    timestamp: float = 0.0
+    subsystem: str = ""
+    action: str = ""
+    reason: str = ""
+    inputs: dict | None = None
+    repeats: int = 0  # Identical evaluations folded into this record
+    last_timestamp: float = 0.0
+
+    def as_dict(self) -> dict:
+        """Return the decision for the API."""
+        return {
+            "seq": self.seq,
+            "time": self.timestamp,
+            "last_time": self.last_timestamp,
+            "subsystem": self.subsystem,
+            "action": self.action,
+            "reason": self.reason,
+            "inputs": self.inputs,
+            "repeats": self.repeats,
+        }
+
+
+class DecisionTrace:
+    """Fixed-size ring buffer of controller decisions.
+
+    The slots are allocated once and overwritten in place. A decision equal
+    to the previous one of its subsystem (same action and reason) only
+    updates that record, so a box idling for hours keeps one record per
+    subsystem instead of flooding the buffer. The cost per evaluation is a
+    few attribute writes, cheap enough to leave always on.
+    """
+
+    def __init__(self, size: int = DEFAULT_TRACE_SIZE):
+        """Initialize the buffer."""
+        self._slots = [Decision() for _ in range(size)]
+        self._seq = 0
+        self._last: dict[str, Decision] = {}
+
+    def record(self, subsystem: str, action: str, reason: str, inputs: dict | None = None) -> None:
+        """Record a decision."""
+        now = time.time()
+        last = self._last.get(subsystem)
+        # The slot may have been reused by another subsystem meanwhile
+        if last is not None and last.subsystem == subsystem and last.action == action and last.reason == reason:
+            last.repeats += 1
+            last.last_timestamp = now
+            last.inputs = inputs
+            return
+
+        self._seq += 1
+        slot = self._slots[self._seq % len(self._slots)]
+        slot.seq = self._seq
+        slot.timestamp = slot.last_timestamp = now
+        slot.subsystem = subsystem
+        slot.action = action
+        slot.reason = reason
+        slot.inputs = inputs
+        slot.repeats = 0
+        self._last[subsystem] = slot
+
+    def last(self, subsystem: str) -> Decision | None:
+        """Return the latest decision of a subsystem, None if it was overwritten."""
+        last = self._last.get(subsystem)
+        return last if last is not None and last.subsystem == subsystem else None
+
+    def records(self, subsystem: str | None = None, limit: int | None = None) -> list[Decision]:
+        """Return the recorded decisions, newest first."""
+        result = []
+        size = len(self._slots)
+        for seq in range(self._seq, max(self._seq - size, 0), -1):
+            slot = self._slots[seq % size]
+            if subsystem is not None and slot.subsystem != subsystem:
+                continue
+            result.append(slot)
+            if limit is not None and len(result) >= limit:
+                break
+        return result
+
+
+class StateSource(Protocol):
+    """Where the controller reads entity states from."""
+
+    def get(self, entity_id: str | None) -> Reading | None:
+        """Return the reading, None if missing or unavailable."""
+
+
+class Clock(Protocol):
+    """Where the controller reads the time from."""
+
+    def now(self) -> datetime:
+        """Return the current local time, timezone aware."""
+
+
+class Actuators(Protocol):
+    """How the controller acts on the box."""
+
+    def available(self, entity_id: str) -> bool:
+        """Return False if the actuator should not be called right now."""
+
+    async def async_switch(self, entity_id: str, turn_on: bool, force: bool = False) -> bool:
+        """Switch an actuator. Returns True on success."""
+
+    def request_watering(self, deficit: float, value: float, target: float) -> None:
+        """Ask for a watering run. The pump is started by the adapter."""
+
+    def cancel_watering(self) -> None:
+        """Drop a pending watering request."""
+
+
+class ControllerListener:
+    """Notifications from the controller. Adapters override what they need."""
+
+    def on_pump_running(self) -> None:
+        """Called on every update while the pump is on."""
+
+    def on_pump_idle(self) -> None:
+        """Called on every update while the pump is off."""
+
+    def on_pump_stopped(self) -> None:
+        """Called after the controller stopped the pump."""
+
+    def on_state_changed(self) -> None:
+        """Called when the persistent controller state (pump timing) changed."""
+
+
+@dataclass
+class ControlSettings:
+    """Entities and targets of one box."""
+
+    light_entity: str | None
+    fan_entity: str | None
+    pump_entity: str | None
+    temp_sensor: str | None
+    humidity_sensor: str | None
+    moisture_sensor: str | None
+    light_start_hour: int
+    light_hours: float
+    target_temp: float
+    max_humidity: float
+    target_moisture: float
+    pump_duration: float
+    soak_time: float
+    pump_start_grace: float
+
+
+class SystemClock:
+    """Local time of the machine, for standalone use."""
+
+    def now(self) -> datetime:
+        """Return the current local time."""
+        return datetime.now().astimezone()
+
+
+class MemoryStates:
+    """States kept in a dict, for standalone use and benchmarks."""
+
+    def __init__(self, states: dict[str, Reading] | None = None):
+        """Initialize the states."""
+        self.states = states or {}
+
+    def get(self, entity_id: str | None) -> Reading | None:
+        """Return the reading, None if missing or unavailable."""
+        reading = self.states.get(entity_id) if entity_id else None
+        if reading is None or reading.state in UNAVAILABLE_STATES:
+            return None
+        return reading
+
+
+def calculate_vpd(temp: float, humidity: float) -> float:
+    """Return the vapor pressure deficit in kPa."""
+    svp = 0.61078 * math.exp((17.27 * temp) / (temp + 237.3))
+    return svp * (1 - humidity / 100)
+
+
+def is_light_time(now: datetime, start_hour: int, light_hours: float) -> bool:
+    """Return True if the light cycle starting at start_hour is on at now."""
+    start_time = now.replace(hour=int(start_hour), minute=0, second=0, microsecond=0)
+    # If we are before start_hour relative to 'today starts at 00:00',
+    # then the cycle must have started yesterday.
+    if now.hour < int(start_hour):
+        start_time = start_time - timedelta(days=1)
+    elapsed = (now - start_time).total_seconds()
+    return 0 <= elapsed < float(light_hours) * 3600
+
+
+def fan_should_run(temp: float, humidity: float, target_temp: float, max_humidity: float, is_on: bool) -> bool:
+    """Return whether the exhaust fan should run, with hysteresis."""
+    if temp > target_temp or humidity > max_humidity:
+        return True
+    if temp < (target_temp - FAN_TEMP_HYSTERESIS) and humidity < (max_humidity - FAN_HUMIDITY_HYSTERESIS):
+        return False
+    return is_on
+
+
+class GrowBoxController:
+    """Light, climate and water control of one box.
+
+    Every evaluation ends in exactly one entry in the decision trace, with
+    the inputs it saw and the reason for what it did or did not do.
+    """
+
+    def __init__(
+        self,
+        settings: ControlSettings,
+        states: StateSource,
+        clock: Clock,
+        actuators: Actuators,
+        listener: ControllerListener | None = None,
+        log: Callable[[str], None] | None = None,
+        trace: DecisionTrace | None = None,
+    ):
+        """Initialize the controller."""
+        self.settings = settings
+        self.states = states
+        self.clock = clock
+        self.actuators = actuators
+        self.listener = listener or ControllerListener()
+        self.log = log or (lambda message: None)
+        self.trace = trace or DecisionTrace()
+
+        # Sensors the adapter does not trust (stale, stuck), the controller falls back to safe actions
+        self.degraded: frozenset[str] = frozenset()
+
+        self.vpd = 0.0
+        self.pump_start_time: datetime | None = None
+        self.last_pump_stop_time: datetime | None = clock.now()
+
+    async def async_update_light(self) -> None:
+        """Switch the light according to the light cycle of the phase."""
+        s = self.settings
+        light_entity = s.light_entity
+        if not light_entity:
+            self.trace.record("light", "none", "not_configured")
+            return
+        if not self.actuators.available(light_entity):
+            self.trace.record("light", "none", "unavailable", {"entity": light_entity})
+            return
+
+        # Check if light is also configured as fan (common conflict)
+        if s.fan_entity and s.fan_entity == light_entity:
+            _LOGGER.warning("CONFIGURATION ERROR: Light entity is same as Fan entity! This will cause toggling.")
+
+        start_hour = s.light_start_hour
+        # Validate start_hour to prevent crash
+        if not (0 <= start_hour <= 23):
+            _LOGGER.warning("Invalid start_hour %s. Using default.", start_hour)
+            start_hour = DEFAULT_LIGHT_START_HOUR
+
+        now = self.clock.now()
+        light_time = is_light_time(now, start_hour, s.light_hours)
+        _LOGGER.debug(
+            "Light Logic: Hours=%s, Start=%s, Now=%s, IsLightTime=%s",
+            s.light_hours, start_hour, now.strftime("%H:%M"), light_time
+        )
+
+        current_state = self.states.get(light_entity)
+        if not current_state:
+            self.trace.record("light", "none", "no_state", {"entity": light_entity})
+            return
+
+        is_on = current_state.is_on
+        inputs = {"start_hour": start_hour, "light_hours": s.light_hours, "light_time": light_time, "is_on": is_on}
+        if light_time == is_on:
+            self.trace.record("light", "none", "in_sync", inputs)
+            return
+
+        # Check Manual Override
+        override = LIGHT_ON_OVERRIDE if light_time else LIGHT_OFF_OVERRIDE
+        if current_state.last_changed:
+            diff = (now - current_state.last_changed).total_seconds()
+            if diff < override:
+                _LOGGER.info("Light manual override detected (changed %.0fs ago). Skipping auto-control.", diff)
+                self.trace.record("light", "none", "manual_override", {**inputs, "changed_ago": round(diff), "override": override})
+                return
+
+        action = "on" if light_time else "off"
+        if light_time:
+            _LOGGER.info("Light should be ON. Turning ON.")
+            switched = await self.actuators.async_switch(light_entity, True)
+            if switched:
+                self.log("Licht eingeschaltet (Automatik)")
+        else:
+            _LOGGER.info("Light should be OFF. Turning OFF.")
+            switched = await self.actuators.async_switch(light_entity, False)
+            if switched:
+                self.log("Licht ausgeschaltet (Automatik)")
+        self.trace.record("light", action, "light_cycle" if switched else "switch_failed", inputs)
+
+    async def async_update_climate(self) -> None:
+        """Update the VPD and run the exhaust fan on temperature and humidity."""
+        s = self.settings
+        if not s.temp_sensor or not s.humidity_sensor:
+            self.trace.record("climate", "none", "not_configured")
+            return
+
+        if self.degraded and (s.temp_sensor in self.degraded or s.humidity_sensor in self.degraded):
+            await self._async_climate_fallback()
+            return
+
+        temp_state = self.states.get(s.temp_sensor)
+        humid_state = self.states.get(s.humidity_sensor)
+        if not temp_state or not humid_state:
+            self.trace.record("climate", "none", "sensor_unavailable", {
+                "temp_sensor": bool(temp_state), "humidity_sensor": bool(humid_state),
+            })
+            return
+
+        current_temp = temp_state.as_float()
+        current_humid = humid_state.as_float()
+        if current_temp is None or current_humid is None:
+            self.trace.record("climate", "none", "not_numeric", {"temp": temp_state.state, "humidity": humid_state.state})
+            return
+
+        self.vpd = calculate_vpd(current_temp, current_humid)
+
+        inputs = {
+            "temp": current_temp, "humidity": current_humid,
+            "target_temp": s.target_temp, "max_humidity": s.max_humidity,
+        }
+        fan_entity = s.fan_entity
+        if not fan_entity:
+            self.trace.record("climate", "none", "no_fan", inputs)
+            return
+        if not self.actuators.available(fan_entity):
+            self.trace.record("climate", "none", "unavailable", {**inputs, "entity": fan_entity})
+            return
+
+        fan_state = self.states.get(fan_entity)
+        if not fan_state:
+            self.trace.record("climate", "none", "no_state", {**inputs, "entity": fan_entity})
+            return
+
+        is_fan_on = fan_state.is_on
+        should_fan_on = fan_should_run(current_temp, current_humid, s.target_temp, s.max_humidity, is_fan_on)
+        inputs["is_on"] = is_fan_on
+
+        if should_fan_on and not is_fan_on:
+            switched = await self.actuators.async_switch(fan_entity, True)
+            if switched:
+                self.log(f"Abluft eingeschaltet (T={current_temp}°, H={current_humid}%)")
+            self.trace.record("climate", "on", "above_limit" if switched else "switch_failed", inputs)
+        elif not should_fan_on and is_fan_on:
+            switched = await self.actuators.async_switch(fan_entity, False)
+            if switched:
+                self.log(f"Abluft ausgeschaltet (T={current_temp}°, H={current_humid}%)")
+            self.trace.record("climate", "off", "below_hysteresis" if switched else "switch_failed", inputs)
+        else:
+            self.trace.record("climate", "none", "hysteresis" if is_fan_on else "below_limit", inputs)
+
+    async def _async_climate_fallback(self) -> None:
+        """Ventilate while the climate readings cannot be trusted."""
+        s = self.settings
+        inputs = {"degraded": sorted(self.degraded.intersection((s.temp_sensor, s.humidity_sensor)))}
+        fan_entity = s.fan_entity
+        if not fan_entity or not self.actuators.available(fan_entity):
+            self.trace.record("climate", "none", "sensor_fallback", inputs)
+            return
+        fan_state = self.states.get(fan_entity)
+        if not fan_state or fan_state.is_on:
+            self.trace.record("climate", "none", "sensor_fallback", inputs)
+            return
+        switched = await self.actuators.async_switch(fan_entity, True)
+        if switched:
+            self.log("Abluft eingeschaltet (Sensor gestört)")
+        self.trace.record("climate", "on", "sensor_fallback" if switched else "switch_failed", inputs)
+
+    async def async_update_water(self, moisture_due: Callable[[datetime], bool] | None = None) -> None:
+        """Stop the pump after its duration and request watering when dry.
+
+        moisture_due lets the adapter skip the moisture check when nothing
+        changed since the last one.
+        """
+        s = self.settings
+        pump_entity = s.pump_entity
+        if not pump_entity:
+            self.trace.record("water", "none", "not_configured")
+            return
+
+        pump_state = self.states.get(pump_entity)
+        if not pump_state:
+            self.trace.record("water", "none", "no_state", {"entity": pump_entity})
+            return
+
+        now = self.clock.now()
+
+        if pump_state.is_on:
+            # Start tracking if not already
+            if not self.pump_start_time:
+                self.pump_start_time = now
+                self.listener.on_state_changed()
+            self.listener.on_pump_running()
+
+            elapsed = (now - self.pump_start_time).total_seconds()
+            inputs = {"elapsed": round(elapsed, 1), "pump_duration": s.pump_duration}
+            if elapsed >= s.pump_duration:
+                _LOGGER.info("Pump ran for %.1fs. Turning OFF.", elapsed)
+                # Always try to stop a running pump, even if it is not available
+                if not await self.actuators.async_switch(pump_entity, False, force=True):
+                    self.trace.record("water", "off", "switch_failed", inputs)
+                    return
+                self.log(f"Pumpe ausgeschaltet (Lief {elapsed:.1f}s)")
+                self.last_pump_stop_time = now
+                self.pump_start_time = None
+                self.listener.on_state_changed()
+                self.listener.on_pump_stopped()
+                self.trace.record("water", "off", "duration_reached", inputs)
+            else:
+                self.trace.record("water", "none", "running", inputs)
+            return
+
+        # Pump is OFF
+        if self.pump_start_time:
+            if (now - self.pump_start_time).total_seconds() < s.pump_start_grace:
+                self.trace.record("water", "none", "start_grace")
+                return  # Just started, state not reported yet
+            self.pump_start_time = None
+            self.listener.on_state_changed()
+        self.listener.on_pump_idle()
+
+        # Soak Time Check
+        if self.last_pump_stop_time:
+            since_stop = (now - self.last_pump_stop_time).total_seconds()
+            if since_stop < s.soak_time:
+                self.trace.record("water", "none", "soak", {"since_stop": round(since_stop), "soak_time": s.soak_time})
+                return
+
+        # Moisture Check
+        if not s.moisture_sensor:
+            self.trace.record("water", "none", "no_moisture_sensor")
+            return
+        if s.moisture_sensor in self.degraded:
+            # Never water on a reading that may be old
+            self.actuators.cancel_watering()
+            self.trace.record("water", "cancel", "sensor_fallback", {"entity": s.moisture_sensor})
+            return
+        if not self.actuators.available(pump_entity):
+            self.trace.record("water", "none", "unavailable", {"entity": pump_entity})
+            return
+        if moisture_due is not None and not moisture_due(now):
+            self.trace.record("water", "none", "not_due")
+            return
+
+        state = self.states.get(s.moisture_sensor)
+        value = state.as_float() if state else None
+        if value is None:
+            self.trace.record("water", "none", "moisture_unavailable", {"entity": s.moisture_sensor})
+            return
+
+        inputs = {"moisture": value, "target_moisture": s.target_moisture}
+        if value < s.target_moisture:
+            self.actuators.request_watering(s.target_moisture - value, value, s.target_moisture)
+            self.trace.record("water", "request", "dry", inputs)
+        else:
+            self.actuators.cancel_watering()
+            self.trace.record("water", "cancel", "wet", inputs)
+
+
+class DryRunActuators:
+    """Actuators that only pretend, for a shadow controller.
+
+    Availability comes from the real actuators, so both controllers skip
+    the same broken devices. Nothing is ever switched or queued.
+    """
+
+    def __init__(self, actuators: Actuators):
+        """Initialize the actuators."""
+        self._actuators = actuators
+
+    def available(self, entity_id: str) -> bool:
+        """Return False if the real actuator should not be called right now."""
+        return self._actuators.available(entity_id)
+
+    async def async_switch(self, entity_id: str, turn_on: bool, force: bool = False) -> bool:
+        """Pretend the switch succeeded."""
+        return True
+
+    def request_watering(self, deficit: float, value: float, target: float) -> None:
+        """Ignore the watering request."""
+
+    def cancel_watering(self) -> None:
+        """Ignore the cancellation."""
+
+
+@dataclass(slots=True)
+class ShadowDiff:
+    """Evaluations where the shadow controller would have acted differently."""
+
+    timestamp: float
+    subsystem: str
+    active_action: str
+    active_reason: str
+    shadow_action: str
+    shadow_reason: str
+    inputs: dict | None = None  # As seen by the shadow controller
+    repeats: int = 0  # Identical consecutive differences folded into this record
+    last_timestamp: float = 0.0
+
+    def as_dict(self) -> dict:
+        """Return the difference for the API."""
+        return {
+            "time": self.timestamp,
+            "last_time": self.last_timestamp,
+            "subsystem": self.subsystem,
+            "active": {"action": self.active_action, "reason": self.active_reason},
+            "shadow": {"action": self.shadow_action, "reason": self.shadow_reason},
+            "inputs": self.inputs,
+            "repeats": self.repeats,
+        }
+
+
+@dataclass
+class ShadowStats:
+    """Counts of one subsystem under shadow evaluation."""
+
+    evaluations: int = 0
+    differences: int = 0
+    active: Counter = field(default_factory=Counter)  # Action -> count
+    shadow: Counter = field(default_factory=Counter)
+    last_diff: ShadowDiff | None = None  # Set while the differences continue
+
+    def as_dict(self) -> dict:
+        """Return the counts for the API."""
+        return {
+            "evaluations": self.evaluations,
+            "agreements": self.evaluations - self.differences,
+            "differences": self.differences,
+            "active": dict(self.active),
+            "shadow": dict(self.shadow),
+        }
+
+
+class ShadowController:
+    """A second controller with other settings that evaluates but never acts.
+
+    It runs right before the active controller, on the same state source
+    and clock and with its degraded sensors and pump timing, so both see
+    the same inputs. Its decisions only go to its own trace; compare()
+    counts the actions of both and keeps the evaluations where they differ.
+    """
+
+    def __init__(self, name: str, active: GrowBoxController, settings: ControlSettings):
+        """Initialize the shadow controller."""
+        self.name = name
+        self.active = active
+        self.trace = DecisionTrace()
+        self.controller = GrowBoxController(
+            settings, active.states, active.clock, DryRunActuators(active.actuators), trace=self.trace
+        )
+        self.since = time.time()
+        self.stats: dict[str, ShadowStats] = {}
+        self.diffs: deque[ShadowDiff] = deque(maxlen=SHADOW_DIFF_SIZE)
+
+    async def async_evaluate(self, subsystem: str, moisture_due: Callable[[datetime], bool] | None = None) -> bool:
+        """Evaluate a subsystem on the inputs the active controller sees next.
+
+        moisture_due must not consume the request of the active controller.
+        Returns False for subsystems the controller core does not cover.
+        """
+        controller = self.controller
+        controller.degraded = self.active.degraded
+        controller.pump_start_time = self.active.pump_start_time
+        controller.last_pump_stop_time = self.active.last_pump_stop_time
+        if subsystem == "light":
+            await controller.async_update_light()
+        elif subsystem == "climate":
+            await controller.async_update_climate()
+        elif subsystem == "water":
+            await controller.async_update_water(moisture_due)
+        else:
+            return False
+        return True
+
+    def compare(self, subsystem: str) -> None:
+        """Compare the latest decisions of both controllers for a subsystem."""
+        active = self.active.trace.last(subsystem)
+        shadow = self.trace.last(subsystem)
+        if active is None or shadow is None:
+            return
+        stats = self.stats.get(subsystem)
+        if stats is None:
+            stats = self.stats[subsystem] = ShadowStats()
+        stats.evaluations += 1
+        stats.active[active.action] += 1
+        stats.shadow[shadow.action] += 1
+        if active.action == shadow.action:
+            stats.last_diff = None
+            return
+
+        stats.differences += 1
+        now = time.time()
+        last = stats.last_diff
+        if (
+            last is not None
+            and (last.active_action, last.active_reason, last.shadow_action, last.shadow_reason)
+            == (active.action, active.reason, shadow.action, shadow.reason)
+        ):
+            last.repeats += 1
+            last.last_timestamp = now
+            last.inputs = shadow.inputs
+            return
+        stats.last_diff = ShadowDiff(
+            now, subsystem, active.action, active.reason, shadow.action, shadow.reason,
+            shadow.inputs, last_timestamp=now,
+        )
+        self.diffs.append(stats.last_diff)
+
+    def as_dict(self) -> dict:
+        """Return the counts and the differences, newest first, for the API."""
+        return {
+            "name": self.name,
+            "since": self.since,
+            "subsystems": {subsystem: stats.as_dict() for subsystem, stats in self.stats.items()},
+            "differences": [diff.as_dict() for diff in reversed(self.diffs)],
+        }
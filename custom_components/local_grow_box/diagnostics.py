@@ -0,0 +1,31 @@
+"""Diagnostics support for Local Grow Box."""
+from __future__ import annotations
+
+import logging
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, DATA_PROFILER, DATA_SNAPSHOTS
+from .profiling import manager_memory
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict:
+    """Return diagnostics for a config entry."""
+    manager = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    profiler = hass.data.get(DATA_PROFILER)
+
+    return {
+        "config": {**entry.data, **entry.options},
+        "state": manager.as_snapshot() if manager else None,
+        "memory": manager_memory(manager) if manager else None,
+        "decisions": [record.as_dict() for record in manager.trace.records()] if manager else None,
+        "shadow": manager.shadow.as_dict() if manager and manager.shadow else None,
+        "snapshots": snapshots.stats() if (snapshots := hass.data.get(DATA_SNAPSHOTS)) else None,
+        "profiling": {
+            "active": profiler.active,
+            "results": await profiler.async_get_results(entry.entry_id, with_files=True),
+        } if profiler else None,
+    }
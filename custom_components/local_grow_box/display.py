@@ -0,0 +1,181 @@
+"""ESPHome display publisher for Local Grow Box."""
+from __future__ import annotations
+
+import logging
+from datetime import timedelta
+
+from homeassistant.const import EVENT_SERVICE_REGISTERED, EVENT_SERVICE_REMOVED
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+from .health import HealthTracker
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.display_rooms"
+
+DISPLAY_INTERVAL = timedelta(seconds=5)
+DISPLAY_MARKER = "growbox_display"
+FRAME_SUFFIX = "_update_frame"
+LEGACY_ROOM_SUFFIX = "_update_room_"
+MAX_NAME_LENGTH = 13
+
+# Frame field -> key in the manager's display data
+FRAME_FIELDS = {
+    "temps": "temp",
+    "hums": "hum",
+    "soils": "soil",
+    "vpds": "vpd",
+    "light_states": "light_state",
+    "fan_states": "fan_state",
+}
+
+
+def _short_name(name: str) -> str:
+    if len(name) > MAX_NAME_LENGTH:
+        return name[:10] + "..."
+    return name
+
+
+class DisplayPublisher:
+    """Publish all boxes to every connected display in one frame.
+
+    Displays exposing <device>_update_frame get a single call per interval
+    with one array entry per room, and page through the rooms themselves.
+    Older firmware with only <device>_update_room_N services is still served
+    one call per room, limited to the room slots the firmware offers.
+    """
+
+    def __init__(self, hass: HomeAssistant, health: HealthTracker):
+        """Initialize the publisher."""
+        self.hass = hass
+        self.health = health
+        self._store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._rooms: dict[str, int] = {}
+        self._managers: dict = {}
+        self._frame_displays: set[str] = set()
+        self._legacy_displays: dict[str, int] = {}
+        self._remove_interval = None
+
+    async def async_load(self) -> None:
+        """Load the persisted room assignments and discover displays."""
+        data = await self._store.async_load() or {}
+        self._rooms = dict(data.get("rooms", {}))
+
+        # Existing installs: keep the old entry_id order so no room moves on upgrade
+        for entry in sorted(self.hass.config_entries.async_entries(DOMAIN), key=lambda e: e.entry_id):
+            self._assign_room(entry.entry_id)
+
+        self._async_discover_displays()
+        self.hass.bus.async_listen(EVENT_SERVICE_REGISTERED, self._async_service_changed)
+        self.hass.bus.async_listen(EVENT_SERVICE_REMOVED, self._async_service_changed)
+
+    def _assign_room(self, entry_id: str) -> int:
+        if entry_id not in self._rooms:
+            used = set(self._rooms.values())
+            self._rooms[entry_id] = next(i for i in range(1, len(used) + 2) if i not in used)
+            self._store.async_delay_save(lambda: {"rooms": self._rooms}, 1)
+        return self._rooms[entry_id]
+
+    def room(self, entry_id: str) -> int | None:
+        """Return the stable room number of a box."""
+        return self._rooms.get(entry_id)
+
+    @callback
+    def _async_service_changed(self, event: Event) -> None:
+        service = event.data.get("service", "")
+        if event.data.get("domain") != "esphome" or DISPLAY_MARKER not in service:
+            return
+        self._async_discover_displays()
+        if event.event_type == EVENT_SERVICE_REGISTERED:
+            # ESPHome registers its services again when the device reconnects
+            for basename in (*self._frame_displays, *self._legacy_displays):
+                if service.startswith(basename):
+                    self.health.async_probe_now(basename)
+
+    @callback
+    def _async_discover_displays(self) -> None:
+        frame_displays = set()
+        legacy_displays = {}
+        for service in self.hass.services.async_services().get("esphome", {}):
+            if DISPLAY_MARKER not in service:
+                continue
+            if service.endswith(FRAME_SUFFIX):
+                frame_displays.add(service[: -len(FRAME_SUFFIX)])
+            elif LEGACY_ROOM_SUFFIX in service:
+                basename, _, index = service.rpartition(LEGACY_ROOM_SUFFIX)
+                if index.isdigit():
+                    legacy_displays[basename] = max(legacy_displays.get(basename, 0), int(index))
+
+        # A display that offers frames does not need the per-room calls
+        self._frame_displays = frame_displays
+        self._legacy_displays = {
+            name: rooms for name, rooms in legacy_displays.items() if name not in frame_displays
+        }
+
+    @callback
+    def async_register(self, manager) -> None:
+        """Add a box to the published frames."""
+        entry_id = manager.entry.entry_id
+        self._assign_room(entry_id)
+        self._managers[entry_id] = manager
+        if self._remove_interval is None:
+            self._remove_interval = async_track_time_interval(
+                self.hass, self._async_publish, DISPLAY_INTERVAL
+            )
+
+    @callback
+    def async_unregister(self, entry_id: str) -> None:
+        """Remove a box from the published frames, keeping its room."""
+        self._managers.pop(entry_id, None)
+        if not self._managers and self._remove_interval is not None:
+            self._remove_interval()
+            self._remove_interval = None
+
+    @callback
+    def async_remove_room(self, entry_id: str) -> None:
+        """Free the room of a deleted box."""
+        if self._rooms.pop(entry_id, None) is not None:
+            self._store.async_delay_save(lambda: {"rooms": self._rooms}, 1)
+
+    def build_frame(self) -> dict:
+        """Return one frame with every room, ordered by room number."""
+        frame = {"rooms": [], "names": [], **{field: [] for field in FRAME_FIELDS}}
+        for entry_id, manager in sorted(self._managers.items(), key=lambda item: self._rooms[item[0]]):
+            data = manager.get_display_data()
+            frame["rooms"].append(self._rooms[entry_id])
+            frame["names"].append(_short_name(manager.entry.title or f"Grow Box {self._rooms[entry_id]}"))
+            for field, key in FRAME_FIELDS.items():
+                frame[field].append(data[key])
+        return frame
+
+    async def _async_call(self, basename: str, service: str, data: dict) -> bool:
+        # One breaker per display, an offline display is skipped until it is probed again
+        return await self.health.async_call("esphome", service, data, basename)
+
+    async def _async_publish(self, now=None) -> None:
+        if not self._managers:
+            return
+        displays = [*self._frame_displays, *self._legacy_displays]
+        if not any(self.health.available(basename) for basename in displays):
+            return
+
+        frame = self.build_frame()
+
+        for basename in self._frame_displays:
+            if self.health.available(basename):
+                await self._async_call(basename, f"{basename}{FRAME_SUFFIX}", frame)
+
+        for basename, max_room in self._legacy_displays.items():
+            for i, room in enumerate(frame["rooms"]):
+                if not self.health.available(basename):
+                    break
+                if room > max_room:
+                    continue  # No page for this room on old firmware
+                await self._async_call(basename, f"{basename}{LEGACY_ROOM_SUFFIX}{room}", {
+                    "name": frame["names"][i],
+                    **{key: frame[field][i] for field, key in FRAME_FIELDS.items()},
+                })
@@ -0,0 +1,90 @@
+"""Soil drying model for Local Grow Box."""
+from __future__ import annotations
+
+import logging
+
+_LOGGER = logging.getLogger(__name__)
+
+MIN_SAMPLES = 3
+MIN_SPAN = 0.5  # Hours of readings before the fit is trusted
+
+
+class DryingModel:
+    """Online least-squares fit of moisture over time since the last watering.
+
+    Only running sums are kept, so adding a reading is O(1) and the model is
+    tiny to persist. x is in hours since the first reading of the current
+    drying period, the slope is the drying rate in %/h (negative while drying).
+    """
+
+    def __init__(self):
+        """Initialize the model."""
+        self.reset()
+
+    def reset(self) -> None:
+        """Start a new drying period, e.g. after watering."""
+        self.origin: float | None = None  # Timestamp of the first reading
+        self.n = 0
+        self.sx = self.sy = self.sxx = self.sxy = 0.0
+        self.span = 0.0
+        self.last: float | None = None
+
+    def add(self, timestamp: float, value: float) -> None:
+        """Add a reading. timestamp in seconds (epoch)."""
+        if self.origin is None:
+            self.origin = timestamp
+        x = (timestamp - self.origin) / 3600
+        self.n += 1
+        self.sx += x
+        self.sy += value
+        self.sxx += x * x
+        self.sxy += x * value
+        self.span = max(self.span, x)
+        self.last = value
+
+    @property
+    def slope(self) -> float | None:
+        """Return the drying rate in %/h, None until enough readings."""
+        if self.n < MIN_SAMPLES or self.span < MIN_SPAN:
+            return None
+        denom = self.n * self.sxx - self.sx * self.sx
+        if denom <= 0:
+            return None
+        return (self.n * self.sxy - self.sx * self.sy) / denom
+
+    def predict(self, target: float) -> float | None:
+        """Return the timestamp the fit crosses target, None if not drying."""
+        slope = self.slope
+        if slope is None or slope >= 0:
+            return None
+        intercept = (self.sy - slope * self.sx) / self.n
+        return self.origin + (target - intercept) / slope * 3600
+
+    def as_dict(self) -> dict:
+        """Return the model for the runtime store."""
+        return {
+            "origin": self.origin,
+            "n": self.n,
+            "sx": self.sx,
+            "sy": self.sy,
+            "sxx": self.sxx,
+            "sxy": self.sxy,
+            "span": self.span,
+            "last": self.last,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict | None) -> DryingModel:
+        """Restore a model stored with as_dict."""
+        model = cls()
+        if data:
+            try:
+                model.origin = data["origin"]
+                model.n = int(data["n"])
+                model.sx, model.sy = float(data["sx"]), float(data["sy"])
+                model.sxx, model.sxy = float(data["sxx"]), float(data["sxy"])
+                model.span = float(data["span"])
+                model.last = data.get("last")
+            except (KeyError, TypeError, ValueError):
+                model.reset()
+        return model
@@ -0,0 +1,59 @@
+"""Single-flight execution of the control loop for Local Grow Box."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable, Iterable
+
+from homeassistant.core import HomeAssistant, callback
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """Run a job at most once at a time and coalesce the triggers.
+
+    Every trigger names the subsystems that want to be evaluated. While a run
+    is in progress new triggers are collected, and exactly one follow-up run
+    handles all of them. Callers never await the run itself.
+    """
+
+    def __init__(self, hass: HomeAssistant, job: Callable[[frozenset[str]], Awaitable], name: str):
+        """Initialize the executor."""
+        self.hass = hass
+        self._job = job
+        self._name = name
+        self._pending: set[str] = set()
+        self._task: asyncio.Task | None = None
+        self._stopped = False
+
+    @property
+    def running(self) -> bool:
+        """Return True while a run is in progress."""
+        return self._task is not None
+
+    @callback
+    def async_request(self, subsystems: Iterable[str]) -> None:
+        """Ask for an evaluation of the given subsystems."""
+        if self._stopped:
+            return
+        self._pending.update(subsystems)
+        if self._task is None:
+            self._task = self.hass.async_create_task(self._async_run())
+
+    async def _async_run(self) -> None:
+        try:
+            while self._pending and not self._stopped:
+                subsystems, self._pending = frozenset(self._pending), set()
+                try:
+                    await self._job(subsystems)
+                except Exception as err:
+                    _LOGGER.error("Error in %s: %s", self._name, err)
+        finally:
+            self._task = None
+
+    @callback
+    def async_stop(self) -> None:
+        """Drop pending triggers and refuse new ones. A running evaluation may finish."""
+        self._stopped = True
+        self._pending.clear()
@@ -0,0 +1,93 @@
+"""Named configuration profiles for Local Grow Box."""
+from __future__ import annotations
+
+import logging
+
+import voluptuous as vol
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    DOMAIN, DATA_PROFILES, CONF_PROFILE, CONF_TARGET_TEMP, CONF_MAX_HUMIDITY,
+    CONF_TARGET_MOISTURE, CONF_PUMP_DURATION, CONF_LIGHT_START_HOUR, CONF_PUMP_POWER,
+    CONF_ALERT_DURATION, CONF_ALERT_TEMP_RISE, CONF_SENSOR_TIMEOUT, CONF_PHASES,
+    PHASE_DURATION_KEYS,
+)
+from .phases import PHASES_SCHEMA
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.config_profiles"
+SAVE_DELAY = 1  # Seconds, a bulk update of several profiles is written once
+
+_NUMBER = vol.Any(None, "", vol.Coerce(float))
+
+# Profiles hold targets and phases, never entities (those differ per box)
+PROFILE_SCHEMA = vol.Schema({
+    vol.Optional(CONF_TARGET_TEMP): _NUMBER,
+    vol.Optional(CONF_MAX_HUMIDITY): _NUMBER,
+    vol.Optional(CONF_TARGET_MOISTURE): _NUMBER,
+    vol.Optional(CONF_PUMP_DURATION): _NUMBER,
+    vol.Optional(CONF_LIGHT_START_HOUR): vol.Any(None, "", vol.All(vol.Coerce(int), vol.Range(min=0, max=23))),
+    vol.Optional(CONF_PUMP_POWER): _NUMBER,
+    vol.Optional(CONF_ALERT_DURATION): _NUMBER,
+    vol.Optional(CONF_ALERT_TEMP_RISE): _NUMBER,
+    vol.Optional(CONF_SENSOR_TIMEOUT): _NUMBER,
+    vol.Optional(CONF_PHASES): PHASES_SCHEMA,
+    **{vol.Optional(key): _NUMBER for key in PHASE_DURATION_KEYS.values()},
+})
+
+PROFILE_NAME = vol.All(str, vol.Length(min=1, max=64))
+
+
+class ProfileStore:
+    """Named sets of option values that boxes reference by name.
+
+    A box with options["profile"] = name uses the profile's values on top of
+    its own options, so one edit of the profile reaches every box using it.
+    """
+
+    def __init__(self, hass: HomeAssistant):
+        """Initialize the store."""
+        self.hass = hass
+        self._store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._profiles: dict[str, dict] = {}
+
+    async def async_load(self) -> None:
+        """Load the profiles."""
+        data = await self._store.async_load() or {}
+        self._profiles = dict(data.get("profiles", {}))
+
+    def __contains__(self, name: str) -> bool:
+        """Return True if a profile exists."""
+        return name in self._profiles
+
+    def get(self, name: str | None) -> dict:
+        """Return the values of a profile, empty if unknown."""
+        return self._profiles.get(name, {}) if name else {}
+
+    def as_dict(self) -> dict[str, dict]:
+        """Return all profiles."""
+        return dict(self._profiles)
+
+    @callback
+    def async_update(self, changes: dict[str, dict | None]) -> None:
+        """Create, replace (dict) or delete (None) profiles. Values must be validated."""
+        for name, values in changes.items():
+            if values is None:
+                self._profiles.pop(name, None)
+            else:
+                # Empty values would hide the box's own value
+                self._profiles[name] = {key: value for key, value in values.items() if value not in (None, "")}
+        self._store.async_delay_save(lambda: {"profiles": self._profiles}, SAVE_DELAY)
+
+
+def effective_config(hass: HomeAssistant, entry: ConfigEntry, options: dict | None = None) -> dict:
+    """Return the config of a box: entry data, options and its profile on top."""
+    config = {**entry.data, **(entry.options if options is None else options)}
+    if (profiles := hass.data.get(DATA_PROFILES)) is not None:
+        config.update(profiles.get(config.get(CONF_PROFILE)))
+    return config
@@ -64,56 +64,19 @@ class LocalGrowBoxPanel extends HTMLElement {
         }
 
         try {
-            const devices = await this._hass.callWS({ type: 'config/device_registry/list' });
-            const entities = await this._hass.callWS({ type: 'config/entity_registry/list' });
-            const entries = await this._hass.callWS({ type: 'config_entries/get', domain: 'local_grow_box' });
-            // console.log("Fetched entries:", entries);
-
-            // Filter: Look for devices with identifiers matching our domain
-            const myDevices = devices.filter(d =>
-                d.identifiers && d.identifiers.some(id => id[0] === 'local_grow_box')
-            );
-
-            // map() with async is tricky, use Promise.all
-            this._devices = await Promise.all(myDevices.map(async device => {
-                const deviceEntities = entities.filter(e => e.device_id === device.id);
-                const entry = entries.find(e => e.entry_id === device.primary_config_entry);
-
-                // console.log(`[FETCH] Device: ${device.name} (${device.id})`);
-
-                // Fetch actual config via custom command because standard list might exclude options
-                let combinedOptions = {};
-                if (entry) {
-                    try {
-                        const confResp = await this._hass.callWS({
-                            type: 'local_grow_box/get_config',
-                            entry_id: entry.entry_id
-                        });
-                        combinedOptions = confResp.config || {};
-                        // console.log(`[FETCH] -> Fetched Config:`, combinedOptions);
-                    } catch (e) {
-                        console.warn(`[FETCH] Failed to fetch config for ${device.name}:`, e);
-                    }
-                }
-
-                const findEntity = (uniqueIdSuffix) => {
-                    const ent = deviceEntities.find(e => e.unique_id.endsWith(uniqueIdSuffix));
-                    return ent ? ent.entity_id : null;
-                };
-
-                return {
-                    name: device.name_by_user || device.name,
-                    id: device.id,
-                    entryId: entry ? entry.entry_id : null,
-                    options: combinedOptions,
-                    entities: {
-                        phase: findEntity('_phase'),
-                        master: findEntity('_master_switch'),
-                        vpd: findEntity('_vpd'),
-                        pump: findEntity('_water_pump'),
-                        days: findEntity('_days_in_phase'),
-                    }
-                };
+            // One call returns config, own entity ids, runtime state and newest logs for every box
+            const result = await this._hass.callWS({ type: 'local_grow_box/bootstrap' });
+
+            this._snapshotTtl = result.snapshot_ttl || 10;
+            this._devices = (result.boxes || []).filter(box => box.id).map(box => ({
+                name: box.name,
+                id: box.id,
+                entryId: box.entry_id,
+                options: box.config || {},
+                phases: box.phases || null,
+                state: box.state,
+                logs: box.logs || [],
+                entities: box.entities || {}
             }));
 
             if (this.shadowRoot && this.shadowRoot.querySelector('.header')) {
@@ -505,6 +468,11 @@ class LocalGrowBoxPanel extends HTMLElement {
             const card = document.createElement('div');
             card.className = 'card';
 
+            // Phase registry from the backend (includes custom phases), fallback to built-ins
+            const phaseList = device.phases
+                ? device.phases.map(p => ({ id: p.id, label: (PHASES.find(b => b.id === p.id) || {}).label || p.name }))
+                : PHASES;
+
             // Data
             const masterState = this._hass.states[device.entities.master];
             const pumpState = this._hass.states[device.entities.pump];
@@ -523,7 +491,9 @@ class LocalGrowBoxPanel extends HTMLElement {
 
             const startHour = parseInt(device.options.light_start_hour || 18);
             let duration = PHASE_HOURS[currentPhase] || 12;
-            if (device.options[`${currentPhase}_hours`]) duration = parseFloat(device.options[`${currentPhase}_hours`]);
+            const registryPhase = device.phases ? device.phases.find(p => p.id === currentPhase) : null;
+            if (registryPhase) duration = parseFloat(registryPhase.light_hours);
+            else if (device.options[`phase_${currentPhase}_hours`]) duration = parseFloat(device.options[`phase_${currentPhase}_hours`]);
 
             // Format Schedule Display (e.g. 13:00 - 07:00)
             const endTotal = startHour + duration;
@@ -575,15 +545,19 @@ class LocalGrowBoxPanel extends HTMLElement {
 
 
 
-            // Image Logic with Cache Busting (Persisted)
+            // Image URL is versioned by content hash, so it stays cached until the image changes.
+            // w= lets the server pick a variant that fits the card instead of the full photo.
             const imgVer = device.options.image_version || 0;
-            let imgUrl = `/local/local_grow_box_images/${device.id}.jpg?v=${imgVer}`;
+            const imgWidth = Math.round(400 * (window.devicePixelRatio || 1));
+            let imgUrl = `/local_grow_box/images/${device.id}.jpg?v=${imgVer}&w=${imgWidth}`;
             let isLive = false;
             let camStateObj = null;
             if (device.options.camera_entity) {
                 camStateObj = this._hass.states[device.options.camera_entity];
                 if (camStateObj) {
-                    imgUrl = camStateObj.attributes.entity_picture;
+                    // The server fetches each camera once per TTL for all viewers, t= moves on once per TTL
+                    const bucket = Math.floor(Date.now() / (this._snapshotTtl * 1000));
+                    imgUrl = `/local_grow_box/snapshots/${device.entryId}?token=${camStateObj.attributes.access_token}&t=${bucket}`;
                     isLive = true;
                 }
             }
@@ -606,8 +580,24 @@ class LocalGrowBoxPanel extends HTMLElement {
             else if (currentPhase === 'drying') vpdTarget = { min: 0.8, max: 1.0 };
             else if (currentPhase === 'curing') vpdTarget = { min: 0.5, max: 0.7 };
 
+            const activeAlerts = device.state?.alerts || [];
+
+            // Sensors the watchdog does not trust (the box runs its safe fallback)
+            const sensorProblems = Object.entries(this._hass.states[device.entities.sensor_problem]?.attributes?.sensors || {});
+
+            // Predicted from the soil drying rate, unknown until enough readings
+            const nextWateringState = this._hass.states[device.entities.next_watering]?.state;
+            const nextWateringDate = nextWateringState ? new Date(nextWateringState) : null;
+            const nextWatering = nextWateringDate && !isNaN(nextWateringDate)
+                ? nextWateringDate.toLocaleString('de-DE', { weekday: 'short', hour: '2-digit', minute: '2-digit' })
+                : null;
+            // Actuators whose circuit breaker is open (calls paused until they recover)
+            const offlineTargets = Object.entries(device.state?.health || {})
+                .filter(([, h]) => h.state !== 'closed')
+                .map(([target]) => target);
+
             // Phase Options HTML
-            const phaseOptions = PHASES.map(p =>
+            const phaseOptions = phaseList.map(p =>
                 `<option value="${p.id}" ${currentPhase === p.id ? 'selected' : ''}>${p.label}</option>`
             ).join('');
 
@@ -635,7 +625,7 @@ class LocalGrowBoxPanel extends HTMLElement {
                 </div>
                 
                 <div class="card-header">
-                    <div class="card-title">${device.name}</div>
+                    <div class="card-title">${device.name}${offlineTargets.length ? ` <span title="${offlineTargets.join(', ')}" style="font-size:12px; color:var(--danger-color);">⚠️ ${offlineTargets.length} offline</span>` : ''}${activeAlerts.length ? ` <span title="${activeAlerts.map(a => `${a.name}: ${a.value}${a.unit}`).join(', ')}" style="font-size:12px; color:var(--danger-color);">🚨 ${activeAlerts.length} Alarm</span>` : ''}${sensorProblems.length ? ` <span title="${sensorProblems.map(([e, p]) => `${e}: ${p}`).join(', ')}" style="font-size:12px; color:var(--danger-color);">⏳ ${sensorProblems.length} Sensor</span>` : ''}</div>
                     <div class="status-badge ${masterState && masterState.state === 'on' ? 'online' : 'offline'}">
                         ${masterState && masterState.state === 'on' ? '● Online' : '○ Offline'}
                     </div>
@@ -671,6 +661,7 @@ class LocalGrowBoxPanel extends HTMLElement {
                             <div class="info-content">
                                 <div class="info-label">Pumpe</div>
                                 <div class="info-val">${pumpState?.state === 'on' ? 'Läuft' : 'Aus'}</div>
+                                ${nextWatering ? `<div class="info-label">Nächste ca. ${nextWatering}</div>` : ''}
                             </div>
                         </div>
                     </div>
@@ -701,27 +692,13 @@ class LocalGrowBoxPanel extends HTMLElement {
                 this._openCameraModal(imgUrl, device.name, camStateObj);
             };
 
-            // Inject Livestream into Card if Live
-            if (isLive && camStateObj) {
-                const imgContainer = q('.card-image');
-                const oldImg = q('img');
-                if (oldImg) oldImg.style.display = 'none';
-
-                const stream = document.createElement('ha-camera-stream');
-                stream.hass = this._hass;
-                stream.stateObj = camStateObj;
-                stream.muted = true;
-                stream.allowExoplayer = true;
-                stream.style.cssText = "width:100%; height:100%; object-fit:cover; display:block; pointer-events:none; position:absolute; top:0; left:0; opacity:0.8;";
-
-                imgContainer.insertBefore(stream, imgContainer.firstChild);
-            }
+            // Cards show the shared snapshot, the live stream only runs in the modal
 
             // Phase Change Event
             const phaseSelect = q(`#phase-select-${device.id}`);
             phaseSelect.onchange = async (e) => {
                 const newPhase = e.target.value;
-                if (confirm(`Phase wirklich auf "${PHASES.find(p => p.id === newPhase).label}" ändern?`)) {
+                if (confirm(`Phase wirklich auf "${phaseList.find(p => p.id === newPhase).label}" ändern?`)) {
                     try {
                         await this._hass.callWS({
                             type: 'local_grow_box/update_config',
@@ -772,7 +749,7 @@ class LocalGrowBoxPanel extends HTMLElement {
             const img = document.createElement('img');
             img.id = 'modal-img';
             img.style.cssText = "width:100%; height:auto; display:block; border-radius:8px;";
-            img.src = url.includes('?') ? url + '&t=' + Date.now() : url + '?t=' + Date.now();
+            img.src = url;
             content.insertBefore(img, txt);
         }
 
@@ -989,6 +966,11 @@ class LocalGrowBoxPanel extends HTMLElement {
             appendSelector(col1, 'Abluft Ventilator', 'fan_entity', ['switch', 'fan', 'input_boolean']);
             appendInput(col1, 'Ziel Temperatur (°C)', 'target_temp', 'number');
             appendInput(col1, 'Max. Feuchte (%)', 'max_humidity', 'number');
+            appendInput(col1, 'Alarm nach (min)', 'alert_duration', 'number');
+            appendInput(col1, 'Alarm Temp.-Anstieg (°C/h)', 'alert_temp_rise', 'number');
+            appendInput(col1, 'Sensor Timeout (min)', 'sensor_timeout', 'number');
+            appendInput(col1, 'Profil (Name)', 'profile', 'text');
+            appendInput(col1, 'Shadow-Profil (Name)', 'shadow_profile', 'text');
 
             // Col 2
             appendSelector(col2, 'Licht Quelle', 'light_entity', ['switch', 'light', 'input_boolean']);
@@ -998,6 +980,7 @@ class LocalGrowBoxPanel extends HTMLElement {
             appendSelector(col2, 'Bodenfeuchte Sensor', 'moisture_sensor', ['sensor']);
             appendInput(col2, 'Ziel Bodenfeuchte (%)', 'target_moisture', 'number');
             appendInput(col2, 'Pumpen Dauer (s)', 'pump_duration', 'number');
+            appendInput(col2, 'Pumpen Leistung (W)', 'pump_power', 'number');
 
             // Col 3
             appendSelector(col3, 'Kamera', 'camera_entity', ['camera']);
@@ -1032,7 +1015,9 @@ class LocalGrowBoxPanel extends HTMLElement {
             const section = document.createElement('div');
             section.className = 'settings-section';
 
-            const renderPhaseRow = (label, sub, icon, configKey, val) => `
+            const optVal = (key, deflt) => device.options[key] !== undefined ? device.options[key] : deflt;
+
+            const renderPhaseRow = (label, sub, icon, configKey, val, daysKey) => `
                 <div style="
                     display: flex; 
                     align-items: center; 
@@ -1054,6 +1039,9 @@ class LocalGrowBoxPanel extends HTMLElement {
                         <input type="number" value="${val}" data-key="${configKey}" data-entry="${device.entryId}" 
                             style="width:70px; text-align:center; font-weight:bold; background:rgba(0,0,0,0.3); border:1px solid rgba(255,255,255,0.1); padding:8px; border-radius:6px;">
                         <span style="font-size:12px; color:var(--text-secondary); width:50px;">Std.</span>
+                        <input type="number" min="0" value="${optVal(daysKey, '')}" data-key="${daysKey}" data-entry="${device.entryId}" placeholder="∞"
+                            style="width:70px; text-align:center; font-weight:bold; background:rgba(0,0,0,0.3); border:1px solid rgba(255,255,255,0.1); padding:8px; border-radius:6px;">
+                        <span style="font-size:12px; color:var(--text-secondary); width:50px;">Tage</span>
                     </div>
                 </div>
             `;
@@ -1063,16 +1051,19 @@ class LocalGrowBoxPanel extends HTMLElement {
                 <p style="color:var(--text-secondary); margin-bottom:24px; font-size:13px; line-height:1.5;">
                     Definiere hier die tägliche Beleuchtungsdauer für jede Wachstumsphase. 
                     <br>Das System schaltet basierend auf der aktuellen Phase automatisch um.
+                    <br>Mit einer Dauer in Tagen wechselt die Phase nach Ablauf automatisch (leer = manuell).
                 </p>
 
                 <div style="display:flex; flex-direction:column; gap:8px; max-width:600px;">
-                    ${renderPhaseRow('Keimling', 'Hohe Luftfeuchte (65-80%), 20-25°C, sanftes Licht', '🌱', 'phase_seedling_hours', device.options.phase_seedling_hours !== undefined ? device.options.phase_seedling_hours : 18)}
-                    ${renderPhaseRow('Wachstum', 'Viel Stickstoff, 18h Licht, RLF 50-70%', '🌿', 'phase_vegetative_hours', device.options.phase_vegetative_hours !== undefined ? device.options.phase_vegetative_hours : 18)}
-                    ${renderPhaseRow('Blüte', '12h Licht zwingend, RLF <50% (Schimmelgefahr!), P-K Dünger', '🌸', 'phase_flowering_hours', device.options.phase_flowering_hours !== undefined ? device.options.phase_flowering_hours : 12)}
-                    ${renderPhaseRow('Trocknen', 'Dunkel & Kühl (18-20°C), 50-60% RLF, 10-14 Tage', '🍂', 'phase_drying_hours', device.options.phase_drying_hours !== undefined ? device.options.phase_drying_hours : 0)}
-                    ${renderPhaseRow('Veredelung', 'Im Glas/Bag, RLF stabil bei 58-62% halten', '🏺', 'phase_curing_hours', device.options.phase_curing_hours !== undefined ? device.options.phase_curing_hours : 0)}
+                    ${renderPhaseRow('Keimling', 'Hohe Luftfeuchte (65-80%), 20-25°C, sanftes Licht', '🌱', 'phase_seedling_hours', optVal('phase_seedling_hours', 18), 'phase_seedling_days')}
+                    ${renderPhaseRow('Wachstum', 'Viel Stickstoff, 18h Licht, RLF 50-70%', '🌿', 'phase_vegetative_hours', optVal('phase_vegetative_hours', 18), 'phase_vegetative_days')}
+                    ${renderPhaseRow('Blüte', '12h Licht zwingend, RLF <50% (Schimmelgefahr!), P-K Dünger', '🌸', 'phase_flowering_hours', optVal('phase_flowering_hours', 12), 'phase_flowering_days')}
+                    ${renderPhaseRow('Trocknen', 'Dunkel & Kühl (18-20°C), 50-60% RLF, 10-14 Tage', '🍂', 'phase_drying_hours', optVal('phase_drying_hours', 0), 'phase_drying_days')}
+                    ${renderPhaseRow('Veredelung', 'Im Glas/Bag, RLF stabil bei 58-62% halten', '🏺', 'phase_curing_hours', optVal('phase_curing_hours', 0), 'phase_curing_days')}
                 </div>
                 
+                <div class="timeline" id="timeline-${device.id}" style="margin-top:24px; max-width:600px;"></div>
+
                  <div style="margin-top:24px; max-width:600px; display:flex; justify-content:flex-end;">
                     <button class="btn active" id="save-p-${device.id}" style="width:auto; display:inline-flex; padding:12px 32px;">
                         Speichern
@@ -1082,9 +1073,30 @@ class LocalGrowBoxPanel extends HTMLElement {
 
             section.querySelector(`#save-p-${device.id}`).onclick = () => this._saveConfig_V2(section, device.entryId);
             container.appendChild(section);
+            this._renderTimeline(section.querySelector(`#timeline-${device.id}`), device);
         });
     }
 
+    async _renderTimeline(el, device) {
+        if (!el || !device.entryId) return;
+        try {
+            const result = await this._hass.callWS({
+                type: 'local_grow_box/get_timeline',
+                entry_id: device.entryId
+            });
+            const fmt = (iso) => iso ? new Date(iso).toLocaleDateString() : 'offen';
+            const rows = (result.timeline || []).map((t, i) => `
+                <div style="display:flex; justify-content:space-between; padding:8px 12px; border-left:3px solid ${i === 0 ? '#10b981' : 'rgba(255,255,255,0.1)'}; margin-bottom:4px; font-size:13px;">
+                    <span>${t.phase}${i === 0 ? ` (Tag ${result.days_in_phase})` : ''}</span>
+                    <span style="color:var(--text-secondary);">${fmt(t.start)} → ${fmt(t.end)}</span>
+                </div>
+            `).join('');
+            el.innerHTML = `<h4 style="margin:0 0 12px 0; color:var(--text-secondary);">📅 Zeitplan</h4>${rows}`;
+        } catch (e) {
+            console.warn("Could not fetch timeline for " + device.name, e);
+        }
+    }
+
     async _saveConfig_V2(section, entryId) {
         // Start with draft values if they exist
         const updates = { ...(this._draft && this._draft[entryId] ? this._draft[entryId] : {}) };
@@ -1423,17 +1435,20 @@ class LocalGrowBoxPanel extends HTMLElement {
 
     async fetchHistoryData(entityId) {
         if (!this._hass || !entityId) return;
-        const now = new Date();
-        const yesterday = new Date(now.getTime() - 24 * 60 * 60 * 1000);
-        const startStr = yesterday.toISOString();
 
         try {
-            const response = await this._hass.callApi('GET', `history/period/${startStr}?filter_entity_id=${entityId}&minimal_response`);
-            if (response && response.length > 0) {
-                this.historyData = { ...this.historyData, [entityId]: response[0] };
-            } else {
-                this.historyData = { ...this.historyData, [entityId]: [] };
-            }
+            // Downsampled on the server, a chart of 600px needs no more than ~300 points
+            const result = await this._hass.callWS({
+                type: 'local_grow_box/history',
+                entity_ids: [entityId],
+                hours: 24,
+                points: 300,
+            });
+            const points = (result && result.series && result.series[entityId]) || [];
+            this.historyData = {
+                ...this.historyData,
+                [entityId]: points.map(([t, v]) => ({ state: v, last_changed: t })),
+            };
         } catch (e) {
             console.error("Failed to fetch history for " + entityId, e);
             this.historyData = { ...this.historyData, [entityId]: [] };
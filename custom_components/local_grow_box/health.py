@@ -0,0 +1,159 @@
+"""Target health tracking (circuit breaker) for Local Grow Box."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.util import dt as dt_util
+
+_LOGGER = logging.getLogger(__name__)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+FAILURE_THRESHOLD = 3
+BASE_BACKOFF = 5  # Seconds
+MAX_BACKOFF = 600  # Seconds
+CALL_TIMEOUT = 10  # Seconds
+
+
+@dataclass
+class TargetHealth:
+    """Breaker state of a single actuator or display."""
+
+    target: str
+    failures: int = 0
+    opened: int = 0  # Consecutive trips, drives the backoff
+    open_until: float = 0.0  # time.monotonic()
+    last_error: str | None = None
+    last_failure: str | None = None
+
+    @property
+    def state(self) -> str:
+        """Return closed, open or half_open (backoff expired, next call probes)."""
+        if not self.opened:
+            return STATE_CLOSED
+        if time.monotonic() < self.open_until:
+            return STATE_OPEN
+        return STATE_HALF_OPEN
+
+    def as_dict(self) -> dict:
+        """Return a JSON serializable representation."""
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "retry_in": max(0, round(self.open_until - time.monotonic())) if self.opened else 0,
+            "last_error": self.last_error,
+            "last_failure": self.last_failure,
+        }
+
+
+class HealthTracker:
+    """Trip failing targets and back off exponentially until they recover.
+
+    A target opens after FAILURE_THRESHOLD consecutive failures. While open
+    callers skip it entirely. Once the backoff expires the next call is a
+    probe: success closes the breaker, failure reopens it with twice the
+    backoff. Entity targets are also probed as soon as their state becomes
+    available again.
+    """
+
+    def __init__(self, hass: HomeAssistant):
+        """Initialize the tracker."""
+        self.hass = hass
+        self._targets: dict[str, TargetHealth] = {}
+        self._recovery_listeners: dict[str, Callable] = {}
+
+    def available(self, target: str) -> bool:
+        """Return False while the target's breaker is open."""
+        health = self._targets.get(target)
+        return health is None or health.state != STATE_OPEN
+
+    @callback
+    def record_success(self, target: str) -> None:
+        """Close the breaker of a target."""
+        health = self._targets.pop(target, None)
+        if health is None:
+            return
+        if health.opened:
+            _LOGGER.info("%s recovered after %d failures", target, health.failures)
+        self._async_stop_recovery_listener(target)
+
+    @callback
+    def record_failure(self, target: str, err: Exception | str) -> None:
+        """Count a failure and trip the breaker when needed."""
+        health = self._targets.setdefault(target, TargetHealth(target))
+        probing = health.state == STATE_HALF_OPEN
+        health.failures += 1
+        health.last_error = str(err) or type(err).__name__
+        health.last_failure = dt_util.now().isoformat()
+
+        if not probing and health.failures < FAILURE_THRESHOLD:
+            _LOGGER.debug("Call to %s failed (%d): %s", target, health.failures, err)
+            return
+
+        health.opened += 1
+        backoff = min(BASE_BACKOFF * 2 ** (health.opened - 1), MAX_BACKOFF)
+        health.open_until = time.monotonic() + backoff
+
+        if health.opened == 1:
+            _LOGGER.warning("%s is not responding (%s), pausing calls", target, err)
+        else:
+            _LOGGER.debug("%s still failing, next probe in %ss", target, backoff)
+        self._async_start_recovery_listener(target)
+
+    @callback
+    def async_probe_now(self, target: str) -> None:
+        """Let the next call probe the target, e.g. after it reappeared."""
+        if (health := self._targets.get(target)) is not None and health.opened:
+            health.open_until = 0.0
+
+    @callback
+    def _async_start_recovery_listener(self, target: str) -> None:
+        if target in self._recovery_listeners or self.hass.states.get(target) is None:
+            return
+
+        @callback
+        def _state_changed(event: Event) -> None:
+            new_state = event.data.get("new_state")
+            if new_state is not None and new_state.state not in ("unavailable", "unknown"):
+                self.async_probe_now(target)
+
+        self._recovery_listeners[target] = async_track_state_change_event(
+            self.hass, [target], _state_changed
+        )
+
+    @callback
+    def _async_stop_recovery_listener(self, target: str) -> None:
+        if (unsub := self._recovery_listeners.pop(target, None)) is not None:
+            unsub()
+
+    async def async_call(self, domain: str, service: str, data: dict, target: str, force: bool = False) -> bool:
+        """Call a service guarded by the target's breaker. Returns True on success.
+
+        force bypasses an open breaker for safety critical calls (e.g. pump off).
+        """
+        if not force and not self.available(target):
+            return False
+        try:
+            async with asyncio.timeout(CALL_TIMEOUT):
+                await self.hass.services.async_call(domain, service, data, blocking=True)
+        except Exception as err:
+            self.record_failure(target, err)
+            return False
+        self.record_success(target)
+        return True
+
+    def status(self, targets=None) -> dict:
+        """Return the health of all tracked targets, or of the given ones."""
+        return {
+            target: health.as_dict()
+            for target, health in self._targets.items()
+            if targets is None or target in targets
+        }
@@ -0,0 +1,218 @@
+"""Downsampled sensor history for Local Grow Box."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.util import dt as dt_util
+
+_LOGGER = logging.getLogger(__name__)
+
+METHOD_LTTB = "lttb"
+METHOD_MINMAX = "minmax"
+
+MAX_SERIES = 32  # Cached entity/window combinations
+IDLE_TIMEOUT = 3600  # Seconds a series is kept without being requested
+
+
+def _as_float(value) -> float | None:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def lttb(points: list[tuple[float, float]], threshold: int) -> list[tuple[float, float]]:
+    """Largest-Triangle-Three-Buckets downsampling, keeps the visual shape."""
+    count = len(points)
+    if threshold >= count or threshold < 3:
+        return list(points)
+
+    sampled = [points[0]]
+    bucket_size = (count - 2) / (threshold - 2)
+    a = 0
+    for i in range(threshold - 2):
+        # Average of the next bucket is the third triangle corner
+        next_start = int((i + 1) * bucket_size) + 1
+        next_end = min(int((i + 2) * bucket_size) + 1, count)
+        next_len = next_end - next_start
+        avg_x = sum(p[0] for p in points[next_start:next_end]) / next_len
+        avg_y = sum(p[1] for p in points[next_start:next_end]) / next_len
+
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+        ax, ay = points[a]
+        best_area, best = -1.0, start
+        for j in range(start, end):
+            area = abs((ax - avg_x) * (points[j][1] - ay) - (ax - points[j][0]) * (avg_y - ay))
+            if area > best_area:
+                best_area, best = area, j
+        sampled.append(points[best])
+        a = best
+
+    sampled.append(points[-1])
+    return sampled
+
+
+def minmax(points: list[tuple[float, float]], threshold: int) -> list[tuple[float, float]]:
+    """Keep the minimum and maximum of each bucket, so no spike is lost."""
+    count = len(points)
+    if threshold >= count or threshold < 4:
+        return list(points)
+
+    buckets = threshold // 2
+    bucket_size = count / buckets
+    sampled = []
+    for i in range(buckets):
+        bucket = points[int(i * bucket_size):int((i + 1) * bucket_size)]
+        if not bucket:
+            continue
+        low = min(bucket, key=lambda p: p[1])
+        high = max(bucket, key=lambda p: p[1])
+        sampled.extend(sorted({low, high}))
+    return sampled
+
+
+DOWNSAMPLERS = {METHOD_LTTB: lttb, METHOD_MINMAX: minmax}
+
+
+@dataclass
+class Series:
+    """Raw numeric points of one entity over a sliding window."""
+
+    entity_id: str
+    window: float  # Seconds
+    points: deque = field(default_factory=deque)  # (timestamp, value)
+    pending: list = field(default_factory=list)  # Points that arrived while loading
+    loaded: bool = False
+    version: int = 0
+    last_used: float = field(default_factory=time.monotonic)
+    remove_listener: object = None
+    load_task: asyncio.Task | None = None
+    result_key: tuple | None = None
+    result: list | None = None
+
+    def append(self, timestamp: float, value: float) -> None:
+        """Add a new point and drop the ones that left the window."""
+        if self.points and timestamp <= self.points[-1][0]:
+            return
+        self.points.append((timestamp, value))
+        cutoff = timestamp - self.window
+        while self.points and self.points[0][0] < cutoff:
+            self.points.popleft()
+        self.version += 1
+
+    def downsample(self, threshold: int, method: str) -> list:
+        """Return the downsampled points, reusing the last result if nothing changed."""
+        # The window also slides without new points, refresh at least every minute
+        key = (threshold, method, self.version, int(time.time() // 60))
+        if self.result_key != key:
+            cutoff = time.time() - self.window
+            points = [p for p in self.points if p[0] >= cutoff]
+            self.result = [
+                [round(t * 1000), v] for t, v in DOWNSAMPLERS[method](points, threshold)
+            ]
+            self.result_key = key
+        return self.result
+
+
+class HistoryCache:
+    """Serve downsampled history from the recorder, extended live.
+
+    The first request of an entity and window reads the recorder in its
+    executor. Afterwards new states are appended as they arrive, so later
+    requests never touch the database again.
+    """
+
+    def __init__(self, hass: HomeAssistant):
+        """Initialize the cache."""
+        self.hass = hass
+        self._series: OrderedDict[tuple[str, float], Series] = OrderedDict()
+
+    @callback
+    def _async_evict(self) -> None:
+        now = time.monotonic()
+        for key, series in list(self._series.items()):
+            if len(self._series) > MAX_SERIES or now - series.last_used > IDLE_TIMEOUT:
+                self._async_drop(key)
+
+    @callback
+    def _async_drop(self, key) -> None:
+        series = self._series.pop(key)
+        if series.remove_listener:
+            series.remove_listener()
+
+    async def async_get(self, entity_id: str, hours: float, threshold: int, method: str = METHOD_LTTB) -> list:
+        """Return [[timestamp_ms, value], ...] for the last hours, at most about threshold points."""
+        key = (entity_id, hours)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = Series(entity_id, hours * 3600)
+            # Listen first, so nothing is lost between the query and the subscription
+            series.remove_listener = self._async_listen(series)
+            series.load_task = self.hass.async_create_task(self._async_load(series))
+        self._series.move_to_end(key)
+        series.last_used = time.monotonic()
+        # Every request also drops idle series, not only the ones adding a new series
+        self._async_evict()
+        if not series.loaded:
+            # Concurrent requests share the one recorder query. The series may
+            # be evicted meanwhile, this request still answers from it.
+            await series.load_task
+        return series.downsample(threshold, method)
+
+    @callback
+    def _async_listen(self, series: Series):
+        """Append new states of the series' entity, returns the remover."""
+
+        @callback
+        def _state_changed(event: Event) -> None:
+            new_state = event.data.get("new_state")
+            value = _as_float(new_state.state) if new_state else None
+            if value is None:
+                return
+            point = (new_state.last_updated.timestamp(), value)
+            if series.loaded:
+                series.append(*point)
+            else:
+                series.pending.append(point)
+
+        return async_track_state_change_event(self.hass, [series.entity_id], _state_changed)
+
+    async def _async_load(self, series: Series) -> None:
+        # pylint: disable-next=import-outside-toplevel
+        from homeassistant.components.recorder import get_instance, history
+
+        start = dt_util.utcnow() - timedelta(seconds=series.window)
+        try:
+            states = await get_instance(self.hass).async_add_executor_job(
+                lambda: history.state_changes_during_period(
+                    self.hass, start, entity_id=series.entity_id,
+                    no_attributes=True, include_start_time_state=True,
+                )
+            )
+        except Exception as err:
+            _LOGGER.error("Failed to read history of %s: %s", series.entity_id, err)
+            states = {}
+
+        for state in states.get(series.entity_id, []):
+            value = _as_float(state.state)
+            if value is not None:
+                # The start state may be older than the window, show it at the window start
+                series.append(max(state.last_updated.timestamp(), start.timestamp()), value)
+        for point in series.pending:
+            series.append(*point)
+        series.pending.clear()
+        series.loaded = True
+
+    @callback
+    def async_clear(self) -> None:
+        """Drop all series and their listeners."""
+        for key in list(self._series):
+            self._async_drop(key)
@@ -0,0 +1,67 @@
+"""Uploaded photo transcoding for Local Grow Box."""
+from __future__ import annotations
+
+import io
+import logging
+
+try:
+    from PIL import Image, ImageOps, features
+except ImportError:  # Optional, uploads are then stored as sent
+    Image = None
+
+_LOGGER = logging.getLogger(__name__)
+
+# Variant name -> longest edge in pixels, largest first
+VARIANTS = {
+    "full": 1920,
+    "card": 640,
+    "thumb": 200,
+}
+VARIANT_QUALITY = 82
+
+
+def can_transcode() -> bool:
+    """Return True if Pillow is available."""
+    return Image is not None
+
+
+def variant_format() -> tuple[str, str]:
+    """Return the Pillow format and file extension used for the variants."""
+    if Image is not None and features.check("webp"):
+        return "WEBP", "webp"
+    return "JPEG", "jpg"
+
+
+def _encode(image, image_format: str) -> bytes:
+    buffer = io.BytesIO()
+    if image_format == "WEBP":
+        image.save(buffer, image_format, quality=VARIANT_QUALITY, method=4)
+    else:
+        image.save(buffer, image_format, quality=VARIANT_QUALITY, optimize=True, progressive=True)
+    return buffer.getvalue()
+
+
+def build_variants(data: bytes) -> tuple[bytes, dict[str, bytes]]:
+    """Decode an upload once and return (full JPEG, {variant: bytes}).
+
+    The full JPEG keeps the legacy <device_id>.jpg readable by everything
+    that expects a JPEG. Every image is EXIF-rotated and has its metadata
+    stripped. Runs in the executor, Pillow releases the GIL while resizing.
+    """
+    image_format, _ = variant_format()
+    with Image.open(io.BytesIO(data)) as source:
+        # Let the JPEG decoder scale down by 1/2..1/8 right away for huge photos
+        largest = VARIANTS["full"]
+        source.draft("RGB", (largest, largest))
+        image = ImageOps.exif_transpose(source).convert("RGB")
+
+    variants = {}
+    for name, size in VARIANTS.items():
+        # Each variant is scaled from the previous one, never from the original again
+        image.thumbnail((size, size), Image.Resampling.LANCZOS)
+        if name == "full":
+            full_jpeg = _encode(image, "JPEG")
+            variants[name] = full_jpeg if image_format == "JPEG" else _encode(image, image_format)
+        else:
+            variants[name] = _encode(image, image_format)
+    return full_jpeg, variants
@@ -0,0 +1,154 @@
+"""Phase registry for Local Grow Box."""
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+
+import voluptuous as vol
+
+from .const import (
+    GROW_PHASES, PHASE_LIGHT_HOURS, PHASE_DURATION_KEYS, CONF_PHASES, CONF_PHASE_ORDER,
+    CONF_PHASE_SEEDLING_HOURS, CONF_PHASE_VEGETATIVE_HOURS, CONF_PHASE_FLOWERING_HOURS,
+    CONF_PHASE_DRYING_HOURS, CONF_PHASE_CURING_HOURS, CONF_CUSTOM1_NAME, CONF_CUSTOM1_HOURS,
+    CONF_CUSTOM2_NAME, CONF_CUSTOM2_HOURS, CONF_CUSTOM3_NAME, CONF_CUSTOM3_HOURS,
+    PHASE_SEEDLING, PHASE_VEGETATIVE, PHASE_FLOWERING, PHASE_DRYING, PHASE_CURING,
+)
+
+PHASE_HOURS_KEYS = {
+    PHASE_SEEDLING: CONF_PHASE_SEEDLING_HOURS,
+    PHASE_VEGETATIVE: CONF_PHASE_VEGETATIVE_HOURS,
+    PHASE_FLOWERING: CONF_PHASE_FLOWERING_HOURS,
+    PHASE_DRYING: CONF_PHASE_DRYING_HOURS,
+    PHASE_CURING: CONF_PHASE_CURING_HOURS,
+}
+
+# Legacy fixed slots, migrated into the registry by name
+LEGACY_CUSTOM_SLOTS = [
+    (CONF_CUSTOM1_NAME, CONF_CUSTOM1_HOURS),
+    (CONF_CUSTOM2_NAME, CONF_CUSTOM2_HOURS),
+    (CONF_CUSTOM3_NAME, CONF_CUSTOM3_HOURS),
+]
+
+# Fallback when a phase is not known to the registry
+DEFAULT_UNKNOWN_LIGHT_HOURS = 12
+
+_OPTIONAL_NUMBER = vol.Any(None, "", vol.Coerce(float))
+
+PHASE_SCHEMA = vol.Schema({
+    vol.Required("id"): vol.All(str, vol.Length(min=1)),
+    vol.Optional("name"): str,
+    vol.Optional("light_hours"): vol.Any(None, "", vol.All(vol.Coerce(float), vol.Range(min=0, max=24))),
+    vol.Optional("days"): vol.Any(None, "", vol.All(vol.Coerce(float), vol.Range(min=0))),
+    vol.Optional("target_temp"): _OPTIONAL_NUMBER,
+    vol.Optional("max_humidity"): _OPTIONAL_NUMBER,
+    vol.Optional("target_moisture"): _OPTIONAL_NUMBER,
+}, extra=vol.REMOVE_EXTRA)
+
+PHASES_SCHEMA = vol.Schema([PHASE_SCHEMA])
+
+
+def _to_float(val, default):
+    if val is None or val == "":
+        return default
+    try:
+        return float(val)
+    except (ValueError, TypeError):
+        return default
+
+
+@dataclass
+class PhaseDefinition:
+    """A grow phase with its light schedule and targets."""
+
+    id: str
+    name: str
+    light_hours: float
+    days: float = 0
+    target_temp: float | None = None
+    max_humidity: float | None = None
+    target_moisture: float | None = None
+
+    def as_dict(self) -> dict:
+        """Return a JSON serializable representation."""
+        return asdict(self)
+
+
+class PhaseRegistry:
+    """Ordered table of all phases known to a grow box."""
+
+    def __init__(self, phases: list[PhaseDefinition]):
+        """Initialize the registry."""
+        self._phases = {phase.id: phase for phase in phases}
+        self.order = list(self._phases)
+
+    @classmethod
+    def from_config(cls, config: dict) -> PhaseRegistry:
+        """Build the registry from the built-in phases, legacy slots and the phase list."""
+        phases = {}
+
+        for phase in GROW_PHASES:
+            phases[phase] = PhaseDefinition(
+                id=phase,
+                name=phase,
+                light_hours=_to_float(config.get(PHASE_HOURS_KEYS[phase]), PHASE_LIGHT_HOURS[phase]),
+                days=_to_float(config.get(PHASE_DURATION_KEYS[phase]), 0),
+            )
+
+        for name_key, hours_key in LEGACY_CUSTOM_SLOTS:
+            name = config.get(name_key)
+            if name:
+                phases[name] = PhaseDefinition(
+                    id=name, name=name, light_hours=_to_float(config.get(hours_key), 0)
+                )
+
+        # Entries with a known id override that phase, everything else is appended
+        for item in config.get(CONF_PHASES) or []:
+            phase_id = item.get("id")
+            if not phase_id:
+                continue
+            base = phases.get(phase_id)
+            phases[phase_id] = PhaseDefinition(
+                id=phase_id,
+                name=item.get("name") or (base.name if base else phase_id),
+                light_hours=_to_float(item.get("light_hours"), base.light_hours if base else 0),
+                days=_to_float(item.get("days"), base.days if base else 0),
+                target_temp=_to_float(item.get("target_temp"), None),
+                max_humidity=_to_float(item.get("max_humidity"), None),
+                target_moisture=_to_float(item.get("target_moisture"), None),
+            )
+
+        order = [p for p in config.get(CONF_PHASE_ORDER) or [] if p in phases]
+        order += [p for p in phases if p not in order]
+        return cls([phases[p] for p in order])
+
+    def __contains__(self, phase_id) -> bool:
+        return phase_id in self._phases
+
+    def __iter__(self):
+        return iter(self._phases.values())
+
+    def __len__(self) -> int:
+        return len(self._phases)
+
+    def get(self, phase_id: str) -> PhaseDefinition | None:
+        """Return the definition of a phase."""
+        return self._phases.get(phase_id)
+
+    def light_hours(self, phase_id: str) -> float:
+        """Return the daily light hours of a phase."""
+        phase = self._phases.get(phase_id)
+        if phase is None:
+            return PHASE_LIGHT_HOURS.get(phase_id, DEFAULT_UNKNOWN_LIGHT_HOURS)
+        return phase.light_hours
+
+    def display_name(self, phase_id: str) -> str:
+        """Return the name shown for a phase."""
+        phase = self._phases.get(phase_id)
+        return phase.name if phase else phase_id
+
+    def durations(self) -> dict:
+        """Return the target duration in days for each phase."""
+        return {phase.id: phase.days for phase in self._phases.values()}
+
+    def as_list(self) -> list[dict]:
+        """Return the table in order as JSON serializable dicts."""
+        return [phase.as_dict() for phase in self._phases.values()]
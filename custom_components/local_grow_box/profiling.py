@@ -0,0 +1,348 @@
+"""On-demand profiling of the control loop for Local Grow Box."""
+from __future__ import annotations
+
+import base64
+import cProfile
+import logging
+import marshal
+import os
+import sys
+import time
+import tracemalloc
+from collections import deque
+from collections.abc import Coroutine
+from dataclasses import dataclass, field, is_dataclass
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.profiles"
+
+DEFAULT_DURATION = 60  # Seconds
+MAX_DURATION = 600  # Seconds
+MAX_RESULTS = 5  # Profiles kept in storage
+TOP_FUNCTIONS = 40
+TOP_ALLOCATIONS = 25
+MAX_DIAGNOSTICS_FILE = 2 * 1024 * 1024  # Bytes, larger .prof files stay out of the diagnostics
+
+# Attributes that are shared between boxes, owned by Home Assistant or point back to the manager
+SHARED_ATTRIBUTES = {
+    "hass", "entry", "watering", "health", "display", "profiler", "watchdog", "readings",
+    "actuators", "listener", "states",
+}
+
+
+def deep_size(obj, seen: set | None = None) -> int:
+    """Return the approximate memory of an object and everything it owns.
+
+    Containers and objects of this integration are followed, anything else
+    (Home Assistant objects, callbacks) only counts with its own size.
+    """
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_size(k, seen) + deep_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+        size += sum(deep_size(item, seen) for item in obj)
+    elif type(obj).__module__.startswith(__package__) and (hasattr(obj, "__dict__") or is_dataclass(obj)):
+        size += sum(
+            deep_size(value, seen)
+            for name, value in vars(obj).items()
+            if name not in SHARED_ATTRIBUTES
+        )
+    return size
+
+
+def manager_memory(manager) -> dict[str, int]:
+    """Return the deep size in bytes of each buffer and cache of a manager."""
+    sizes = {
+        name: deep_size(value)
+        for name, value in vars(manager).items()
+        if name not in SHARED_ATTRIBUTES
+    }
+    # Only report what is worth looking at
+    return dict(sorted(
+        ((name, size) for name, size in sizes.items() if size >= 1024),
+        key=lambda item: item[1],
+        reverse=True,
+    ))
+
+
+def _write_stats(stats: dict, path: str) -> None:
+    """Write profile stats in the pstats format. Runs in the executor."""
+    with open(path, "wb") as f:
+        marshal.dump(stats, f)
+
+
+def _read_prof_file(path: str) -> str | None:
+    """Return a .prof file base64 encoded, or None if it is gone or too large. Runs in the executor."""
+    try:
+        if os.path.getsize(path) > MAX_DIAGNOSTICS_FILE:
+            return None
+        with open(path, "rb") as f:
+            return base64.b64encode(f.read()).decode()
+    except OSError:
+        return None
+
+
+def _remove_files(paths: list[str]) -> None:
+    """Delete the .prof files of dropped results. Runs in the executor."""
+    for path in paths:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as err:
+            _LOGGER.warning("Could not remove %s: %s", path, err)
+
+
+class _Profiled:
+    """Await a coroutine with the profiler enabled only while it runs.
+
+    Enabling around each step instead of the whole await keeps other tasks
+    of the event loop out of the profile. Once the session has stopped, the
+    remaining steps of a tick run unprofiled.
+    """
+
+    def __init__(self, coro: Coroutine, session: ProfileSession):
+        self._coro = coro
+        self._session = session
+
+    def __await__(self):
+        value, error = None, None
+        while True:
+            profiled = not self._session.stopped
+            if profiled:
+                self._session.profile.enable()
+            try:
+                if error is not None:
+                    future = self._coro.throw(error)
+                else:
+                    future = self._coro.send(value)
+            except StopIteration as stop:
+                return stop.value
+            finally:
+                if profiled:
+                    self._session.profile.disable()
+
+            try:
+                value, error = (yield future), None
+            except BaseException as err:
+                value, error = None, err
+
+
+@dataclass
+class TickStats:
+    """Timing of the profiled ticks of one box."""
+
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    def as_dict(self) -> dict:
+        """Return a JSON serializable representation."""
+        return {
+            "ticks": self.count,
+            "avg_ms": round(self.total / self.count * 1000, 3) if self.count else 0,
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+@dataclass
+class ProfileSession:
+    """A running capture."""
+
+    entry_ids: set[str] | None  # None = all boxes
+    duration: float
+    started: str = field(default_factory=lambda: dt_util.now().isoformat())
+    profile: cProfile.Profile = field(default_factory=cProfile.Profile)
+    ticks: dict[str, TickStats] = field(default_factory=dict)
+    tracemalloc_started: bool = False
+    stopped: bool = False
+
+    def covers(self, entry_id: str) -> bool:
+        """Return True if the box is part of this capture."""
+        return self.entry_ids is None or entry_id in self.entry_ids
+
+
+class Profiler:
+    """Capture bounded cProfile and memory profiles of the control loop.
+
+    Results are written to .storage (summary plus a .prof file for external
+    viewers) and included in the diagnostics of each box.
+    """
+
+    def __init__(self, hass: HomeAssistant):
+        """Initialize the profiler."""
+        self.hass = hass
+        self._store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._results: list[dict] | None = None
+        self._session: ProfileSession | None = None
+        self._remove_timer = None
+
+    @property
+    def active(self) -> bool:
+        """Return True while a capture is running."""
+        return self._session is not None
+
+    async def _async_results(self) -> list[dict]:
+        if self._results is None:
+            data = await self._store.async_load() or {}
+            self._results = data.get("results", [])
+        return self._results
+
+    @callback
+    def async_start(self, duration: float = DEFAULT_DURATION, entry_ids: set[str] | None = None) -> bool:
+        """Start a capture that stops on its own. Returns False if it could not start."""
+        if self._session is not None:
+            return False
+
+        session = ProfileSession(entry_ids, min(duration, MAX_DURATION))
+        try:
+            session.profile.enable()
+            session.profile.disable()
+        except ValueError as err:
+            # Another profiler (e.g. the profiler integration) is already active
+            _LOGGER.warning("Profiling not possible: %s", err)
+            return False
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            session.tracemalloc_started = True
+        self._session = session
+        self._remove_timer = async_call_later(self.hass, session.duration, self._async_timeout)
+        _LOGGER.info("Profiling the control loop for %ss", session.duration)
+        return True
+
+    async def _async_timeout(self, _now) -> None:
+        self._remove_timer = None
+        await self.async_stop()
+
+    async def async_run(self, entry_id: str, coro: Coroutine):
+        """Run one tick of a box, profiled if a capture covers it."""
+        session = self._session
+        if session is None or not session.covers(entry_id):
+            return await coro
+
+        start = time.perf_counter()
+        try:
+            return await _Profiled(coro, session)
+        finally:
+            elapsed = time.perf_counter() - start
+            stats = session.ticks.setdefault(entry_id, TickStats())
+            stats.count += 1
+            stats.total += elapsed
+            stats.max = max(stats.max, elapsed)
+
+    async def async_stop(self) -> dict | None:
+        """Stop the capture and store its result."""
+        session, self._session = self._session, None
+        if session is None:
+            return None
+        # Ticks still in flight toggle the profiler on the event loop, so it is
+        # stopped and read here, the executor only writes the file
+        session.stopped = True
+        session.profile.create_stats()
+        if self._remove_timer is not None:
+            self._remove_timer()
+            self._remove_timer = None
+
+        managers = {
+            entry_id: manager
+            for entry_id, manager in self.hass.data.get(DOMAIN, {}).items()
+            if session.covers(entry_id)
+        }
+        # Microseconds, so two captures within a second keep their own file
+        stamp = dt_util.now().strftime("%Y%m%d_%H%M%S_%f")
+        prof_path = self.hass.config.path(".storage", f"{DOMAIN}_profile_{stamp}.prof")
+
+        result = self._build_result(session, prof_path)
+        result["allocations"] = await self.hass.async_add_executor_job(self._build_allocations, session)
+        await self.hass.async_add_executor_job(_write_stats, session.profile.stats, prof_path)
+        # Sizes are read on the event loop, the buffers are not thread safe
+        result["memory"] = {entry_id: manager_memory(manager) for entry_id, manager in managers.items()}
+
+        results = await self._async_results()
+        results.insert(0, result)
+        dropped = [old["prof_file"] for old in results[MAX_RESULTS:] if old.get("prof_file")]
+        del results[MAX_RESULTS:]
+        self._store.async_delay_save(lambda: {"results": self._results}, 1)
+        if dropped:
+            await self.hass.async_add_executor_job(_remove_files, dropped)
+        _LOGGER.info("Profiling finished, written to %s", prof_path)
+        return result
+
+    @staticmethod
+    def _build_result(session: ProfileSession, prof_path: str) -> dict:
+        """Summarize the timing of a stopped capture."""
+        # profile.stats is {(file, line, name): (cc, calls, tottime, cumtime, callers)}
+        functions = [
+            {
+                "function": f"{filename}:{line}({name})",
+                "calls": calls,
+                "tottime": round(tottime, 6),
+                "cumtime": round(cumtime, 6),
+            }
+            for (filename, line, name), (_cc, calls, tottime, cumtime, _callers) in sorted(
+                session.profile.stats.items(), key=lambda item: item[1][3], reverse=True
+            )[:TOP_FUNCTIONS]
+        ]
+        return {
+            "started": session.started,
+            "finished": dt_util.now().isoformat(),
+            "duration": session.duration,
+            "entry_ids": sorted(session.entry_ids) if session.entry_ids is not None else None,
+            "ticks": {entry_id: stats.as_dict() for entry_id, stats in session.ticks.items()},
+            "functions": functions,
+            "prof_file": prof_path,
+        }
+
+    @staticmethod
+    def _build_allocations(session: ProfileSession) -> list[dict]:
+        """Return the allocations made by this integration during the capture. Runs in the executor."""
+        # Walking all traces takes a while with a large heap
+        snapshot = tracemalloc.take_snapshot() if tracemalloc.is_tracing() else None
+        if session.tracemalloc_started:
+            tracemalloc.stop()
+
+        # Only those still alive
+        allocations = []
+        if snapshot is not None:
+            snapshot = snapshot.filter_traces([tracemalloc.Filter(True, f"*{DOMAIN}*")])
+            for stat in snapshot.statistics("lineno")[:TOP_ALLOCATIONS]:
+                frame = stat.traceback[0]
+                allocations.append({
+                    "location": f"{frame.filename}:{frame.lineno}",
+                    "size": stat.size,
+                    "count": stat.count,
+                })
+        return allocations
+
+    async def async_get_results(self, entry_id: str | None = None, with_files: bool = False) -> list[dict]:
+        """Return the stored results, optionally only those covering one box.
+
+        with_files adds the .prof file of each result as base64 ("prof_data"),
+        so it can be taken out of a diagnostics download.
+        """
+        results = [
+            result for result in await self._async_results()
+            if entry_id is None or result["entry_ids"] is None or entry_id in result["entry_ids"]
+        ]
+        if not with_files:
+            return results
+        return [
+            {**result, "prof_data": await self.hass.async_add_executor_job(_read_prof_file, result["prof_file"])}
+            if result.get("prof_file") else result
+            for result in results
+        ]
@@ -0,0 +1,95 @@
+"""Shared parsed sensor readings for Local Grow Box."""
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+
+from homeassistant.core import HomeAssistant, State, callback
+
+from .core import UNAVAILABLE_STATES, Reading
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ParsedState:
+    """A state parsed once: number, on/off and formatted display strings."""
+
+    __slots__ = ("source", "reading", "_formatted")
+
+    def __init__(self, source: State | Reading):
+        """Initialize from a state object or the reading of a zone."""
+        self.source = source
+        self.reading = Reading(source.state, source.last_changed)
+        self._formatted: dict[str, str] = {}
+
+    @property
+    def number(self) -> float | None:
+        """Return the state as number, None if it is not one."""
+        return self.reading.as_float()
+
+    @property
+    def is_on(self) -> bool:
+        """Return True for on."""
+        return self.reading.is_on
+
+    def formatted(self, key: str, func: Callable[[ParsedState], str]) -> str:
+        """Return func(self), computed once per state and key."""
+        if (text := self._formatted.get(key)) is None:
+            text = self._formatted[key] = func(self)
+        return text
+
+
+class ReadingCache:
+    """Parse every entity state once for all boxes and subsystems.
+
+    Home Assistant creates a new State object on every change, so an entry
+    is valid exactly as long as the state machine still holds the object it
+    was parsed from. A changed entity is parsed again on its next access;
+    there is no listener to maintain. Boxes sharing a room sensor share the
+    parsed value.
+
+    Zones of several sensors register under a virtual entity id and are
+    read the same way, their reading object is replaced on every change.
+    """
+
+    def __init__(self, hass: HomeAssistant):
+        """Initialize the cache."""
+        self.hass = hass
+        self._entries: dict[str, ParsedState] = {}
+        self._virtual: dict[str, object] = {}
+
+    @callback
+    def async_register(self, entity_id: str, source) -> Callable[[], None]:
+        """Serve entity_id from source.reading. Returns a function that removes it."""
+        self._virtual[entity_id] = source
+
+        @callback
+        def _remove() -> None:
+            if self._virtual.get(entity_id) is source:
+                del self._virtual[entity_id]
+                self._entries.pop(entity_id, None)
+
+        return _remove
+
+    @callback
+    def get(self, entity_id: str | None) -> ParsedState | None:
+        """Return the parsed state, None if missing or unavailable."""
+        if not entity_id:
+            return None
+        if (source := self._virtual.get(entity_id)) is not None:
+            state = source.reading
+        else:
+            state = self.hass.states.get(entity_id)
+        if state is None or state.state in UNAVAILABLE_STATES:
+            self._entries.pop(entity_id, None)
+            return None
+        entry = self._entries.get(entity_id)
+        if entry is None or entry.source is not state:
+            entry = self._entries[entity_id] = ParsedState(state)
+        return entry
+
+    @callback
+    def number(self, entity_id: str | None) -> float | None:
+        """Return the state of an entity as number, None if unavailable or not numeric."""
+        entry = self.get(entity_id)
+        return entry.number if entry else None
@@ -0,0 +1,66 @@
+"""Persistent runtime state for Local Grow Box."""
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 10  # Seconds, changes within this window are written once
+
+
+def _storage_key(entry_id: str) -> str:
+    return f"{DOMAIN}.runtime.{entry_id}"
+
+
+class RuntimeStore:
+    """Keep the hot runtime state of one box out of the config entry.
+
+    Master switch, phase, phase start, pump timing and controller state
+    change far more often than the configuration. They are written through
+    a delayed save, so a burst of changes costs a single write and never a
+    reload. The data is read from the manager when the write happens.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, data_func: Callable[[], dict]):
+        """Initialize the store."""
+        self._store = Store(hass, STORAGE_VERSION, _storage_key(entry_id))
+        self._data_func = data_func
+        self._dirty = False
+        self.restored = False
+
+    async def async_load(self) -> dict | None:
+        """Return the stored state, None on first start."""
+        try:
+            data = await self._store.async_load()
+        except Exception as err:
+            _LOGGER.error("Failed to load runtime state, starting fresh: %s", err)
+            data = None
+        self.restored = data is not None
+        return data
+
+    @callback
+    def async_schedule_save(self) -> None:
+        """Write the state after SAVE_DELAY, coalescing further changes."""
+        self._dirty = True
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    def _data_to_save(self) -> dict:
+        self._dirty = False
+        return self._data_func()
+
+    async def async_flush(self) -> None:
+        """Write a pending change now, e.g. before the box is reloaded."""
+        if self._dirty:
+            await self._store.async_save(self._data_to_save())
+
+
+async def async_remove_runtime(hass: HomeAssistant, entry_id: str) -> None:
+    """Delete the stored state of a removed box."""
+    await Store(hass, STORAGE_VERSION, _storage_key(entry_id)).async_remove()
@@ -5,12 +5,13 @@ import logging
 
 from homeassistant.components.select import SelectEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.restore_state import RestoreEntity
 
 from homeassistant.helpers.device_registry import DeviceInfo
-from .const import DOMAIN, GROW_PHASES, PHASE_VEGETATIVE
+from .const import DOMAIN, SIGNAL_PHASE_UPDATED
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -28,7 +29,6 @@ class GrowPhaseSelect(SelectEntity, RestoreEntity):
 
     _attr_has_entity_name = True
     _attr_name = "Grow Phase"
-    _attr_options = GROW_PHASES
     _attr_icon = "mdi:sprout"
 
     def __init__(self, hass, manager, entry_id):
@@ -37,6 +37,8 @@ class GrowPhaseSelect(SelectEntity, RestoreEntity):
         self.manager = manager
         self._entry_id = entry_id
         self._attr_unique_id = f"{entry_id}_phase"
+        # Options come from the box's phase registry, including custom phases
+        self._attr_options = list(manager.phases.order)
         self._attr_current_option = manager.current_phase
 
     @property
@@ -52,11 +54,27 @@ class GrowPhaseSelect(SelectEntity, RestoreEntity):
     async def async_added_to_hass(self) -> None:
         """Run when entity about to be added."""
         await super().async_added_to_hass()
+        # Phase changes from the panel or the timeline do not reload the box anymore
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_PHASE_UPDATED.format(self._entry_id),
+                self._async_phase_updated,
+            )
+        )
+        # The runtime store or a phase stored in the config wins over the restored state
+        if self.manager.runtime.restored or "current_phase" in self.manager.config:
+            return
         if (last_state := await self.async_get_last_state()) is not None:
-            if last_state.state in GROW_PHASES:
+            if last_state.state in self.manager.phases:
                 self._attr_current_option = last_state.state
                 # Sync manager with restored state
-                self.manager.set_phase(last_state.state)
+                self.manager.set_phase(last_state.state, self.manager.phase_start_date)
+
+    @callback
+    def _async_phase_updated(self) -> None:
+        self._attr_current_option = self.manager.current_phase
+        self.async_write_ha_state()
 
     async def async_select_option(self, option: str) -> None:
         """Change the selected option."""
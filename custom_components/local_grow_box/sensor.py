@@ -12,9 +12,10 @@ from homeassistant.components.sensor import (
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import UnitOfPressure
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.device_registry import DeviceInfo
-from .const import DOMAIN
+from .const import CONF_MOISTURE_SENSOR, DOMAIN, SIGNAL_PHASE_UPDATED, SIGNAL_WATERING_PREDICTED
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -28,10 +29,13 @@ async def async_setup_entry(
     # Retrieve the manager
     try:
         manager = hass.data[DOMAIN][entry.entry_id]
-        async_add_entities([
+        entities = [
             GrowBoxVPDSensor(hass, manager, entry.entry_id),
             GrowBoxDaysInPhaseSensor(hass, manager, entry.entry_id)
-        ])
+        ]
+        if manager.config.get(CONF_MOISTURE_SENSOR):
+            entities.append(GrowBoxNextWateringSensor(hass, manager, entry.entry_id))
+        async_add_entities(entities)
         _LOGGER.debug("Sensors added successfully")
     except Exception as e:
         _LOGGER.error("Error setting up sensors: %s", e)
@@ -84,6 +88,7 @@ class GrowBoxDaysInPhaseSensor(SensorEntity):
     _attr_name = "Days in Current Phase"
     _attr_native_unit_of_measurement = "days"
     _attr_icon = "mdi:calendar-clock"
+    _attr_should_poll = False
 
     def __init__(self, hass, manager, entry_id):
         """Initialize the sensor."""
@@ -106,3 +111,63 @@ class GrowBoxDaysInPhaseSensor(SensorEntity):
     def native_value(self) -> int:
         """Return the value of the sensor."""
         return self.manager.days_in_phase
+
+    async def async_added_to_hass(self) -> None:
+        """Register callbacks."""
+        # The manager recomputes the value at local midnight and on phase changes
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_PHASE_UPDATED.format(self._entry_id),
+                self.async_write_ha_state,
+            )
+        )
+
+
+class GrowBoxNextWateringSensor(SensorEntity):
+    """Representation of the predicted next watering."""
+
+    _attr_has_entity_name = True
+    _attr_name = "Next Watering"
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+    _attr_icon = "mdi:water-clock"
+    _attr_should_poll = False
+
+    def __init__(self, hass, manager, entry_id):
+        """Initialize the sensor."""
+        self.hass = hass
+        self.manager = manager
+        self._entry_id = entry_id
+        self._attr_unique_id = f"{entry_id}_next_watering"
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return the device info."""
+        return DeviceInfo(
+            identifiers={(DOMAIN, self._entry_id)},
+            name=self.manager.entry.title,
+            manufacturer="Local Grow Box",
+            model="Grow Box Controller",
+        )
+
+    @property
+    def native_value(self):
+        """Return when the moisture is expected to reach the target."""
+        return self.manager.predicted_watering
+
+    @property
+    def extra_state_attributes(self):
+        """Return the drying rate behind the prediction."""
+        slope = self.manager.drying.slope
+        return {"drying_rate": round(-slope, 2) if slope is not None else None}
+
+    async def async_added_to_hass(self) -> None:
+        """Register callbacks."""
+        # The manager predicts on every new moisture reading
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_WATERING_PREDICTED.format(self._entry_id),
+                self.async_write_ha_state,
+            )
+        )
@@ -0,0 +1,151 @@
+"""Shared camera snapshots for Local Grow Box."""
+from __future__ import annotations
+
+import asyncio
+import hmac
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from aiohttp import hdrs, web
+
+from homeassistant.components.http import KEY_AUTHENTICATED, HomeAssistantView
+from homeassistant.core import HomeAssistant
+
+from .assets import content_hash, is_not_modified
+from .const import DOMAIN, CONF_CAMERA_ENTITY
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_TTL = 10  # Seconds a snapshot is served before the camera is asked again
+DEFAULT_CACHE_SIZE = 16  # MB of snapshots kept in memory
+FETCH_TIMEOUT = 10  # Seconds
+
+
+@dataclass(slots=True)
+class Snapshot:
+    """A camera image as served to the viewers."""
+
+    body: bytes
+    content_type: str
+    version: str
+    fetched: float  # time.monotonic()
+
+
+class SnapshotCache:
+    """Fetch each camera's snapshot at most once per TTL, for all viewers.
+
+    Snapshots are kept per camera entity, so boxes sharing a camera share
+    the fetch. Requests arriving while a fetch runs wait for that fetch
+    instead of starting another one. The cache holds at most budget bytes
+    and drops the least recently served snapshot first. If a fetch fails,
+    the previous snapshot is served until the camera answers again.
+    """
+
+    def __init__(self, hass: HomeAssistant, ttl: float = DEFAULT_TTL, budget: int = DEFAULT_CACHE_SIZE * 1024 * 1024):
+        """Initialize the cache."""
+        self.hass = hass
+        self.ttl = ttl
+        self.budget = budget
+        self._snapshots: OrderedDict[str, Snapshot] = OrderedDict()
+        self._size = 0
+        self._pending: dict[str, asyncio.Task] = {}
+
+    async def async_get(self, entity_id: str) -> Snapshot | None:
+        """Return the snapshot of a camera, fetching it if it is older than the TTL."""
+        snapshot = self._snapshots.get(entity_id)
+        if snapshot is not None:
+            self._snapshots.move_to_end(entity_id)
+            if time.monotonic() - snapshot.fetched < self.ttl:
+                return snapshot
+
+        if (task := self._pending.get(entity_id)) is None:
+            task = self._pending[entity_id] = self.hass.async_create_task(self._async_fetch(entity_id))
+        # One viewer going away must not cancel the fetch the others wait for
+        return await asyncio.shield(task)
+
+    async def _async_fetch(self, entity_id: str) -> Snapshot | None:
+        # pylint: disable-next=import-outside-toplevel
+        from homeassistant.components.camera import async_get_image
+
+        try:
+            image = await async_get_image(self.hass, entity_id, timeout=FETCH_TIMEOUT)
+        except Exception as err:
+            _LOGGER.debug("Failed to fetch snapshot of %s: %s", entity_id, err)
+            if (stale := self._snapshots.get(entity_id)) is not None:
+                # Ask a struggling camera again only after another TTL
+                stale.fetched = time.monotonic()
+            return stale
+        finally:
+            self._pending.pop(entity_id, None)
+
+        snapshot = Snapshot(image.content, image.content_type, content_hash(image.content), time.monotonic())
+        self._store(entity_id, snapshot)
+        return snapshot
+
+    def _store(self, entity_id: str, snapshot: Snapshot) -> None:
+        if (old := self._snapshots.pop(entity_id, None)) is not None:
+            self._size -= len(old.body)
+        if len(snapshot.body) > self.budget:
+            return  # Served once, never cached
+        self._snapshots[entity_id] = snapshot
+        self._size += len(snapshot.body)
+        while self._size > self.budget:
+            _, evicted = self._snapshots.popitem(last=False)
+            self._size -= len(evicted.body)
+
+    def stats(self) -> dict:
+        """Return the size of the cache, for diagnostics."""
+        return {"snapshots": len(self._snapshots), "bytes": self._size, "budget": self.budget, "ttl": self.ttl}
+
+
+class GrowBoxSnapshotView(HomeAssistantView):
+    """Serve the camera snapshot of a box from the shared cache.
+
+    Like the camera proxy of Home Assistant, an <img> may authenticate with
+    the camera's current access token (?token=) instead of a header.
+    """
+
+    url = "/local_grow_box/snapshots/{entry_id}"
+    name = "local_grow_box:snapshots"
+    requires_auth = False
+
+    def __init__(self, cache: SnapshotCache):
+        """Initialize the view."""
+        self.cache = cache
+
+    async def get(self, request: web.Request, entry_id: str) -> web.Response:
+        """Return a snapshot."""
+        hass = self.cache.hass
+        manager = hass.data.get(DOMAIN, {}).get(entry_id)
+        camera = manager.config.get(CONF_CAMERA_ENTITY) if manager else None
+        if not camera or hass.states.get(camera) is None:
+            raise web.HTTPNotFound()
+
+        if not request.get(KEY_AUTHENTICATED) and not self._valid_token(camera, request.query.get("token")):
+            raise web.HTTPUnauthorized()
+
+        snapshot = await self.cache.async_get(camera)
+        if snapshot is None:
+            raise web.HTTPServiceUnavailable()
+
+        max_age = max(0, int(self.cache.ttl - (time.monotonic() - snapshot.fetched)))
+        headers = {
+            hdrs.ETAG: f'"{snapshot.version}"',
+            hdrs.CACHE_CONTROL: f"private, max-age={max_age}",
+        }
+        if is_not_modified(request, snapshot.version):
+            return web.Response(status=304, headers=headers)
+        return web.Response(body=snapshot.body, content_type=snapshot.content_type, headers=headers)
+
+    def _valid_token(self, camera: str, token: str | None) -> bool:
+        """Check a token against the camera's recent access tokens, like the camera proxy."""
+        if not token:
+            return False
+        component = self.cache.hass.data.get("camera")
+        entity = component.get_entity(camera) if component else None
+        if entity is None:
+            return False
+        # The attribute only holds the newest token, an <img> may still carry the previous one
+        return any(hmac.compare_digest(token, valid) for valid in entity.access_tokens)
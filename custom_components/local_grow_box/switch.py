@@ -10,26 +10,7 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.helpers.device_registry import DeviceInfo
 
-from .const import (
-    DOMAIN, 
-    CONF_PUMP_ENTITY, 
-    CONF_CAMERA_ENTITY,
-    CONF_TEMP_SENSOR,
-    CONF_HUMIDITY_SENSOR,
-    CONF_LIGHT_ENTITY,
-    CONF_FAN_ENTITY,
-    CONF_PUMP_DURATION,
-    CONF_MOISTURE_SENSOR,
-    CONF_TARGET_MOISTURE,
-    CONF_LIGHT_START_HOUR,
-    CONF_TARGET_TEMP,
-    CONF_MAX_HUMIDITY,
-    DEFAULT_PUMP_DURATION,
-    DEFAULT_TARGET_MOISTURE,
-    DEFAULT_LIGHT_START_HOUR,
-    DEFAULT_TARGET_TEMP,
-    DEFAULT_MAX_HUMIDITY,
-)
+from .const import DOMAIN, CONF_PUMP_ENTITY
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -54,6 +35,8 @@ class GrowBoxMasterSwitch(SwitchEntity, RestoreEntity):
     _attr_has_entity_name = True
     _attr_name = "Master Control"
     _attr_icon = "mdi:power"
+    # Also available from the phase select and the days in phase sensor, no need to record them again
+    _unrecorded_attributes = frozenset({"phase_start_date", "days_in_phase"})
 
     def __init__(self, hass, manager, entry_id):
         """Initialize the switch."""
@@ -62,6 +45,8 @@ class GrowBoxMasterSwitch(SwitchEntity, RestoreEntity):
         self._entry_id = entry_id
         self._attr_unique_id = f"{entry_id}_master_switch"
         self._is_on = manager.master_switch_on
+        self._attributes_key = None
+        self._attributes: dict = {}
 
     @property
     def device_info(self) -> DeviceInfo:
@@ -75,23 +60,21 @@ class GrowBoxMasterSwitch(SwitchEntity, RestoreEntity):
 
     @property
     def extra_state_attributes(self):
-        """Return entity specific state attributes."""
-        return {
-            "camera_entity": self.manager.config.get(CONF_CAMERA_ENTITY),
-            "temp_sensor": self.manager.config.get(CONF_TEMP_SENSOR),
-            "humidity_sensor": self.manager.config.get(CONF_HUMIDITY_SENSOR),
-            "light_entity": self.manager.config.get(CONF_LIGHT_ENTITY),
-            "fan_entity": self.manager.config.get(CONF_FAN_ENTITY),
-            "pump_entity": self.manager.config.get(CONF_PUMP_ENTITY),
-            "moisture_sensor": self.manager.config.get(CONF_MOISTURE_SENSOR),
-            "target_moisture": self.manager.config.get(CONF_TARGET_MOISTURE, DEFAULT_TARGET_MOISTURE),
-            "pump_duration": self.manager.config.get(CONF_PUMP_DURATION, DEFAULT_PUMP_DURATION),
-            "light_start_hour": self.manager.config.get(CONF_LIGHT_START_HOUR, DEFAULT_LIGHT_START_HOUR),
-            "target_temp": self.manager.config.get(CONF_TARGET_TEMP, DEFAULT_TARGET_TEMP),
-            "max_humidity": self.manager.config.get(CONF_MAX_HUMIDITY, DEFAULT_MAX_HUMIDITY),
-            "phase_start_date": self.manager.phase_start_date.isoformat() if self.manager.phase_start_date else None,
-            "days_in_phase": self.manager.days_in_phase,
-        }
+        """Return the phase timing of the box.
+
+        The config of the box is served by local_grow_box/get_config and the
+        diagnostics, repeating it here stored it with every state write.
+        """
+        start = self.manager.phase_start_date
+        key = (start, self.manager.days_in_phase)
+        if key != self._attributes_key:
+            # Rebuilt only when the phase actually changed
+            self._attributes_key = key
+            self._attributes = {
+                "phase_start_date": start.isoformat() if start else None,
+                "days_in_phase": self.manager.days_in_phase,
+            }
+        return self._attributes
 
     @property
     def is_on(self) -> bool:
@@ -101,6 +84,9 @@ class GrowBoxMasterSwitch(SwitchEntity, RestoreEntity):
     async def async_added_to_hass(self) -> None:
         """Run when entity about to be added."""
         await super().async_added_to_hass()
+        if self.manager.runtime.restored:
+            return # The manager restored the switch from its runtime store
+        # First start after an upgrade: migrate the last state into the runtime store
         if (last_state := await self.async_get_last_state()) is not None:
             if last_state.state == "on":
                 self._is_on = True
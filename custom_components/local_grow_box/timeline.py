@@ -0,0 +1,72 @@
+"""Grow timeline for Local Grow Box."""
+from __future__ import annotations
+
+import datetime
+from dataclasses import dataclass
+from datetime import timedelta
+
+
+@dataclass(frozen=True)
+class TimelineEntry:
+    """A single phase on the grow timeline."""
+
+    phase: str
+    start: datetime.datetime
+    end: datetime.datetime | None  # None = open-ended (no target duration)
+
+    @property
+    def duration_days(self) -> float | None:
+        """Return the planned duration in days."""
+        if self.end is None:
+            return None
+        return (self.end - self.start).total_seconds() / 86400
+
+    def as_dict(self) -> dict:
+        """Return a JSON serializable representation."""
+        return {
+            "phase": self.phase,
+            "start": self.start.isoformat(),
+            "end": self.end.isoformat() if self.end else None,
+            "duration_days": self.duration_days,
+        }
+
+
+def build_timeline(
+    phase_order: list[str],
+    durations: dict[str, float],
+    current_phase: str,
+    phase_start: datetime.datetime,
+) -> list[TimelineEntry]:
+    """Precompute the timeline from the current phase onwards.
+
+    The chain follows phase_order and stops at the first phase without a
+    target duration, since everything after it has no known start.
+    """
+    timeline = []
+    start = phase_start
+    phase = current_phase
+
+    while phase is not None:
+        days = durations.get(phase) or 0
+        if days <= 0:
+            timeline.append(TimelineEntry(phase, start, None))
+            break
+
+        end = start + timedelta(days=days)
+        timeline.append(TimelineEntry(phase, start, end))
+        start = end
+
+        if phase not in phase_order:
+            break
+        idx = phase_order.index(phase) + 1
+        phase = phase_order[idx] if idx < len(phase_order) else None
+
+    return timeline
+
+
+def entry_at(timeline: list[TimelineEntry], when: datetime.datetime) -> TimelineEntry | None:
+    """Return the timeline entry that covers the given point in time."""
+    for entry in timeline:
+        if entry.start <= when and (entry.end is None or when < entry.end):
+            return entry
+    return None
@@ -0,0 +1,180 @@
+"""Sensor staleness watchdog for Local Grow Box."""
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.util import dt as dt_util
+
+from .core import UNAVAILABLE_STATES
+
+_LOGGER = logging.getLogger(__name__)
+
+PROBLEM_UNAVAILABLE = "unavailable"
+PROBLEM_STALE = "stale"  # No report within the timeout
+PROBLEM_STUCK = "stuck"  # Still reporting, but the value never changes
+
+RECHECK_INTERVAL = 60  # Seconds between checks of a sensor with a problem
+
+
+@dataclass(eq=False)
+class WatchedSensor:
+    """A sensor of one box and its limits."""
+
+    entry_id: str
+    entity_id: str
+    stale_after: float  # Seconds, 0 = not checked
+    stuck_after: float  # Seconds, 0 = not checked
+    since: float = 0.0  # When watching started
+    problem: str | None = None
+    deadline: float | None = None
+    active: bool = True
+
+    @property
+    def timeout(self) -> float:
+        """Return how long a sensor may be unavailable before it is a problem."""
+        return self.stale_after or self.stuck_after
+
+
+class SensorWatchdog:
+    """Watch the sensors of all boxes with a single timer.
+
+    Every sensor has one entry in a heap, due when it would become stale or
+    stuck if nothing happens until then. Only the earliest entry has a
+    timer. When it fires the sensor is checked against its current state
+    (last_reported/last_updated and last_changed) and pushed again with its
+    next deadline, so a healthy sensor costs one heap operation per timeout
+    and no work per tick or state change.
+    """
+
+    def __init__(self, hass: HomeAssistant):
+        """Initialize the watchdog."""
+        self.hass = hass
+        self._heap: list[tuple[float, int, WatchedSensor]] = []
+        self._counter = itertools.count()
+        self._boxes: dict[str, list[WatchedSensor]] = {}
+        self._callbacks: dict[str, Callable[[], None]] = {}
+        self._unsub_timer = None
+        self._timer_at: float | None = None
+
+    @callback
+    def async_watch(
+        self,
+        entry_id: str,
+        sensors: dict[str, tuple[float, float]],
+        on_change: Callable[[], None],
+    ) -> Callable[[], None]:
+        """Watch {entity_id: (stale_after, stuck_after)} of a box.
+
+        on_change is called whenever a problem appears or clears. Returns a
+        function that stops watching.
+        """
+        self.async_unwatch(entry_id)
+        now = dt_util.utcnow().timestamp()
+        watched = []
+        for entity_id, (stale_after, stuck_after) in sensors.items():
+            if not entity_id or not (stale_after or stuck_after):
+                continue
+            sensor = WatchedSensor(entry_id, entity_id, stale_after, stuck_after, since=now)
+            sensor.problem, deadline = self._check(sensor, now)
+            self._push(sensor, deadline)
+            watched.append(sensor)
+        self._boxes[entry_id] = watched
+        self._callbacks[entry_id] = on_change
+        self._async_schedule()
+        return lambda: self.async_unwatch(entry_id)
+
+    @callback
+    def async_unwatch(self, entry_id: str) -> None:
+        """Stop watching the sensors of a box."""
+        for sensor in self._boxes.pop(entry_id, []):
+            # Heap entries are dropped lazily when they come up
+            sensor.active = False
+        self._callbacks.pop(entry_id, None)
+        # Moves the timer on, or drops it with the last watched sensor
+        self._async_schedule()
+
+    def problems(self, entry_id: str) -> dict[str, str]:
+        """Return {entity_id: problem} of the sensors of a box that have one."""
+        return {
+            sensor.entity_id: sensor.problem
+            for sensor in self._boxes.get(entry_id, [])
+            if sensor.problem
+        }
+
+    def _check(self, sensor: WatchedSensor, now: float) -> tuple[str | None, float | None]:
+        """Return the problem of a sensor and when to check it next."""
+        state = self.hass.states.get(sensor.entity_id)
+        if state is None or state.state in UNAVAILABLE_STATES:
+            # Short outages (e.g. while the sensor's integration starts) are no problem yet
+            down_since = max(state.last_changed.timestamp(), sensor.since) if state else sensor.since
+            if now < down_since + sensor.timeout:
+                return None, down_since + sensor.timeout
+            return PROBLEM_UNAVAILABLE, now + RECHECK_INTERVAL
+
+        deadlines = []
+        if sensor.stale_after:
+            # last_reported also moves on repeated identical reports (newer cores)
+            last_seen = getattr(state, "last_reported", None) or state.last_updated
+            due = last_seen.timestamp() + sensor.stale_after
+            if now >= due:
+                return PROBLEM_STALE, now + RECHECK_INTERVAL
+            deadlines.append(due)
+        if sensor.stuck_after:
+            due = state.last_changed.timestamp() + sensor.stuck_after
+            if now >= due:
+                return PROBLEM_STUCK, now + RECHECK_INTERVAL
+            deadlines.append(due)
+        return None, min(deadlines) if deadlines else None
+
+    def _push(self, sensor: WatchedSensor, deadline: float | None) -> None:
+        sensor.deadline = deadline
+        if deadline is not None:
+            heapq.heappush(self._heap, (deadline, next(self._counter), sensor))
+
+    @callback
+    def _async_schedule(self) -> None:
+        """Keep one timer for the earliest deadline."""
+        while self._heap and not self._heap[0][2].active:
+            heapq.heappop(self._heap)
+        when = self._heap[0][0] if self._heap else None
+        if when == self._timer_at:
+            return
+        if self._unsub_timer:
+            self._unsub_timer()
+            self._unsub_timer = None
+        self._timer_at = when
+        if when is not None:
+            self._unsub_timer = async_track_point_in_utc_time(
+                self.hass, self._async_fire, dt_util.utc_from_timestamp(when)
+            )
+
+    @callback
+    def _async_fire(self, _now) -> None:
+        self._unsub_timer = None
+        self._timer_at = None
+        now = dt_util.utcnow().timestamp()
+        changed = set()
+        while self._heap and self._heap[0][0] <= now:
+            deadline, _, sensor = heapq.heappop(self._heap)
+            if not sensor.active or sensor.deadline != deadline:
+                continue
+            problem, next_deadline = self._check(sensor, now)
+            if problem != sensor.problem:
+                if problem:
+                    _LOGGER.warning("Sensor %s is %s", sensor.entity_id, problem)
+                else:
+                    _LOGGER.info("Sensor %s reports again", sensor.entity_id)
+                sensor.problem = problem
+                changed.add(sensor.entry_id)
+            self._push(sensor, next_deadline)
+
+        for entry_id in changed:
+            if on_change := self._callbacks.get(entry_id):
+                on_change()
+        self._async_schedule()
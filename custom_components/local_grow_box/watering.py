@@ -0,0 +1,177 @@
+"""Fleet-wide watering scheduler for Local Grow Box."""
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+
+from homeassistant.core import HomeAssistant, callback
+
+_LOGGER = logging.getLogger(__name__)
+
+MAX_WAIT = 1800  # Seconds a request waits before it is served first come, first served
+
+
+@dataclass(order=True)
+class WateringRequest:
+    """A queued watering run. Ordered by largest deficit, then first come."""
+
+    sort_key: tuple = field(init=False, repr=False)
+    entry_id: str = field(compare=False)
+    deficit: float = field(compare=False)
+    power: float = field(compare=False)
+    seq: int = field(compare=False)
+    queued_at: float = field(compare=False)  # time.monotonic() of the first request
+    start: Callable[[], Awaitable[bool]] = field(compare=False, repr=False)
+
+    def __post_init__(self):
+        self.sort_key = (-self.deficit, self.seq)
+
+
+class WateringScheduler:
+    """Dispatch pump runs of all boxes under a concurrency and power budget.
+
+    Boxes submit a request with their moisture deficit. The scheduler keeps
+    a heap ordered by deficit and starts runs strictly in that order while
+    the number of running pumps and their summed power stay in budget.
+    A request waiting longer than MAX_WAIT goes before the heap, oldest
+    first, so a slightly dry box is not starved by drier ones.
+
+    A granted slot stays reserved until the start of the pump finished. The
+    box's own water tick may see the pump still off in the meantime, its
+    release must not hand the slot to another box.
+    """
+
+    def __init__(self, hass: HomeAssistant, max_concurrent: int = 0, power_budget: float = 0):
+        """Initialize the scheduler. 0 disables a limit."""
+        self.hass = hass
+        self.max_concurrent = max_concurrent
+        self.power_budget = power_budget
+        self._heap: list[WateringRequest] = []
+        self._queued: dict[str, WateringRequest] = {}
+        self._running: dict[str, float] = {}
+        self._starting: set[str] = set()
+        self._seq = itertools.count()
+
+    @property
+    def running_power(self) -> float:
+        """Return the summed power of all running pumps."""
+        return sum(self._running.values())
+
+    def _fits(self, power: float) -> bool:
+        if self.max_concurrent and len(self._running) >= self.max_concurrent:
+            return False
+        if not self.power_budget or not self._running:
+            # A pump larger than the whole budget may still run on its own
+            return True
+        return self.running_power + power <= self.power_budget
+
+    @callback
+    def async_request(self, entry_id: str, deficit: float, power: float, start) -> None:
+        """Queue a watering run, or refresh the deficit of a queued one."""
+        if entry_id in self._running:
+            return
+        queued = self._queued.get(entry_id)
+        if queued is not None and queued.deficit == deficit:
+            return
+
+        # Keep the original position on ties and the waiting time, the stale heap entry is skipped later
+        if queued is not None:
+            seq, queued_at = queued.seq, queued.queued_at
+        else:
+            seq, queued_at = next(self._seq), time.monotonic()
+        request = WateringRequest(
+            entry_id=entry_id, deficit=deficit, power=power, seq=seq, queued_at=queued_at, start=start
+        )
+        self._queued[entry_id] = request
+        heapq.heappush(self._heap, request)
+
+        # Deficits are refreshed every tick while blocked, drop the stale entries now and then
+        if len(self._heap) > 4 * len(self._queued) + 16:
+            self._heap = list(self._queued.values())
+            heapq.heapify(self._heap)
+
+        self._async_dispatch()
+
+    @callback
+    def async_cancel(self, entry_id: str) -> None:
+        """Drop a queued request, e.g. when moisture recovered."""
+        self._queued.pop(entry_id, None)
+
+    @callback
+    def async_mark_running(self, entry_id: str, power: float) -> None:
+        """Account for a pump that was started outside the queue."""
+        self._queued.pop(entry_id, None)
+        self._running[entry_id] = power
+
+    @callback
+    def async_release(self, entry_id: str) -> None:
+        """Free the slot of a pump that stopped and start the next run."""
+        if entry_id in self._starting:
+            return
+        if self._running.pop(entry_id, None) is not None:
+            self._async_dispatch()
+
+    def _peek(self) -> WateringRequest | None:
+        # Refreshing a queued request keeps its dict position, so the first one is the oldest
+        oldest = next(iter(self._queued.values()), None)
+        if oldest is not None and time.monotonic() - oldest.queued_at >= MAX_WAIT:
+            return oldest
+        while self._heap:
+            request = self._heap[0]
+            if self._queued.get(request.entry_id) is request:
+                return request
+            heapq.heappop(self._heap)
+        return None
+
+    @callback
+    def _async_dispatch(self) -> None:
+        while (request := self._peek()) is not None and self._fits(request.power):
+            if self._heap[0] is request:
+                heapq.heappop(self._heap)
+            # Otherwise it was overdue, its heap entry is skipped later like a stale one
+            del self._queued[request.entry_id]
+            self._running[request.entry_id] = request.power
+            self._starting.add(request.entry_id)
+            self.hass.async_create_task(self._async_start(request))
+
+    async def _async_start(self, request: WateringRequest) -> None:
+        try:
+            started = await request.start()
+        except Exception as err:
+            _LOGGER.error("Failed to start watering for %s: %s", request.entry_id, err)
+            started = False
+        finally:
+            self._starting.discard(request.entry_id)
+        if not started:
+            self.async_release(request.entry_id)
+
+    def status(self, entry_id: str) -> dict:
+        """Return the queue status of a box."""
+        if entry_id in self._running:
+            return {"state": "running"}
+        if entry_id in self._queued:
+            position = self._order().index(self._queued[entry_id]) + 1
+            return {"state": "queued", "position": position}
+        return {"state": "idle"}
+
+    def as_dict(self) -> dict:
+        """Return the fleet view of the queue."""
+        return {
+            "max_concurrent": self.max_concurrent,
+            "power_budget": self.power_budget,
+            "running": dict(self._running),
+            "queued": [
+                {"entry_id": r.entry_id, "deficit": r.deficit, "power": r.power}
+                for r in self._order()
+            ],
+        }
+
+    def _order(self) -> list[WateringRequest]:
+        """Return the queued requests in the order they will be served."""
+        now = time.monotonic()
+        overdue = [r for r in self._queued.values() if now - r.queued_at >= MAX_WAIT]
+        return overdue + sorted(r for r in self._queued.values() if now - r.queued_at < MAX_WAIT)
@@ -0,0 +1,183 @@
+"""Multi-sensor zones for Local Grow Box."""
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+
+import voluptuous as vol
+
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    CONF_TEMP_SENSOR, CONF_HUMIDITY_SENSOR, CONF_MOISTURE_SENSOR, AGGREGATE_MEAN, AGGREGATE_MIN,
+    AGGREGATE_MAX, AGGREGATE_WEIGHTED, AGGREGATE_POLICIES,
+)
+from .core import Reading
+from .readings import ReadingCache
+
+_LOGGER = logging.getLogger(__name__)
+
+ZONE_ROLES = (CONF_TEMP_SENSOR, CONF_HUMIDITY_SENSOR, CONF_MOISTURE_SENSOR)
+
+# Role -> additional sensors and how to combine them with the role's own sensor
+ZONE_SCHEMA = vol.Schema({
+    vol.Required("sensors"): [str],
+    vol.Optional("policy", default=AGGREGATE_MEAN): vol.In(AGGREGATE_POLICIES),
+    vol.Optional("weights", default={}): {str: vol.All(vol.Coerce(float), vol.Range(min=0, min_included=False))},
+})
+ZONES_SCHEMA = vol.Schema({vol.Optional(role): ZONE_SCHEMA for role in ZONE_ROLES})
+
+
+class Aggregate:
+    """Mean, weighted mean, min or max of member values, updated one member at a time.
+
+    Sums are adjusted by the old and new value of the changed member. Min
+    and max only scan all members when the member holding the extreme
+    moves away from it.
+    """
+
+    def __init__(self, policy: str = AGGREGATE_MEAN, weights: dict[str, float] | None = None):
+        """Initialize the aggregate."""
+        self.policy = policy
+        self.weights = (weights or {}) if policy == AGGREGATE_WEIGHTED else {}
+        self._values: dict[str, float] = {}
+        self._sum = 0.0
+        self._weight = 0.0
+        self._extreme: float | None = None
+
+    @property
+    def values(self) -> dict[str, float]:
+        """Return the values of the members that count."""
+        return self._values
+
+    @property
+    def value(self) -> float | None:
+        """Return the aggregate, None without any member value."""
+        if not self._values:
+            return None
+        if self.policy in (AGGREGATE_MIN, AGGREGATE_MAX):
+            return self._extreme
+        return self._sum / self._weight
+
+    def update(self, member: str, value: float | None) -> None:
+        """Set the value of a member, None to leave it out."""
+        old = self._values.pop(member, None)
+        if old is not None:
+            weight = self.weights.get(member, 1.0)
+            self._sum -= old * weight
+            self._weight -= weight
+        if value is not None:
+            weight = self.weights.get(member, 1.0)
+            self._values[member] = value
+            self._sum += value * weight
+            self._weight += weight
+        if not self._values:
+            # No drift carried over into the next reading
+            self._sum = self._weight = 0.0
+
+        if self.policy not in (AGGREGATE_MIN, AGGREGATE_MAX):
+            return
+        pick = min if self.policy == AGGREGATE_MIN else max
+        if value is not None and (self._extreme is None or pick(value, self._extreme) == value):
+            self._extreme = value
+        elif old is not None and old == self._extreme:
+            self._extreme = pick(self._values.values(), default=None)
+
+
+class SensorZone:
+    """Several sensors of one role that the box reads as one.
+
+    The zone appears in the reading cache under a virtual entity id, so the
+    control logic, the VPD, the alerts and the display read it like a
+    single sensor. Each member's state change updates the aggregate on its
+    own. Unavailable or non-numeric members and members excluded by the
+    watchdog do not count.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        readings: ReadingCache,
+        entity_id: str,
+        members: list[str],
+        policy: str = AGGREGATE_MEAN,
+        weights: dict[str, float] | None = None,
+        on_change: Callable[[], None] | None = None,
+    ):
+        """Initialize the zone."""
+        self.hass = hass
+        self.readings = readings
+        self.entity_id = entity_id  # Virtual, only known to the reading cache
+        self.members = tuple(members)
+        self.aggregate = Aggregate(policy, weights)
+        self.excluded: frozenset[str] = frozenset()
+        self.reading: Reading | None = None
+        self._on_change = on_change
+        self._unsubs: list[Callable[[], None]] = []
+
+    @property
+    def usable(self) -> bool:
+        """Return False if every member is excluded."""
+        return not self.excluded.issuperset(self.members)
+
+    @callback
+    def async_setup(self) -> None:
+        """Read the members once and follow their changes."""
+        self._unsubs.append(self.readings.async_register(self.entity_id, self))
+        self._unsubs.append(
+            async_track_state_change_event(self.hass, list(self.members), self._async_member_changed)
+        )
+        for member in self.members:
+            self.aggregate.update(member, self._value(member))
+        self._async_publish(notify=False)
+
+    @callback
+    def async_unload(self) -> None:
+        """Stop following the members."""
+        while self._unsubs:
+            self._unsubs.pop()()
+
+    @callback
+    def async_exclude(self, entity_ids) -> None:
+        """Leave out the given members until they are no longer given."""
+        excluded = frozenset(entity_ids).intersection(self.members)
+        if excluded == self.excluded:
+            return
+        changed = excluded ^ self.excluded
+        self.excluded = excluded
+        for member in changed:
+            self.aggregate.update(member, self._value(member))
+        self._async_publish()
+
+    def _value(self, member: str) -> float | None:
+        return None if member in self.excluded else self.readings.number(member)
+
+    @callback
+    def _async_member_changed(self, event: Event) -> None:
+        member = event.data["entity_id"]
+        self.aggregate.update(member, self._value(member))
+        self._async_publish()
+
+    @callback
+    def _async_publish(self, notify: bool = True) -> None:
+        """Replace the reading if the aggregate changed."""
+        value = self.aggregate.value
+        state = str(round(value, 2)) if value is not None else None
+        if state == (self.reading.state if self.reading else None):
+            return
+        # A new object invalidates the parsed reading in the cache
+        self.reading = Reading(state, dt_util.utcnow()) if state is not None else None
+        if notify and self._on_change:
+            self._on_change()
+
+    def as_dict(self) -> dict:
+        """Return the zone for the panel and diagnostics."""
+        values = self.aggregate.values
+        return {
+            "policy": self.aggregate.policy,
+            "value": self.aggregate.value,
+            "members": {member: values.get(member) for member in self.members},
+            "excluded": sorted(self.excluded),
+        }
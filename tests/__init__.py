@@ -0,0 +1 @@
+"""Tests for the Local Grow Box integration."""
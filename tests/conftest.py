@@ -0,0 +1,23 @@
+"""Fixtures for Local Grow Box tests."""
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    """Load the integration from custom_components."""
+    yield
+
+
+@pytest.fixture
+async def http(hass: HomeAssistant):
+    """Set up the HTTP component, the panel registration is not under test."""
+    assert await async_setup_component(hass, "http", {})
+    with patch(
+        "custom_components.local_grow_box.panel_custom.async_register_panel", new=AsyncMock()
+    ):
+        yield
@@ -0,0 +1,126 @@
+"""Tests for the threshold alerts."""
+from unittest.mock import patch
+
+from pytest_homeassistant_custom_component.common import async_capture_events
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.local_grow_box.alerts import (
+    CLEAR_DELAY, EVENT_ALERT, KIND_ABOVE, KIND_RISING, NOTIFY_COOLDOWN, AlertEngine, AlertRule,
+    RateWindow, SustainedWindow,
+)
+
+
+def test_sustained_window() -> None:
+    """The window fires once the condition held for the duration and restarts when it breaks."""
+    window = SustainedWindow(60)
+    assert not window.update(0, True)
+    assert not window.update(59, True)
+    assert window.update(60, True)
+    assert not window.update(61, False)
+    assert not window.update(62, True)
+    assert window.update(122, True)
+
+    window.reset()
+    assert not window.update(123, True)
+
+
+def test_rate_window() -> None:
+    """The rate spans the full window and is None until the window is full."""
+    window = RateWindow(600)
+    assert window.update(0, 20.0) is None
+    assert window.update(300, 21.0) is None
+    assert window.update(600, 22.0) == 12.0
+    # The anchor moves on, the newest sample older than the window is kept
+    assert window.update(900, 22.0) == 6.0
+    assert window.update(1200, 22.0) == 0.0
+
+    window.reset()
+    assert window.update(1300, 25.0) is None
+
+
+def _engine(hass: HomeAssistant, logs: list[str]) -> AlertEngine:
+    rules = [
+        AlertRule("temp_high", "temp", KIND_ABOVE, 60, "Temperatur", "°"),
+        AlertRule("temp_rising", "temp", KIND_RISING, 600, "Temperaturanstieg", "°/h"),
+    ]
+    return AlertEngine(hass, "entry", "Box", rules, logs.append)
+
+
+async def test_alert_raises_and_clears(hass: HomeAssistant) -> None:
+    """An alert raises after the duration and clears after CLEAR_DELAY quiet seconds."""
+    logs = []
+    events = async_capture_events(hass, EVENT_ALERT)
+    engine = _engine(hass, logs)
+    limits = {"temp_high": 28, "temp_rising": 0}
+
+    with patch("homeassistant.components.persistent_notification.async_create") as create, patch(
+        "homeassistant.components.persistent_notification.async_dismiss"
+    ) as dismiss:
+        engine.async_update(0, {"temp": 30}, limits)
+        assert engine.active() == []
+        engine.async_update(60, {"temp": 30}, limits)
+        assert [alert["key"] for alert in engine.active()] == ["temp_high"]
+        assert create.call_count == 1
+
+        engine.async_update(100, {"temp": 25}, limits)
+        engine.async_update(100 + CLEAR_DELAY - 1, {"temp": 25}, limits)
+        assert engine.active()
+        engine.async_update(100 + CLEAR_DELAY, {"temp": 25}, limits)
+        assert engine.active() == []
+        assert dismiss.call_count == 1
+
+    await hass.async_block_till_done()
+    assert [event.data["active"] for event in events] == [True, False]
+    assert logs == ["Temperatur-Alarm ausgelöst (30°, Grenze 28°)", "Temperatur-Alarm behoben"]
+
+
+async def test_flapping_alert_notifies_once_per_cooldown(hass: HomeAssistant) -> None:
+    """A returning alert is logged again, but notifies only after the cooldown."""
+    logs = []
+    engine = _engine(hass, logs)
+    limits = {"temp_high": 28, "temp_rising": 0}
+
+    def flap(start: float) -> float:
+        engine.async_update(start, {"temp": 30}, limits)
+        engine.async_update(start + 60, {"temp": 30}, limits)
+        engine.async_update(start + 61, {"temp": 25}, limits)
+        engine.async_update(start + 61 + CLEAR_DELAY, {"temp": 25}, limits)
+        return start + 62 + CLEAR_DELAY
+
+    with patch("homeassistant.components.persistent_notification.async_create") as create, patch(
+        "homeassistant.components.persistent_notification.async_dismiss"
+    ):
+        now = flap(0)
+        now = flap(now)
+        assert create.call_count == 1
+        flap(max(now, NOTIFY_COOLDOWN))
+        assert create.call_count == 2
+    assert len([log for log in logs if "ausgelöst" in log]) == 3
+
+
+async def test_missing_value_restarts_the_window(hass: HomeAssistant) -> None:
+    """A sensor going away resets the sustained window."""
+    engine = _engine(hass, [])
+    limits = {"temp_high": 28, "temp_rising": 0}
+    with patch("homeassistant.components.persistent_notification.async_create"):
+        engine.async_update(0, {"temp": 30}, limits)
+        engine.async_update(30, {"temp": None}, limits)
+        engine.async_update(60, {"temp": 30}, limits)
+        assert engine.active() == []
+        engine.async_update(120, {"temp": 30}, limits)
+        assert engine.active()
+
+
+async def test_rising_alert(hass: HomeAssistant) -> None:
+    """The rise rule fires when the temperature climbs faster than the limit per hour."""
+    engine = _engine(hass, [])
+    limits = {"temp_high": None, "temp_rising": 5}
+    with patch("homeassistant.components.persistent_notification.async_create"):
+        engine.async_update(0, {"temp": 20}, limits)
+        engine.async_update(600, {"temp": 20.5}, limits)
+        assert engine.active() == []
+        engine.async_update(1200, {"temp": 22}, limits)
+        (alert,) = engine.active()
+    assert alert["key"] == "temp_rising"
+    assert alert["value"] == 9.0
@@ -0,0 +1,92 @@
+"""Tests for the asset delivery."""
+from pathlib import Path
+
+import pytest
+from aiohttp import hdrs
+from aiohttp.test_utils import make_mocked_request
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.local_grow_box.assets import (
+    IMMUTABLE_CACHE_HEADER, REVALIDATE_CACHE_HEADER, ImageIndex, build_response, parse_accept_encoding,
+    select_encoding,
+)
+
+ENCODED = {"br": b"br-body", "gzip": b"gzip-body"}
+
+
+def test_parse_accept_encoding() -> None:
+    """Codings are lowercased, q defaults to 1 and a broken q counts as refused."""
+    assert parse_accept_encoding("") == {}
+    assert parse_accept_encoding("GZIP, br;q=0.5, deflate;level=1;q=0 ,, x;q=abc") == {
+        "gzip": 1.0, "br": 0.5, "deflate": 0.0, "x": 0.0,
+    }
+
+
+@pytest.mark.parametrize(
+    ("header", "available", "expected"),
+    [
+        ("gzip, br", ENCODED, "br"),
+        ("gzip;q=1.0, br;q=0.5", ENCODED, "gzip"),
+        ("br;q=0.2, gzip;q=0.2", ENCODED, "br"),
+        ("br", {"gzip": b""}, None),
+        ("*", ENCODED, "br"),
+        ("*;q=0.5, gzip", ENCODED, "gzip"),
+        ("*, br;q=0", ENCODED, "gzip"),
+        ("gzip;q=0, br;q=0", ENCODED, None),
+        ("identity", ENCODED, None),
+        ("", ENCODED, None),
+    ],
+)
+def test_select_encoding(header: str, available: dict, expected: str | None) -> None:
+    """The client's preference wins, the server order only breaks ties."""
+    assert select_encoding(header, available) == expected
+
+
+def test_build_response_negotiates() -> None:
+    """The preferred coding is sent together with the cache headers."""
+    request = make_mocked_request(
+        "GET", "/local_grow_box/panel.js?v=abc", headers={hdrs.ACCEPT_ENCODING: "gzip;q=1.0, br;q=0.5"}
+    )
+    response = build_response(request, b"plain", "text/javascript", "abc", ENCODED)
+    assert response.body == b"gzip-body"
+    assert response.headers[hdrs.CONTENT_ENCODING] == "gzip"
+    assert response.headers[hdrs.CACHE_CONTROL] == IMMUTABLE_CACHE_HEADER
+    assert response.headers[hdrs.ETAG] == '"abc"'
+
+
+def test_build_response_not_modified() -> None:
+    """A matching If-None-Match is answered with 304."""
+    request = make_mocked_request("GET", "/local_grow_box/panel.js", headers={hdrs.IF_NONE_MATCH: '"abc"'})
+    response = build_response(request, b"plain", "text/javascript", "abc", ENCODED)
+    assert response.status == 304
+    assert response.headers[hdrs.CACHE_CONTROL] == REVALIDATE_CACHE_HEADER
+
+
+async def test_variants_of_dotted_device_ids(hass: HomeAssistant, tmp_path: Path) -> None:
+    """Device ids with dots find their variants, and only their own."""
+    for filename in (
+        "cam.tent.jpg",
+        "cam.tent.thumb.0123456789abcdef.webp",
+        "cam.tent.card.fedcba9876543210.webp",
+        "cam.thumb.00000000000000ff.webp",
+    ):
+        (tmp_path / filename).write_bytes(b"image")
+    index = ImageIndex(hass, str(tmp_path))
+
+    assert index.variants("cam.tent") == {
+        "thumb": "cam.tent.thumb.0123456789abcdef.webp",
+        "card": "cam.tent.card.fedcba9876543210.webp",
+    }
+    assert index.variants("cam") == {"thumb": "cam.thumb.00000000000000ff.webp"}
+    assert index.select("cam.tent", 150) == "cam.tent.thumb.0123456789abcdef.webp"
+    # Variants are versioned by their name
+    assert index.version("cam.tent.card.fedcba9876543210.webp") == "fedcba9876543210"
+
+
+async def test_upload_filename(hass: HomeAssistant, tmp_path: Path) -> None:
+    """Uploads are refused for unsafe ids and ids that look like a variant."""
+    index = ImageIndex(hass, str(tmp_path))
+    assert index.upload_filename("cam.tent") == "cam.tent.jpg"
+    assert index.upload_filename("../secret") is None
+    assert index.upload_filename("cam.thumb.0123456789abcdef") is None
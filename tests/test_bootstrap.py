@@ -0,0 +1,29 @@
+"""Tests for the panel bootstrap payload."""
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.local_grow_box.const import CONF_TARGET_TEMP, DATA_BOOTSTRAP, DOMAIN
+
+
+async def test_live_option_change_refreshes_bootstrap(hass: HomeAssistant, http) -> None:
+    """A target change applied without a reload shows up in the next bootstrap."""
+    entry = MockConfigEntry(
+        domain=DOMAIN, title="Box", data={"name": "Box"}, options={"name": "Box", CONF_TARGET_TEMP: 26},
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    cache = hass.data[DATA_BOOTSTRAP]
+    manager = hass.data[DOMAIN][entry.entry_id]
+    (box,) = cache.async_get_payload()["boxes"]
+    assert box["config"][CONF_TARGET_TEMP] == 26
+
+    hass.config_entries.async_update_entry(entry, options={**entry.options, CONF_TARGET_TEMP: 30})
+    await hass.async_block_till_done()
+
+    # Applied live: same manager, no reload
+    assert hass.data[DOMAIN][entry.entry_id] is manager
+    (box,) = cache.async_get_payload()["boxes"]
+    assert box["config"][CONF_TARGET_TEMP] == 30
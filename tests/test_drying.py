@@ -0,0 +1,62 @@
+"""Tests for the soil drying model."""
+import pytest
+
+from custom_components.local_grow_box.drying import DryingModel
+
+START = 1_700_000_000.0
+
+
+def _drying(rate: float, hours: float, start: float = 60.0, step: float = 0.25) -> DryingModel:
+    model = DryingModel()
+    for i in range(int(hours / step) + 1):
+        model.add(START + i * step * 3600, start - rate * i * step)
+    return model
+
+
+def test_predict_crossing() -> None:
+    """A linear drying run predicts the crossing of the target."""
+    model = _drying(2.0, 2)
+    assert model.slope == pytest.approx(-2.0)
+    # 60% drying by 2%/h reaches 40% after 10 hours
+    assert model.predict(40) == pytest.approx(START + 10 * 3600)
+
+
+def test_no_prediction_before_enough_readings() -> None:
+    """Too few readings or a too short span give no prediction."""
+    model = DryingModel()
+    model.add(START, 60)
+    model.add(START + 3600, 58)
+    assert model.predict(40) is None
+
+    model = _drying(2.0, 0.25, step=0.05)
+    assert model.n >= 3
+    assert model.predict(40) is None
+
+
+def test_no_prediction_while_not_drying() -> None:
+    """A flat or rising moisture never crosses a lower target."""
+    assert _drying(0.0, 2).predict(40) is None
+    assert _drying(-1.0, 2).predict(40) is None
+
+
+def test_reset_starts_a_new_period() -> None:
+    """After watering the old readings no longer count."""
+    model = _drying(2.0, 2)
+    model.reset()
+    assert model.predict(40) is None
+    assert model.origin is None
+    assert model.last is None
+
+    model.add(START, 70)
+    assert model.origin == START
+    assert model.last == 70
+
+
+def test_round_trip() -> None:
+    """A stored model predicts the same after a restart, broken data starts over."""
+    model = _drying(1.5, 3)
+    restored = DryingModel.from_dict(model.as_dict())
+    assert restored.predict(40) == model.predict(40)
+
+    assert DryingModel.from_dict({"n": "x"}).n == 0
+    assert DryingModel.from_dict(None).n == 0
@@ -0,0 +1,146 @@
+"""Tests for the downsampled sensor history."""
+import asyncio
+import math
+import time
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+from homeassistant.components import recorder
+from homeassistant.components.recorder import history as recorder_history
+from homeassistant.core import HomeAssistant, State
+from homeassistant.util import dt as dt_util
+
+from custom_components.local_grow_box import history
+from custom_components.local_grow_box.history import HistoryCache, lttb, minmax
+
+POINTS = [(float(i), math.sin(i / 20) + (5.0 if i == 333 else 0.0)) for i in range(1000)]
+
+
+def test_lttb_keeps_endpoints_and_shape() -> None:
+    """LTTB returns threshold points in order, including both ends and a spike."""
+    sampled = lttb(POINTS, 100)
+    assert len(sampled) == 100
+    assert sampled[0] == POINTS[0]
+    assert sampled[-1] == POINTS[-1]
+    assert all(a[0] < b[0] for a, b in zip(sampled, sampled[1:]))
+    assert set(sampled) <= set(POINTS)
+    assert POINTS[333] in sampled
+
+
+def test_lttb_short_series_unchanged() -> None:
+    """Series below the threshold are returned as they are."""
+    assert lttb(POINTS[:50], 100) == POINTS[:50]
+    assert lttb(POINTS, 2) == POINTS
+
+
+def test_minmax_keeps_extremes_of_each_bucket() -> None:
+    """Min/max returns at most threshold points with the extremes of every bucket."""
+    sampled = minmax(POINTS, 100)
+    assert len(sampled) <= 100
+    assert all(a[0] < b[0] for a, b in zip(sampled, sampled[1:]))
+    bucket_size = len(POINTS) / 50
+    for i in range(50):
+        bucket = POINTS[int(i * bucket_size):int((i + 1) * bucket_size)]
+        assert min(bucket, key=lambda p: p[1]) in sampled
+        assert max(bucket, key=lambda p: p[1]) in sampled
+    assert minmax(POINTS[:50], 100) == POINTS[:50]
+
+
+def _recorder(loaded: list[str], gate: asyncio.Event | None = None):
+    """Patch the recorder with one stored state per entity."""
+    async def add_executor_job(target):
+        if gate is not None:
+            await gate.wait()
+        return target()
+
+    def state_changes_during_period(hass, start, entity_id, **kwargs):
+        loaded.append(entity_id)
+        return {entity_id: [State(entity_id, "20", last_updated=dt_util.utcnow() - timedelta(hours=1))]}
+
+    instance = MagicMock()
+    instance.async_add_executor_job = add_executor_job
+    return (
+        patch.object(recorder, "get_instance", return_value=instance),
+        patch.object(recorder_history, "state_changes_during_period", side_effect=state_changes_during_period),
+    )
+
+
+async def test_history_is_read_once_and_extended_live(hass: HomeAssistant) -> None:
+    """Later requests are answered from the live series without another query."""
+    cache = HistoryCache(hass)
+    loaded = []
+    get_instance, query = _recorder(loaded)
+    with get_instance, query:
+        assert [v for _t, v in await cache.async_get("sensor.temp", 24, 100)] == [20.0]
+
+        hass.states.async_set("sensor.temp", "21.5")
+        hass.states.async_set("sensor.temp", "unavailable")
+        await hass.async_block_till_done()
+        assert [v for _t, v in await cache.async_get("sensor.temp", 24, 100)] == [20.0, 21.5]
+    assert loaded == ["sensor.temp"]
+    cache.async_clear()
+
+
+async def test_states_while_loading_are_kept(hass: HomeAssistant) -> None:
+    """A state arriving during the recorder query is appended after it."""
+    cache = HistoryCache(hass)
+    gate = asyncio.Event()
+    get_instance, query = _recorder([], gate)
+    with get_instance, query:
+        request = hass.async_create_task(cache.async_get("sensor.temp", 24, 100))
+        await asyncio.sleep(0)
+        hass.states.async_set("sensor.temp", "22")
+        await asyncio.sleep(0)
+        gate.set()
+        points = await request
+    assert [v for _t, v in points] == [20.0, 22.0]
+    cache.async_clear()
+
+
+async def test_series_evicted_while_loading(hass: HomeAssistant) -> None:
+    """A series dropped during its first query still answers and leaves no listener behind."""
+    cache = HistoryCache(hass)
+    gate = asyncio.Event()
+    removers = {}
+
+    def track(hass, entity_ids, action):
+        removers[entity_ids[0]] = MagicMock()
+        return removers[entity_ids[0]]
+
+    get_instance, query = _recorder([], gate)
+    with get_instance, query, patch.object(history, "MAX_SERIES", 1), patch.object(
+        history, "async_track_state_change_event", side_effect=track
+    ):
+        first = hass.async_create_task(cache.async_get("sensor.temp", 24, 100))
+        await asyncio.sleep(0)
+        second = hass.async_create_task(cache.async_get("sensor.humidity", 24, 100))
+        await asyncio.sleep(0)
+        removers["sensor.temp"].assert_called_once()
+        removers["sensor.humidity"].assert_not_called()
+
+        gate.set()
+        assert [v for _t, v in await first] == [20.0]
+        assert [v for _t, v in await second] == [20.0]
+    cache.async_clear()
+    removers["sensor.humidity"].assert_called_once()
+
+
+def _clock(monotonic: float) -> MagicMock:
+    return MagicMock(monotonic=MagicMock(return_value=monotonic), time=time.time)
+
+
+async def test_idle_series_evicted(hass: HomeAssistant) -> None:
+    """A series not requested for IDLE_TIMEOUT is dropped on the next request."""
+    cache = HistoryCache(hass)
+    loaded = []
+    get_instance, query = _recorder(loaded)
+    with get_instance, query:
+        with patch.object(history, "time", _clock(1000.0)):
+            await cache.async_get("sensor.temp", 24, 100)
+            await cache.async_get("sensor.humidity", 24, 100)
+        with patch.object(history, "time", _clock(1000.0 + history.IDLE_TIMEOUT + 1)):
+            await cache.async_get("sensor.humidity", 24, 100)
+            await cache.async_get("sensor.temp", 24, 100)
+    # Humidity stayed in use, the temperature had to be read again
+    assert loaded == ["sensor.temp", "sensor.humidity", "sensor.temp"]
+    cache.async_clear()
@@ -0,0 +1,16 @@
+"""Tests for the domain setup."""
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+
+from custom_components.local_grow_box.const import DATA_SNAPSHOTS, DATA_WATERING, DOMAIN
+from custom_components.local_grow_box.snapshots import DEFAULT_TTL
+
+
+async def test_setup_with_bare_domain_key(hass: HomeAssistant, http) -> None:
+    """A bare local_grow_box: key in YAML sets up with the defaults."""
+    assert await async_setup_component(hass, DOMAIN, {DOMAIN: None})
+
+    scheduler = hass.data[DATA_WATERING]
+    assert scheduler.max_concurrent == 0
+    assert scheduler.power_budget == 0
+    assert hass.data[DATA_SNAPSHOTS].ttl == DEFAULT_TTL
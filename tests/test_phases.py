@@ -0,0 +1,81 @@
+"""Tests for the phase registry."""
+import pytest
+import voluptuous as vol
+
+from custom_components.local_grow_box.const import (
+    CONF_CUSTOM1_HOURS, CONF_CUSTOM1_NAME, CONF_CUSTOM3_HOURS, CONF_CUSTOM3_NAME, CONF_PHASE_FLOWERING_DAYS,
+    CONF_PHASE_ORDER, CONF_PHASE_SEEDLING_HOURS, CONF_PHASES, GROW_PHASES, PHASE_FLOWERING, PHASE_SEEDLING,
+)
+from custom_components.local_grow_box.phases import (
+    DEFAULT_UNKNOWN_LIGHT_HOURS, PHASES_SCHEMA, PhaseRegistry,
+)
+
+
+def test_built_in_phases() -> None:
+    """Without configuration the registry holds the built-in phases with their defaults."""
+    registry = PhaseRegistry.from_config({})
+    assert registry.order == GROW_PHASES
+    assert registry.light_hours(PHASE_SEEDLING) == 18
+    assert registry.light_hours(PHASE_FLOWERING) == 12
+    assert set(registry.durations().values()) == {0}
+
+
+def test_options_of_built_in_phases() -> None:
+    """The per-phase options set light hours and durations."""
+    registry = PhaseRegistry.from_config({CONF_PHASE_SEEDLING_HOURS: "20", CONF_PHASE_FLOWERING_DAYS: 56})
+    assert registry.light_hours(PHASE_SEEDLING) == 20
+    assert registry.durations()[PHASE_FLOWERING] == 56
+
+
+def test_legacy_custom_slots_are_migrated() -> None:
+    """Named legacy slots become phases after the built-in ones, empty slots are skipped."""
+    registry = PhaseRegistry.from_config({
+        CONF_CUSTOM1_NAME: "Clone", CONF_CUSTOM1_HOURS: 16,
+        CONF_CUSTOM3_NAME: "Flush", CONF_CUSTOM3_HOURS: "bad",
+    })
+    assert registry.order == [*GROW_PHASES, "Clone", "Flush"]
+    assert registry.light_hours("Clone") == 16
+    assert registry.light_hours("Flush") == 0
+    assert registry.display_name("Clone") == "Clone"
+
+
+def test_phase_list_overrides_and_extends() -> None:
+    """Entries of the phase list override known phases by id and add new ones."""
+    registry = PhaseRegistry.from_config({
+        CONF_CUSTOM1_NAME: "Clone", CONF_CUSTOM1_HOURS: 16,
+        CONF_PHASES: [
+            {"id": "Clone", "name": "Stecklinge", "days": 10},
+            {"id": PHASE_FLOWERING, "target_temp": 26},
+            {"id": "autoflower", "light_hours": 20, "days": 70},
+            {"name": "no id"},
+        ],
+        CONF_PHASE_ORDER: ["Clone", PHASE_SEEDLING, "unknown"],
+    })
+    assert registry.order[:2] == ["Clone", PHASE_SEEDLING]
+    assert registry.order[-1] == "autoflower"
+    assert len(registry) == len(GROW_PHASES) + 2
+
+    clone = registry.get("Clone")
+    assert (clone.name, clone.light_hours, clone.days) == ("Stecklinge", 16, 10)
+    flowering = registry.get(PHASE_FLOWERING)
+    assert (flowering.light_hours, flowering.target_temp) == (12, 26)
+    assert registry.light_hours("autoflower") == 20
+
+
+def test_unknown_phase() -> None:
+    """An unknown phase falls back to a default light schedule and its id as name."""
+    registry = PhaseRegistry.from_config({})
+    assert "gone" not in registry
+    assert registry.light_hours("gone") == DEFAULT_UNKNOWN_LIGHT_HOURS
+    assert registry.display_name("gone") == "gone"
+
+
+def test_phase_schema() -> None:
+    """The phase list is validated and unknown keys are dropped."""
+    assert PHASES_SCHEMA([{"id": "clone", "light_hours": "18", "extra": 1}]) == [
+        {"id": "clone", "light_hours": 18.0}
+    ]
+    with pytest.raises(vol.Invalid):
+        PHASES_SCHEMA([{"id": "clone", "light_hours": 25}])
+    with pytest.raises(vol.Invalid):
+        PHASES_SCHEMA([{"id": ""}])
@@ -0,0 +1,90 @@
+"""Tests for the predicted watering of a box."""
+from datetime import timedelta
+from unittest.mock import call, patch
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry, async_fire_time_changed
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from custom_components.local_grow_box.const import (
+    CONF_MOISTURE_SENSOR, CONF_TARGET_MOISTURE, DOMAIN, PREDICTION_LEAD, SUBSYSTEM_WATER,
+)
+
+
+async def _setup_box(hass: HomeAssistant) -> tuple[MockConfigEntry, object]:
+    hass.states.async_set("sensor.moisture", "45")
+    options = {"name": "Box", CONF_MOISTURE_SENSOR: "sensor.moisture", CONF_TARGET_MOISTURE: 40}
+    entry = MockConfigEntry(domain=DOMAIN, title="Box", data={"name": "Box"}, options=options)
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry, hass.data[DOMAIN][entry.entry_id]
+
+
+def _fit_drying(manager, last: float, rate: float = 2.0) -> float:
+    """Feed two hours of readings drying by rate %/h, return the timestamp of the last one."""
+    now = dt_util.utcnow().timestamp()
+    manager.drying.reset()
+    for i in range(9):
+        manager.drying.add(now - (8 - i) * 900, last + rate * (8 - i) / 4)
+    return now
+
+
+async def test_check_scheduled_before_predicted_crossing(hass: HomeAssistant, http) -> None:
+    """The water subsystem is evaluated PREDICTION_LEAD seconds before the predicted crossing."""
+    entry, manager = await _setup_box(hass)
+    now = _fit_drying(manager, 41)
+    manager._async_update_prediction()
+
+    # 41% drying by 2%/h crosses 40% in half an hour
+    predicted = manager.predicted_watering
+    assert abs(predicted.timestamp() - (now + 1800)) < 1
+    check = predicted - timedelta(seconds=PREDICTION_LEAD)
+
+    with patch.object(manager, "async_request_update") as request:
+        async_fire_time_changed(hass, check - timedelta(seconds=5))
+        await hass.async_block_till_done()
+        assert call(SUBSYSTEM_WATER) not in request.call_args_list
+
+        async_fire_time_changed(hass, check + timedelta(seconds=1))
+        await hass.async_block_till_done()
+        assert call(SUBSYSTEM_WATER) in request.call_args_list
+
+    manager._moisture_dirty = False
+    assert not manager.moisture_due(check - timedelta(seconds=1))
+    assert manager.moisture_due(check)
+    # Consumed, the next reading plans the next check
+    assert not manager.moisture_due(check)
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_new_reading_keeps_the_planned_check(hass: HomeAssistant, http) -> None:
+    """Evaluating a new reading does not drop the check before the predicted crossing."""
+    entry, manager = await _setup_box(hass)
+    _fit_drying(manager, 41)
+    manager._async_update_prediction()
+    check = manager.predicted_watering - timedelta(seconds=PREDICTION_LEAD)
+
+    manager._moisture_dirty = True
+    assert manager.moisture_due(dt_util.utcnow())
+    assert manager.moisture_due(check)
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_target_change_moves_the_check(hass: HomeAssistant, http) -> None:
+    """A live change of the moisture target replans the predicted watering."""
+    entry, manager = await _setup_box(hass)
+    _fit_drying(manager, 46)
+    manager._async_update_prediction()
+    predicted = manager.predicted_watering
+
+    hass.config_entries.async_update_entry(entry, options={**entry.options, CONF_TARGET_MOISTURE: 44})
+    await hass.async_block_till_done()
+
+    assert hass.data[DOMAIN][entry.entry_id] is manager
+    # 46% drying by 2%/h reaches 44% after one hour instead of three
+    assert abs((predicted - manager.predicted_watering).total_seconds() - 7200) < 1
+    check = manager.predicted_watering - timedelta(seconds=PREDICTION_LEAD)
+    assert manager.moisture_due(check)
+    assert await hass.config_entries.async_unload(entry.entry_id)
@@ -0,0 +1,50 @@
+"""Tests for the control loop profiler."""
+import asyncio
+import base64
+import marshal
+import os
+from datetime import timedelta
+
+from freezegun.api import FrozenDateTimeFactory
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.local_grow_box.profiling import Profiler
+
+
+async def test_stop_with_a_tick_in_flight(hass: HomeAssistant, freezer: FrozenDateTimeFactory) -> None:
+    """A tick still running at the stop finishes unprofiled, the result is complete."""
+    os.makedirs(hass.config.path(".storage"), exist_ok=True)
+    profiler = Profiler(hass)
+    assert profiler.async_start(60, {"box"})
+    assert not profiler.async_start(60)
+
+    release = asyncio.Event()
+
+    async def tick() -> str:
+        await release.wait()
+        return "done"
+
+    task = hass.async_create_task(profiler.async_run("box", tick()))
+    await asyncio.sleep(0)
+    result = await profiler.async_stop()
+    assert not profiler.active
+
+    release.set()
+    assert await task == "done"
+    assert result["entry_ids"] == ["box"]
+    assert result["functions"]
+
+    # The diagnostics carry the .prof file, loadable with pstats
+    stored, = await profiler.async_get_results("box", with_files=True)
+    stats = marshal.loads(base64.b64decode(stored["prof_data"]))
+    assert any(name == "tick" for (_file, _line, name) in stats)
+    assert await profiler.async_get_results("other") == []
+    assert "prof_data" not in (await profiler.async_get_results())[0]
+
+    # Let the delayed store write happen
+    freezer.tick(timedelta(seconds=2))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    os.remove(result["prof_file"])
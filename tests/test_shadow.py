@@ -0,0 +1,117 @@
+"""Tests for the shadow controller."""
+from dataclasses import replace
+from datetime import datetime, timezone
+
+from custom_components.local_grow_box.core import (
+    ControlSettings, GrowBoxController, MemoryStates, Reading, ShadowController,
+)
+
+NOW = datetime(2026, 5, 1, 12, 0, tzinfo=timezone.utc)
+
+SETTINGS = ControlSettings(
+    light_entity=None, fan_entity="switch.fan", pump_entity="switch.pump",
+    temp_sensor="sensor.temp", humidity_sensor="sensor.humidity", moisture_sensor="sensor.moisture",
+    light_start_hour=6, light_hours=18, target_temp=28, max_humidity=70, target_moisture=30,
+    pump_duration=10, soak_time=900, pump_start_grace=30,
+)
+
+
+class FixedClock:
+    def now(self) -> datetime:
+        return NOW
+
+
+class RecordingActuators:
+    def __init__(self):
+        self.calls = []
+
+    def available(self, entity_id: str) -> bool:
+        return True
+
+    async def async_switch(self, entity_id: str, turn_on: bool, force: bool = False) -> bool:
+        self.calls.append(("switch", entity_id, turn_on))
+        return True
+
+    def request_watering(self, deficit: float, value: float, target: float) -> None:
+        self.calls.append(("request", deficit))
+
+    def cancel_watering(self) -> None:
+        self.calls.append(("cancel",))
+
+
+def _box(**shadow_settings) -> tuple[GrowBoxController, ShadowController, MemoryStates, RecordingActuators]:
+    states = MemoryStates({
+        "sensor.temp": Reading("26"), "sensor.humidity": Reading("50"), "sensor.moisture": Reading("35"),
+        "switch.fan": Reading("off"), "switch.pump": Reading("off"),
+    })
+    actuators = RecordingActuators()
+    active = GrowBoxController(SETTINGS, states, FixedClock(), actuators)
+    # Long after the last watering
+    active.last_pump_stop_time = None
+    shadow = ShadowController("cool", active, replace(SETTINGS, **shadow_settings))
+    return active, shadow, states, actuators
+
+
+async def _evaluate(active: GrowBoxController, shadow: ShadowController, subsystem: str) -> None:
+    await shadow.async_evaluate(subsystem)
+    if subsystem == "climate":
+        await active.async_update_climate()
+    else:
+        await active.async_update_water()
+    shadow.compare(subsystem)
+
+
+async def test_differences_are_recorded_and_folded() -> None:
+    """Differing decisions are kept once per run, with the shadow's inputs."""
+    active, shadow, _states, actuators = _box(target_temp=24)
+    await _evaluate(active, shadow, "climate")
+    await _evaluate(active, shadow, "climate")
+
+    result = shadow.as_dict()
+    assert result["subsystems"]["climate"] == {
+        "evaluations": 2, "agreements": 0, "differences": 2,
+        "active": {"none": 2}, "shadow": {"on": 2},
+    }
+    diff, = result["differences"]
+    assert diff["active"] == {"action": "none", "reason": "below_limit"}
+    assert diff["shadow"] == {"action": "on", "reason": "above_limit"}
+    assert diff["inputs"]["target_temp"] == 24
+    assert diff["repeats"] == 1
+    # The shadow never switches anything
+    assert actuators.calls == []
+
+
+async def test_agreement_ends_a_run_of_differences() -> None:
+    """After an agreement the next difference is recorded anew."""
+    active, shadow, states, actuators = _box(target_temp=24)
+    await _evaluate(active, shadow, "climate")
+    states.states["sensor.temp"] = Reading("30")
+    await _evaluate(active, shadow, "climate")
+    assert actuators.calls == [("switch", "switch.fan", True)]
+
+    states.states["sensor.temp"] = Reading("26")
+    states.states["switch.fan"] = Reading("off")
+    await _evaluate(active, shadow, "climate")
+
+    result = shadow.as_dict()
+    assert result["subsystems"]["climate"]["agreements"] == 1
+    assert [diff["repeats"] for diff in result["differences"]] == [0, 0]
+
+
+async def test_shadow_watering_is_not_queued() -> None:
+    """A shadow with a higher moisture target would water, the real box does not."""
+    active, shadow, _states, actuators = _box(target_moisture=40)
+    await _evaluate(active, shadow, "water")
+
+    diff, = shadow.as_dict()["differences"]
+    assert diff["active"] == {"action": "cancel", "reason": "wet"}
+    assert diff["shadow"] == {"action": "request", "reason": "dry"}
+    assert actuators.calls == [("cancel",)]
+
+
+async def test_unknown_subsystem_is_not_evaluated() -> None:
+    """Subsystems outside the controller core are left to the active controller."""
+    _active, shadow, _states, _actuators = _box()
+    assert not await shadow.async_evaluate("alerts")
+    shadow.compare("alerts")
+    assert shadow.as_dict()["subsystems"] == {}
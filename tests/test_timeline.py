@@ -0,0 +1,52 @@
+"""Tests for the grow timeline."""
+from datetime import datetime, timedelta, timezone
+
+from custom_components.local_grow_box.const import (
+    PHASE_CURING, PHASE_DRYING, PHASE_FLOWERING, PHASE_SEEDLING, PHASE_VEGETATIVE,
+)
+from custom_components.local_grow_box.timeline import build_timeline, entry_at
+
+START = datetime(2026, 3, 1, tzinfo=timezone.utc)
+ORDER = [PHASE_SEEDLING, PHASE_VEGETATIVE, PHASE_FLOWERING, PHASE_DRYING, PHASE_CURING]
+
+
+def test_chain_from_current_phase() -> None:
+    """Phases follow each other from the current one, each starting when the previous ends."""
+    durations = {PHASE_SEEDLING: 14, PHASE_VEGETATIVE: 28, PHASE_FLOWERING: 56}
+    timeline = build_timeline(ORDER, durations, PHASE_VEGETATIVE, START)
+
+    assert [entry.phase for entry in timeline] == [PHASE_VEGETATIVE, PHASE_FLOWERING, PHASE_DRYING]
+    assert timeline[0].end == START + timedelta(days=28)
+    assert timeline[1].start == timeline[0].end
+    assert timeline[1].duration_days == 56
+    # Drying has no target duration, the chain ends open
+    assert timeline[2].end is None
+    assert timeline[2].as_dict()["duration_days"] is None
+
+
+def test_last_phase_ends_the_chain() -> None:
+    """After the last phase of the order nothing follows."""
+    durations = dict.fromkeys(ORDER, 7)
+    timeline = build_timeline(ORDER, durations, PHASE_DRYING, START)
+    assert [entry.phase for entry in timeline] == [PHASE_DRYING, PHASE_CURING]
+    assert timeline[-1].end == START + timedelta(days=14)
+
+
+def test_phase_outside_the_order() -> None:
+    """A current phase that is not in the order only covers itself."""
+    timeline = build_timeline(ORDER, {"clone": 5}, "clone", START)
+    assert [(entry.phase, entry.end) for entry in timeline] == [("clone", START + timedelta(days=5))]
+
+
+def test_entry_at() -> None:
+    """The entry covering a point in time is found, ends are exclusive."""
+    durations = {PHASE_SEEDLING: 14, PHASE_VEGETATIVE: 28}
+    timeline = build_timeline(ORDER, durations, PHASE_SEEDLING, START)
+
+    assert entry_at(timeline, START).phase == PHASE_SEEDLING
+    assert entry_at(timeline, START + timedelta(days=14)).phase == PHASE_VEGETATIVE
+    assert entry_at(timeline, START + timedelta(days=400)).phase == PHASE_FLOWERING
+    assert entry_at(timeline, START - timedelta(seconds=1)) is None
+
+    closed = build_timeline(ORDER, {PHASE_CURING: 7}, PHASE_CURING, START)
+    assert entry_at(closed, START + timedelta(days=7)) is None
@@ -0,0 +1,52 @@
+"""Tests for the decision trace."""
+from custom_components.local_grow_box.core import DecisionTrace
+
+
+def test_repeats_are_folded() -> None:
+    """An unchanged decision updates its record instead of adding one."""
+    trace = DecisionTrace(size=8)
+    trace.record("climate", "none", "in_range", {"temp": 24.0})
+    trace.record("climate", "none", "in_range", {"temp": 24.1})
+    trace.record("light", "on", "schedule")
+    trace.record("climate", "none", "in_range", {"temp": 24.2})
+
+    climate, = trace.records("climate")
+    assert climate.repeats == 2
+    assert climate.inputs == {"temp": 24.2}
+    assert climate.last_timestamp >= climate.timestamp
+    assert [record.subsystem for record in trace.records()] == ["light", "climate"]
+
+
+def test_changed_decision_adds_a_record() -> None:
+    """A new action or reason starts a new record, newest first."""
+    trace = DecisionTrace(size=8)
+    trace.record("climate", "none", "in_range")
+    trace.record("climate", "fan_on", "too_hot")
+    trace.record("climate", "fan_on", "too_humid")
+    assert [record.reason for record in trace.records("climate")] == ["too_humid", "too_hot", "in_range"]
+    assert trace.last("climate").reason == "too_humid"
+    assert trace.records("climate", limit=1)[0].reason == "too_humid"
+
+
+def test_ring_buffer_wraps() -> None:
+    """Only the newest size records are kept, in order."""
+    trace = DecisionTrace(size=4)
+    for i in range(10):
+        trace.record("water", "none", f"reason_{i}")
+    records = trace.records()
+    assert [record.reason for record in records] == ["reason_9", "reason_8", "reason_7", "reason_6"]
+    assert [record.seq for record in records] == [10, 9, 8, 7]
+
+
+def test_overwritten_last_decision() -> None:
+    """A subsystem whose record was overwritten has no last decision and records anew."""
+    trace = DecisionTrace(size=2)
+    trace.record("light", "on", "schedule")
+    trace.record("water", "none", "soak")
+    trace.record("climate", "none", "in_range")
+    assert trace.last("light") is None
+
+    trace.record("light", "on", "schedule")
+    light, = trace.records("light")
+    assert light.repeats == 0
+    assert light.as_dict()["action"] == "on"
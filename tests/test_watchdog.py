@@ -0,0 +1,90 @@
+"""Tests for the sensor watchdog."""
+from datetime import timedelta
+from unittest.mock import MagicMock
+
+from freezegun.api import FrozenDateTimeFactory
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.local_grow_box.watchdog import (
+    PROBLEM_STALE, PROBLEM_STUCK, PROBLEM_UNAVAILABLE, RECHECK_INTERVAL, SensorWatchdog,
+)
+
+
+async def _tick(hass: HomeAssistant, freezer: FrozenDateTimeFactory, seconds: float) -> None:
+    freezer.tick(timedelta(seconds=seconds))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+
+async def test_stale_sensor(hass: HomeAssistant, freezer: FrozenDateTimeFactory) -> None:
+    """A sensor without a report for stale_after is stale until it reports again."""
+    hass.states.async_set("sensor.temp", "24")
+    watchdog = SensorWatchdog(hass)
+    on_change = MagicMock()
+    unwatch = watchdog.async_watch("box", {"sensor.temp": (600, 0)}, on_change)
+
+    await _tick(hass, freezer, 599)
+    assert watchdog.problems("box") == {}
+    await _tick(hass, freezer, 1)
+    assert watchdog.problems("box") == {"sensor.temp": PROBLEM_STALE}
+    on_change.assert_called_once()
+
+    # Noticed at the next recheck
+    hass.states.async_set("sensor.temp", "24.5")
+    await _tick(hass, freezer, RECHECK_INTERVAL)
+    assert watchdog.problems("box") == {}
+    assert on_change.call_count == 2
+    unwatch()
+
+
+async def test_stuck_sensor(hass: HomeAssistant, freezer: FrozenDateTimeFactory) -> None:
+    """A sensor reporting the same value for stuck_after is stuck."""
+    hass.states.async_set("sensor.moisture", "40")
+    watchdog = SensorWatchdog(hass)
+    unwatch = watchdog.async_watch("box", {"sensor.moisture": (600, 3600)}, MagicMock())
+
+    for report in range(11):
+        await _tick(hass, freezer, 300)
+        # Same value, only the report is new
+        hass.states.async_set("sensor.moisture", "40", {"report": report})
+    assert watchdog.problems("box") == {}
+
+    await _tick(hass, freezer, 300)
+    assert watchdog.problems("box") == {"sensor.moisture": PROBLEM_STUCK}
+
+    hass.states.async_set("sensor.moisture", "39")
+    await _tick(hass, freezer, RECHECK_INTERVAL)
+    assert watchdog.problems("box") == {}
+    unwatch()
+
+
+async def test_unavailable_sensor(hass: HomeAssistant, freezer: FrozenDateTimeFactory) -> None:
+    """Short outages are tolerated, longer ones and missing sensors are a problem."""
+    hass.states.async_set("sensor.temp", "unavailable")
+    watchdog = SensorWatchdog(hass)
+    unwatch = watchdog.async_watch(
+        "box", {"sensor.temp": (600, 0), "sensor.missing": (600, 0)}, MagicMock()
+    )
+    assert watchdog.problems("box") == {}
+
+    await _tick(hass, freezer, 600)
+    assert watchdog.problems("box") == {
+        "sensor.temp": PROBLEM_UNAVAILABLE,
+        "sensor.missing": PROBLEM_UNAVAILABLE,
+    }
+    unwatch()
+
+
+async def test_unwatch_stops_checking(hass: HomeAssistant, freezer: FrozenDateTimeFactory) -> None:
+    """An unwatched box is not reported and leaves no timer behind."""
+    hass.states.async_set("sensor.temp", "24")
+    watchdog = SensorWatchdog(hass)
+    on_change = MagicMock()
+    unwatch = watchdog.async_watch("box", {"sensor.temp": (600, 0)}, on_change)
+    unwatch()
+
+    await _tick(hass, freezer, 600)
+    assert watchdog.problems("box") == {}
+    on_change.assert_not_called()
@@ -0,0 +1,149 @@
+"""Tests for the fleet-wide watering scheduler."""
+import asyncio
+from unittest.mock import MagicMock, patch
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.local_grow_box import watering
+from custom_components.local_grow_box.watering import MAX_WAIT, WateringScheduler
+
+
+def _starter(started: list[str], entry_id: str, result: bool = True, gate: asyncio.Event | None = None):
+    async def start() -> bool:
+        if gate is not None:
+            await gate.wait()
+        started.append(entry_id)
+        return result
+    return start
+
+
+def _clock(monotonic: float) -> MagicMock:
+    return MagicMock(monotonic=MagicMock(return_value=monotonic))
+
+
+async def test_driest_box_first(hass: HomeAssistant) -> None:
+    """Queued boxes start by largest deficit once a slot frees up."""
+    scheduler = WateringScheduler(hass, max_concurrent=1)
+    started = []
+    scheduler.async_mark_running("busy", 10)
+    for entry_id, deficit in (("a", 5), ("b", 20), ("c", 10)):
+        scheduler.async_request(entry_id, deficit, 10, _starter(started, entry_id))
+    assert [queued["entry_id"] for queued in scheduler.as_dict()["queued"]] == ["b", "c", "a"]
+    assert scheduler.status("a") == {"state": "queued", "position": 3}
+
+    for entry_id in ("busy", "b", "c"):
+        scheduler.async_release(entry_id)
+        await hass.async_block_till_done()
+    assert started == ["b", "c", "a"]
+    assert scheduler.status("a") == {"state": "running"}
+
+
+async def test_refreshed_deficit_reorders(hass: HomeAssistant) -> None:
+    """A box that dried further while queued moves ahead."""
+    scheduler = WateringScheduler(hass, max_concurrent=1)
+    started = []
+    scheduler.async_mark_running("busy", 10)
+    scheduler.async_request("a", 5, 10, _starter(started, "a"))
+    scheduler.async_request("b", 10, 10, _starter(started, "b"))
+    scheduler.async_request("a", 15, 10, _starter(started, "a"))
+
+    scheduler.async_release("busy")
+    await hass.async_block_till_done()
+    assert started == ["a"]
+
+
+async def test_power_budget(hass: HomeAssistant) -> None:
+    """Pumps only start while their summed power stays in budget, strictly in order."""
+    scheduler = WateringScheduler(hass, power_budget=100)
+    started = []
+    scheduler.async_mark_running("busy", 60)
+    scheduler.async_request("big", 20, 50, _starter(started, "big"))
+    scheduler.async_request("small", 10, 30, _starter(started, "small"))
+    await hass.async_block_till_done()
+    # The smaller pump would fit, but must not overtake the drier box
+    assert started == []
+
+    scheduler.async_release("busy")
+    await hass.async_block_till_done()
+    assert started == ["big", "small"]
+    assert scheduler.running_power == 80
+
+
+async def test_pump_over_budget_runs_alone(hass: HomeAssistant) -> None:
+    """A pump larger than the whole budget still runs when nothing else does."""
+    scheduler = WateringScheduler(hass, power_budget=100)
+    started = []
+    scheduler.async_request("huge", 10, 150, _starter(started, "huge"))
+    scheduler.async_request("small", 5, 10, _starter(started, "small"))
+    await hass.async_block_till_done()
+    assert started == ["huge"]
+
+
+async def test_slot_reserved_while_starting(hass: HomeAssistant) -> None:
+    """A release from the box's own tick before its pump started keeps the slot."""
+    scheduler = WateringScheduler(hass, max_concurrent=1)
+    started = []
+    gate = asyncio.Event()
+    scheduler.async_request("a", 10, 10, _starter(started, "a", gate=gate))
+    scheduler.async_request("b", 5, 10, _starter(started, "b"))
+    await asyncio.sleep(0)
+
+    # The water tick of a sees the pump still off
+    scheduler.async_release("a")
+    gate.set()
+    await hass.async_block_till_done()
+    assert started == ["a"]
+    assert scheduler.status("b")["state"] == "queued"
+
+    scheduler.async_release("a")
+    await hass.async_block_till_done()
+    assert started == ["a", "b"]
+
+
+async def test_failed_start_frees_slot(hass: HomeAssistant) -> None:
+    """The next box starts when a granted start fails."""
+    scheduler = WateringScheduler(hass, max_concurrent=1)
+    started = []
+    scheduler.async_request("a", 10, 10, _starter(started, "a", result=False))
+    scheduler.async_request("b", 5, 10, _starter(started, "b"))
+    await hass.async_block_till_done()
+    assert started == ["a", "b"]
+    assert scheduler.status("a") == {"state": "idle"}
+    assert scheduler.status("b") == {"state": "running"}
+
+
+async def test_cancelled_request_is_skipped(hass: HomeAssistant) -> None:
+    """A box whose moisture recovered is not started anymore."""
+    scheduler = WateringScheduler(hass, max_concurrent=1)
+    started = []
+    scheduler.async_mark_running("busy", 10)
+    scheduler.async_request("a", 10, 10, _starter(started, "a"))
+    scheduler.async_request("b", 5, 10, _starter(started, "b"))
+    scheduler.async_cancel("a")
+
+    scheduler.async_release("busy")
+    await hass.async_block_till_done()
+    assert started == ["b"]
+
+
+async def test_long_waiting_box_is_not_starved(hass: HomeAssistant) -> None:
+    """After MAX_WAIT a box is served before drier boxes that came later."""
+    scheduler = WateringScheduler(hass, max_concurrent=1)
+    started = []
+    with patch.object(watering, "time", _clock(1000.0)):
+        scheduler.async_mark_running("busy", 10)
+        scheduler.async_request("slightly_dry", 1, 10, _starter(started, "slightly_dry"))
+
+    with patch.object(watering, "time", _clock(1000.0 + MAX_WAIT - 1)):
+        scheduler.async_request("dry", 20, 10, _starter(started, "dry"))
+        assert [queued["entry_id"] for queued in scheduler.as_dict()["queued"]] == ["dry", "slightly_dry"]
+
+    with patch.object(watering, "time", _clock(1000.0 + MAX_WAIT)):
+        assert scheduler.status("slightly_dry") == {"state": "queued", "position": 1}
+        scheduler.async_release("busy")
+        await hass.async_block_till_done()
+        assert started == ["slightly_dry"]
+
+        scheduler.async_release("slightly_dry")
+        await hass.async_block_till_done()
+    assert started == ["slightly_dry", "dry"]
@@ -0,0 +1,106 @@
+"""Tests for the multi-sensor zones."""
+from unittest.mock import MagicMock
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.local_grow_box.const import (
+    AGGREGATE_MAX, AGGREGATE_MEAN, AGGREGATE_MIN, AGGREGATE_WEIGHTED,
+)
+from custom_components.local_grow_box.readings import ReadingCache
+from custom_components.local_grow_box.zones import Aggregate, SensorZone
+
+
+def test_mean_follows_single_updates() -> None:
+    """The mean is kept by adjusting the sums with each member's change."""
+    aggregate = Aggregate(AGGREGATE_MEAN)
+    assert aggregate.value is None
+    aggregate.update("a", 20)
+    aggregate.update("b", 24)
+    assert aggregate.value == 22
+    aggregate.update("a", 22)
+    assert aggregate.value == 23
+    aggregate.update("b", None)
+    assert aggregate.value == 22
+    aggregate.update("a", None)
+    assert aggregate.value is None
+
+
+def test_weighted_mean() -> None:
+    """Members count by their weight, unlisted members by 1."""
+    aggregate = Aggregate(AGGREGATE_WEIGHTED, {"a": 3})
+    aggregate.update("a", 20)
+    aggregate.update("b", 24)
+    assert aggregate.value == pytest.approx(21)
+    aggregate.update("a", None)
+    assert aggregate.value == pytest.approx(24)
+
+
+def test_weights_ignored_for_other_policies() -> None:
+    """Only the weighted policy uses the weights."""
+    aggregate = Aggregate(AGGREGATE_MEAN, {"a": 3})
+    aggregate.update("a", 20)
+    aggregate.update("b", 24)
+    assert aggregate.value == 22
+
+
+@pytest.mark.parametrize(
+    ("policy", "expected"),
+    [(AGGREGATE_MIN, [20, 20, 22, 24, 23]), (AGGREGATE_MAX, [20, 24, 24, 24, 23])],
+)
+def test_extreme_follows_its_holder(policy: str, expected: list[float]) -> None:
+    """Min and max rescan only when the member holding the extreme moves away."""
+    aggregate = Aggregate(policy)
+    values = []
+    for member, value in (("a", 20), ("b", 24), ("a", 22), ("a", None), ("b", 23)):
+        aggregate.update(member, value)
+        values.append(aggregate.value)
+    assert values == expected
+
+
+async def test_zone_publishes_the_aggregate(hass: HomeAssistant) -> None:
+    """A zone follows its members and can be read like a single sensor."""
+    for entity_id, state in (("sensor.a", "20"), ("sensor.b", "24"), ("sensor.c", "unavailable")):
+        hass.states.async_set(entity_id, state)
+    readings = ReadingCache(hass)
+    on_change = MagicMock()
+    zone = SensorZone(
+        hass, readings, "local_grow_box.zone_temp", ["sensor.a", "sensor.b", "sensor.c"], on_change=on_change
+    )
+    zone.async_setup()
+    assert readings.number("local_grow_box.zone_temp") == 22
+    on_change.assert_not_called()
+
+    hass.states.async_set("sensor.c", "28")
+    await hass.async_block_till_done()
+    assert readings.number("local_grow_box.zone_temp") == 24
+    on_change.assert_called_once()
+
+    # Unchanged aggregate, nothing to publish
+    hass.states.async_set("sensor.c", "28", {"report": 2})
+    await hass.async_block_till_done()
+    on_change.assert_called_once()
+    zone.async_unload()
+
+
+async def test_zone_excludes_failed_members(hass: HomeAssistant) -> None:
+    """Excluded members do not count, a zone without usable members reads as unavailable."""
+    hass.states.async_set("sensor.a", "20")
+    hass.states.async_set("sensor.b", "24")
+    readings = ReadingCache(hass)
+    zone = SensorZone(hass, readings, "local_grow_box.zone_temp", ["sensor.a", "sensor.b"])
+    zone.async_setup()
+
+    zone.async_exclude({"sensor.b", "sensor.other"})
+    assert zone.excluded == {"sensor.b"}
+    assert readings.number("local_grow_box.zone_temp") == 20
+    assert zone.as_dict()["members"] == {"sensor.a": 20, "sensor.b": None}
+
+    zone.async_exclude({"sensor.a", "sensor.b"})
+    assert not zone.usable
+    assert readings.get("local_grow_box.zone_temp") is None
+
+    zone.async_exclude(set())
+    assert readings.number("local_grow_box.zone_temp") == 22
+    zone.async_unload()